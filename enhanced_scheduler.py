@@ -7,14 +7,16 @@ Posts to BlueSky with intelligent rate limiting and prioritization
 import sys
 import json
 import time
-import random
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
 sys.path.append('src')
 from bluesky_integration import BlueSkyPoster
+from src.posting.ranking import RankingEngine
+from src.utils.url_canonicalize import hash_documents
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,13 +31,17 @@ class CouncilBotScheduler:
     def __init__(self, 
                  results_file='all_councils_results.json',
                  posted_file='posted_bluesky.json',
-                 config_file='src/registry/all_councils.json'):
+                 config_file='src/registry/all_councils.json',
+                 seed: Optional[int] = None):
         """Initialize the scheduler"""
         self.results_file = Path(results_file)
         self.posted_file = Path(posted_file)
         self.config_file = Path(config_file)
         self.bluesky = BlueSkyPoster(posted_file=str(posted_file))
         self.council_config = self._load_council_config()
+        self.ranking = RankingEngine(seed=seed)
+        # Posts attempted but not sent in the last batch (API errors, rate limits)
+        self.last_batch_failed = 0
         
     def _load_council_config(self) -> Dict:
         """Load council configuration with hashtags"""
@@ -65,56 +71,48 @@ class CouncilBotScheduler:
             
         return data.get('documents', [])
     
-    def prioritize_documents(self, documents: List[Dict]) -> List[Dict]:
-        """Prioritize documents for posting"""
-        # Score each document
-        for doc in documents:
-            score = 0
-            
-            # Prefer agendas over minutes (agendas are forward-looking)
-            if doc.get('document_type') == 'agenda':
-                score += 10
-            
-            # Prefer recent dates
-            date_str = doc.get('date', '')
-            if date_str:
-                try:
-                    # Parse various date formats
-                    for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%d %B %Y', '%B %d, %Y']:
-                        try:
-                            doc_date = datetime.strptime(date_str, fmt)
-                            days_diff = (doc_date - datetime.now()).days
-                            
-                            # Upcoming meetings get higher priority
-                            if 0 <= days_diff <= 7:
-                                score += 20
-                            elif 7 < days_diff <= 14:
-                                score += 15
-                            elif days_diff < 0 and days_diff > -7:
-                                score += 5  # Recent past
-                            
-                            break
-                        except:
-                            continue
-                except:
-                    pass
-            
-            # Prefer certain meeting types
-            meeting_type = doc.get('meeting_type', '').lower()
-            if 'ordinary' in meeting_type or 'regular' in meeting_type:
-                score += 5
-            elif 'special' in meeting_type:
-                score += 8
-            
-            # Add some randomness to vary the councils
-            score += random.randint(0, 5)
-            
-            doc['_score'] = score
+    def filter_unposted(self, documents: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+        """Drop documents that cannot or need not be posted, in one pass.
+
+        Joins the documents against the posted-document store using the same
+        url-only and legacy title hashes as BlueSkyPoster, so the posting loop
+        only ever sees new candidates.
+
+        Returns:
+            (candidates, skipped) where skipped counts documents per reason:
+            'no_url', 'already_posted' or 'duplicate' (same canonical URL
+            seen earlier in this batch).
+        """
+        posted = self.bluesky.posted_docs
+        seen = set()
+        candidates = []
+        skipped = Counter()
         
-        # Sort by score (highest first)
-        documents.sort(key=lambda x: x.get('_score', 0), reverse=True)
+        with_url = [doc for doc in documents if doc.get('url')]
+        if len(with_url) < len(documents):
+            skipped['no_url'] = len(documents) - len(with_url)
         
-        return documents
+        # Canonicalise and hash the whole batch in one pass
+        for doc, hashes in zip(with_url, hash_documents(with_url)):
+            url_only = hashes.url_only
+            if url_only in posted:
+                skipped['already_posted'] += 1
+                continue
+            if url_only in seen:
+                skipped['duplicate'] += 1
+                continue
+            if hashes.legacy_canon in posted or hashes.legacy_raw in posted:
+                skipped['already_posted'] += 1
+                continue
+            
+            seen.add(url_only)
+            candidates.append(doc)
+        
+        return candidates, dict(skipped)
+    
+    def prioritize_documents(self, documents: List[Dict]) -> List[Dict]:
+        """Prioritize documents for posting (full ranking, best first)"""
+        return self.ranking.rank(documents)
     
     def post_document(self, doc: Dict) -> bool:
         """Post a single document to BlueSky"""
@@ -139,9 +137,14 @@ class CouncilBotScheduler:
             council_hashtag=hashtag
         )
     
-    def run_batch(self, max_posts: int = 10, delay_seconds: int = 30) -> int:
-        """Run a batch of posts"""
+    def run_batch(self, max_posts: int = 10, delay_seconds: int = 0) -> int:
+        """Run a batch of posts
+        
+        API limits are enforced by the poster's token buckets, so posts go out
+        back to back unless delay_seconds asks for extra spacing.
+        """
         logger.info(f"Starting batch run (max {max_posts} posts)")
+        self.last_batch_failed = 0
         
         # Load documents
         all_docs = self.load_documents()
@@ -150,8 +153,18 @@ class CouncilBotScheduler:
             logger.warning("No documents found to post")
             return 0
         
-        # Prioritize documents
-        prioritized = self.prioritize_documents(all_docs)
+        # Skip already-posted documents before ranking or posting anything
+        candidates, skipped = self.filter_unposted(all_docs)
+        if skipped:
+            reasons = ', '.join(f"{n} {reason.replace('_', ' ')}" for reason, n in sorted(skipped.items()))
+            logger.info(f"Skipped {sum(skipped.values())} of {len(all_docs)} documents ({reasons})")
+        
+        if not candidates:
+            logger.info("No unposted documents found")
+            return 0
+        
+        # Rank lazily: only the top window is materialised unless we run short
+        prioritized = self.ranking.iter_ranked(candidates, k=max_posts)
         
         # Post up to max_posts
         posted_count = 0
@@ -160,63 +173,101 @@ class CouncilBotScheduler:
             if posted_count >= max_posts:
                 break
             
-            # Check if already posted (BlueSkyPoster handles this too, but we can save API calls)
-            doc_url = doc.get('url', '')
-            if not doc_url:
-                continue
-            
             logger.info(f"Attempting to post: {doc.get('council_name')} - {doc.get('title', '')[:50]}")
             
             if self.post_document(doc):
                 posted_count += 1
                 logger.info(f"Successfully posted ({posted_count}/{max_posts})")
                 
-                # Delay between posts to avoid rate limiting
-                if posted_count < max_posts:
+                # Optional extra spacing between posts
+                if delay_seconds and posted_count < max_posts:
                     time.sleep(delay_seconds)
+            elif self.bluesky.is_posted(doc.get('council_name', ''), doc.get('title', ''), doc.get('url', '')):
+                logger.debug("Document already posted")
             else:
-                logger.debug("Document already posted or failed")
+                self.last_batch_failed += 1
+                logger.debug("Document failed to post")
         
-        logger.info(f"Batch complete: {posted_count} documents posted")
+        if self.last_batch_failed:
+            logger.warning(f"Batch complete: {posted_count} documents posted, {self.last_batch_failed} failed")
+        else:
+            logger.info(f"Batch complete: {posted_count} documents posted")
         return posted_count
     
+    def _wait_for_new_results(self, deadline: Optional[datetime] = None, poll_seconds: int = 60):
+        """Sleep until the results file changes (a new scrape) or the deadline passes"""
+        def mtime():
+            try:
+                return self.results_file.stat().st_mtime
+            except OSError:
+                return None
+        
+        start = mtime()
+        while mtime() == start:
+            if deadline and datetime.now() >= deadline:
+                return
+            time.sleep(poll_seconds)
+    
     def run_continuous(self, 
                        posts_per_hour: int = 6,
                        batch_size: int = 3,
-                       run_hours: Optional[int] = None):
-        """Run continuously with rate limiting"""
+                       run_hours: Optional[int] = None,
+                       retry_seconds: float = 60,
+                       max_retry_seconds: float = 3600):
+        """Run continuously with rate limiting
+        
+        Cadence is a persisted 'post' token bucket (burst of batch_size,
+        refilled at posts_per_hour), so the loop sleeps only until the next
+        post is allowed, and a restart does not reset the hourly budget.
+        
+        A batch that posts nothing because every attempt failed is retried
+        after retry_seconds, doubling up to max_retry_seconds; only a batch
+        with no candidates waits for the next scrape.
+        """
         logger.info(f"Starting continuous run: {posts_per_hour}/hour, batch of {batch_size}")
         
         start_time = datetime.now()
+        deadline = start_time + timedelta(hours=run_hours) if run_hours else None
         total_posted = 0
+        failed_batches = 0
         
-        # Calculate delay between batches
-        batches_per_hour = posts_per_hour // batch_size
-        if batches_per_hour < 1:
-            batches_per_hour = 1
-        
-        batch_interval = 3600 // batches_per_hour  # seconds between batches
+        limiter = self.bluesky.rate_limiter
+        limiter.configure('post', [(batch_size, 3600 * batch_size / max(1, posts_per_hour))])
         
         while True:
             # Check if we should stop
-            if run_hours:
-                elapsed = (datetime.now() - start_time).total_seconds() / 3600
-                if elapsed >= run_hours:
-                    logger.info(f"Reached time limit ({run_hours} hours)")
-                    break
+            if deadline and datetime.now() >= deadline:
+                logger.info(f"Reached time limit ({run_hours} hours)")
+                break
+            
+            wait = limiter.wait_time('post')
+            if wait > 0:
+                if deadline:
+                    wait = min(wait, max(0.0, (deadline - datetime.now()).total_seconds()))
+                logger.info(f"Waiting {wait:.0f} seconds until next post is allowed...")
+                time.sleep(wait)
+                continue
             
-            # Run a batch
-            posted = self.run_batch(max_posts=batch_size, delay_seconds=20)
+            # Run a batch sized to the budget available right now
+            budget = min(batch_size, int(limiter.available('post')))
+            posted = self.run_batch(max_posts=budget)
+            if posted:
+                limiter.consume('post', posted)
             total_posted += posted
             
-            if posted == 0:
-                logger.info("No new documents to post. Waiting for next scrape...")
-                # Wait longer if nothing to post
-                time.sleep(batch_interval * 2)
+            if posted:
+                failed_batches = 0
+            elif self.last_batch_failed:
+                delay = min(max_retry_seconds, retry_seconds * 2 ** failed_batches)
+                failed_batches += 1
+                if deadline:
+                    delay = min(delay, max(0.0, (deadline - datetime.now()).total_seconds()))
+                logger.warning(f"All {self.last_batch_failed} posts failed. Retrying in {delay:.0f} seconds...")
+                time.sleep(delay)
             else:
-                # Wait for next batch
-                logger.info(f"Waiting {batch_interval} seconds until next batch...")
-                time.sleep(batch_interval)
+                failed_batches = 0
+                logger.info("No new documents to post. Waiting for next scrape...")
+                self._wait_for_new_results(deadline)
         
         logger.info(f"Continuous run complete: {total_posted} total documents posted")
         return total_posted
@@ -238,19 +289,21 @@ class CouncilBotScheduler:
             elif doc.get('document_type') == 'minutes':
                 by_council[council]['minutes'] += 1
         
-        # Count posted
-        posted_count = len(self.bluesky.posted_docs)
+        # Count posted (the store holds several hashes per document, so count
+        # what the pre-filter would skip rather than the raw store size)
+        candidates, skipped = self.filter_unposted(all_docs)
         
         return {
             'total_documents': len(all_docs),
-            'posted_documents': posted_count,
-            'remaining_documents': len(all_docs) - posted_count,
+            'posted_documents': skipped.get('already_posted', 0),
+            'remaining_documents': len(candidates),
+            'skipped': skipped,
             'councils_with_documents': len(by_council),
             'by_council': by_council
         }
 
 
-def main():
+def main(argv=None):
     """Main entry point"""
     import argparse
     
@@ -262,10 +315,11 @@ def main():
     parser.add_argument('--hours', type=int, help='Run for N hours then stop')
     parser.add_argument('--stats', action='store_true', help='Show statistics and exit')
     parser.add_argument('--results', default='all_councils_results.json', help='Results file to read from')
+    parser.add_argument('--seed', type=int, help='Seed for deterministic ranking jitter')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    scheduler = CouncilBotScheduler(results_file=args.results)
+    scheduler = CouncilBotScheduler(results_file=args.results, seed=args.seed)
     
     if args.stats:
         # Show statistics
@@ -294,7 +348,9 @@ def main():
     else:
         # Run once
         scheduler.run_batch(max_posts=args.batch)
+    
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
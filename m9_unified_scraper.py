@@ -5,23 +5,24 @@ Final unified M9 scraper - runs all 9 councils with timeout protection
 
 import sys
 import signal
+import argparse
 from pathlib import Path
 from datetime import datetime
 import json
 
 sys.path.append('src/scrapers')
 
-# Import working scrapers from existing modules
-from melbourne_m9_v2 import MelbourneScraper
-from darebin_m9 import DarebinScraper
-from hobsonsbay_m9_fixed import HobsonsBayScraper
-from m9_adapted import MaribyrnongScraper, MerribekScraper
-from moonee_valley_fixed import MooneeValleyFixedScraper
-from yarra_stonnington_fixed import YarraFixedScraper, StonningtonFixedScraper
-from m9_final_three_complete import PortPhillipFinalScraper
-from infocouncil_generic import InfoCouncilScraper, InfoCouncilConfig
-from generic_direct import DirectPageScraper, DirectPageConfig
-from generic_json import JsonListScraper, JsonListConfig
+# Scraper modules are imported lazily, one per council, via the registry
+from scraper_registry import M9_SCRAPERS, get_scraper_class, get_type_classes
+from src.utils.circuit_breaker import council_key, get_breaker, save_breaker
+from src.utils.http_cassette import start_cassette, start_cassette_from_env
+from src.utils.http_politeness import get_scheduler
+from src.utils.instrumentation import get_instruments, write_prometheus
+from src.utils.probe_memo import save_probe_memo
+from src.utils.profiling import add_profile_args, get_profiler, start_profiler_from_args
+from src.utils.dedup import DocumentIndex, council_counts
+from src.utils.documents import serialize_documents
+from src.utils.sharding import parse_shard, select_shard, shard_path
 
 
 class TimeoutError(Exception):
@@ -34,12 +35,14 @@ def timeout_handler(signum, frame):
     raise TimeoutError("Scraping timed out")
 
 
-def scrape_with_timeout(scraper_class, timeout_seconds=120):
+def scrape_with_timeout(scraper_class, name, council_id, timeout_seconds=120):
     """
     Scrape a council with a timeout limit
     
     Args:
         scraper_class: The scraper class to instantiate and run
+        name: Council name, for the profile
+        council_id: Council id the run's timings, requests and circuit are keyed by
         timeout_seconds: Maximum seconds to allow for scraping
     
     Returns:
@@ -49,51 +52,77 @@ def scrape_with_timeout(scraper_class, timeout_seconds=120):
     signal.signal(signal.SIGALRM, timeout_handler)
     signal.alarm(timeout_seconds)
     
+    circuit = council_key('m9', council_id)
     try:
-        scraper = scraper_class()
-        docs = scraper.scrape()
+        with instruments.council(council_id), breaker.council(circuit), \
+                get_profiler().unit('scrape', name, council_id):
+            scraper = scraper_class()
+            docs = scraper.scrape()
         signal.alarm(0)  # Cancel the alarm
+        breaker.record_council(circuit, bool(docs))
         return docs
     except TimeoutError:
         print(f"  ⏱️  TIMEOUT after {timeout_seconds}s - skipping to next council")
         signal.alarm(0)  # Cancel the alarm
+        breaker.record_council(circuit, False, f"timeout after {timeout_seconds}s")
         return []
     except Exception as e:
         print(f"  ❌ Error: {e}")
         signal.alarm(0)  # Cancel the alarm
+        breaker.record_council(circuit, False, str(e))
         return []
 
 
+parser = argparse.ArgumentParser(description='Scrape the M9 councils and registry InfoCouncil councils')
+parser.add_argument('--shard', help='Scrape only shard i/N (writes a partial results file)')
+parser.add_argument('--output', default='m9_scraper_results.json', help='Output file path')
+parser.add_argument('--metrics', metavar='PATH', help='Also write per-council metrics in Prometheus text format')
+cassette_args = parser.add_mutually_exclusive_group()
+cassette_args.add_argument('--record', metavar='PATH', help='Record all HTTP traffic to a cassette file')
+cassette_args.add_argument('--replay', metavar='PATH', help='Replay HTTP traffic from a cassette file (no network)')
+add_profile_args(parser)
+args = parser.parse_args()
+profiler = start_profiler_from_args(args)
+
+if args.record or args.replay:
+    start_cassette(args.record or args.replay, 'record' if args.record else 'replay')
+else:
+    start_cassette_from_env()
+
+shard = None
+if args.shard:
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+output_path = shard_path(args.output, *shard) if shard else args.output
+
 print("M9 COUNCIL BOT - FINAL UNIFIED SCRAPER (v3)")
 print("=" * 60)
 print("⏱️  Timeout protection enabled: 120s per council")
 print("🔄 Running M9 councils and additional InfoCouncil councils...")
 print("✨ Using improved scrapers for Yarra and Stonnington\n")
 
-# All 9 M9 councils
-scrapers = [
-    ("Melbourne", MelbourneScraper),
-    ("Darebin", DarebinScraper),
-    ("Hobsons Bay", HobsonsBayScraper),
-    ("Maribyrnong", MaribyrnongScraper),
-    ("Merri-bek", MerribekScraper),
-    ("Moonee Valley", MooneeValleyFixedScraper),
-    ("Yarra", YarraFixedScraper),
-    ("Stonnington", StonningtonFixedScraper),
-    ("Port Phillip", PortPhillipFinalScraper),
-]
+# All 9 M9 councils (sharded by scraper name)
+scrapers = M9_SCRAPERS
+if shard:
+    scrapers = select_shard(scrapers, *shard, key=lambda s: s[1])
+    print(f"🧩 Shard {shard[0]}/{shard[1]}: {len(scrapers)} of {len(M9_SCRAPERS)} M9 councils")
 
-all_documents = []
+# Darebin is scraped by both lists, so dedupe across councils as we go
+index = DocumentIndex()
 council_stats = []
+instruments = get_instruments()
+breaker = get_breaker()
 start_time = datetime.now()
 
-for idx, (name, scraper_class) in enumerate(scrapers, 1):
+for idx, (name, scraper_name, council_id) in enumerate(scrapers, 1):
     council_start = datetime.now()
     print(f"\n[{idx}/{len(scrapers)}] {name}:")
     print(f"  ⏰ Started at {council_start.strftime('%H:%M:%S')}")
     
     try:
-        docs = scrape_with_timeout(scraper_class, timeout_seconds=120)
+        docs = scrape_with_timeout(get_scraper_class(scraper_name), name, council_id, timeout_seconds=120)
         
         # Count by type
         agendas = [d for d in docs if d.document_type == 'agenda']
@@ -106,26 +135,31 @@ for idx, (name, scraper_class) in enumerate(scrapers, 1):
         if docs:
             print(f"  📌 Most recent: {docs[0].date} - {docs[0].title[:50]}...")
             
-        all_documents.extend(docs)
+        with instruments.council(council_id), instruments.phase('serialize'):
+            kept = index.keep(serialize_documents(docs))
         council_stats.append({
+            'id': council_id,
             'name': name,
-            'total': len(docs),
-            'agendas': len(agendas),
-            'minutes': len(minutes),
+            **council_counts(kept, len(docs)),
             'working': len(docs) > 0,
-            'scrape_time': elapsed
+            'scrape_time': elapsed,
+            **instruments.summary(council_id, len(docs)),
+            **breaker.summary(council_key('m9', council_id))
         })
         
     except Exception as e:
         elapsed = (datetime.now() - council_start).total_seconds()
         print(f"  ❌ Error after {elapsed:.1f}s: {e}")
         council_stats.append({
+            'id': council_id,
             'name': name,
             'total': 0,
             'agendas': 0,
             'minutes': 0,
             'working': False,
-            'scrape_time': elapsed
+            'scrape_time': elapsed,
+            **instruments.summary(council_id, 0),
+            **breaker.summary(council_key('m9', council_id))
         })
 
 # Registry-driven InfoCouncil councils
@@ -141,11 +175,14 @@ if registry_path.exists():
     except Exception as e:
         print(f"⚠️  Warning: Could not load registry: {e}")
         reg = []
+    if shard:
+        reg = select_shard(reg, *shard, key=lambda row: row.get('id') or row.get('name') or '')
         
     for idx, row in enumerate(reg, 1):
         typ = (row.get('type') or '').lower()
         council_id = row.get('id') or 'UNK'
         name = row.get('name') or council_id
+        circuit = council_key('m9', council_id)
         
         council_start = datetime.now()
         print(f"\n[{idx}/{len(reg)}] {name} (registry - {typ}):")
@@ -156,29 +193,34 @@ if registry_path.exists():
             signal.signal(signal.SIGALRM, timeout_handler)
             signal.alarm(120)
             
-            if typ == 'infocouncil':
-                base = row.get('base') or ''
-                cfg = InfoCouncilConfig(council_id=council_id, council_name=name, base_url=base, months_back=6)
-                docs = InfoCouncilScraper(cfg).scrape()
-            elif typ == 'direct_page':
-                cfg = DirectPageConfig(council_id=council_id, council_name=name, page_url=row['page_url'], base_url=row.get('base'))
-                docs = DirectPageScraper(cfg).scrape()
-            elif typ == 'json_list':
-                cfg = JsonListConfig(
-                    council_id=council_id,
-                    council_name=name,
-                    endpoint=row['endpoint'],
-                    item_path=row.get('item_path', []),
-                    title_field=row['title_field'],
-                    url_field=row['url_field'],
-                    date_field=row['date_field'],
-                )
-                docs = JsonListScraper(cfg).scrape()
-            else:
-                print("  ⏭️  Skipped: unknown type")
-                docs = []
+            with instruments.council(council_id), breaker.council(circuit), get_profiler().unit('scrape', name, council_id):
+                if typ == 'infocouncil':
+                    InfoCouncilScraper, InfoCouncilConfig = get_type_classes(typ)
+                    base = row.get('base') or ''
+                    cfg = InfoCouncilConfig(council_id=council_id, council_name=name, base_url=base, months_back=6)
+                    docs = InfoCouncilScraper(cfg).scrape()
+                elif typ == 'direct_page':
+                    DirectPageScraper, DirectPageConfig = get_type_classes(typ)
+                    cfg = DirectPageConfig(council_id=council_id, council_name=name, page_url=row['page_url'], base_url=row.get('base'))
+                    docs = DirectPageScraper(cfg).scrape()
+                elif typ == 'json_list':
+                    JsonListScraper, JsonListConfig = get_type_classes(typ)
+                    cfg = JsonListConfig(
+                        council_id=council_id,
+                        council_name=name,
+                        endpoint=row['endpoint'],
+                        item_path=row.get('item_path', []),
+                        title_field=row['title_field'],
+                        url_field=row['url_field'],
+                        date_field=row['date_field'],
+                    )
+                    docs = JsonListScraper(cfg).scrape()
+                else:
+                    print("  ⏭️  Skipped: unknown type")
+                    docs = []
             
             signal.alarm(0)  # Cancel timeout
+            breaker.record_council(circuit, bool(docs))
             
             agendas = [d for d in docs if d.document_type == 'agenda']
             minutes = [d for d in docs if d.document_type == 'minutes']
@@ -190,41 +232,55 @@ if registry_path.exists():
             if docs:
                 print(f"  📌 Most recent: {docs[0].date} - {docs[0].title[:50]}...")
                 
-            all_documents.extend(docs)
+            with instruments.council(council_id), instruments.phase('serialize'):
+                kept = index.keep(serialize_documents(docs))
             council_stats.append({
+                'id': council_id,
                 'name': name,
-                'total': len(docs),
-                'agendas': len(agendas),
-                'minutes': len(minutes),
+                **council_counts(kept, len(docs)),
                 'working': len(docs) > 0,
-                'scrape_time': elapsed
+                'scrape_time': elapsed,
+                **instruments.summary(council_id, len(docs)),
+                **breaker.summary(circuit)
             })
             
         except TimeoutError:
             signal.alarm(0)
             elapsed = (datetime.now() - council_start).total_seconds()
+            breaker.record_council(circuit, False, f"timeout after {elapsed:.0f}s")
             print(f"  ⏱️  TIMEOUT after {elapsed:.1f}s - skipping")
             council_stats.append({
+                'id': council_id,
                 'name': name,
                 'total': 0,
                 'agendas': 0,
                 'minutes': 0,
                 'working': False,
-                'scrape_time': elapsed
+                'scrape_time': elapsed,
+                **instruments.summary(council_id, 0),
+                **breaker.summary(circuit)
             })
         except Exception as e:
             signal.alarm(0)
             elapsed = (datetime.now() - council_start).total_seconds()
+            breaker.record_council(circuit, False, str(e))
             print(f"  ❌ Error after {elapsed:.1f}s: {e}")
             council_stats.append({
+                'id': council_id,
                 'name': name,
                 'total': 0,
                 'agendas': 0,
                 'minutes': 0,
                 'working': False,
-                'scrape_time': elapsed
+                'scrape_time': elapsed,
+                **instruments.summary(council_id, 0),
+                **breaker.summary(circuit)
             })
 
+# Keep this run's probe outcomes and circuit states for the next one
+save_probe_memo()
+save_breaker()
+
 # Summary
 total_elapsed = (datetime.now() - start_time).total_seconds()
 print(f"\n{'='*60}")
@@ -232,7 +288,7 @@ print("FINAL SUMMARY")
 print(f"{'='*60}")
 print(f"⏱️  Total scraping time: {total_elapsed:.1f}s ({total_elapsed/60:.1f} minutes)")
 print(f"\n✅ Working councils: {sum(1 for c in council_stats if c['working'])}/{len(council_stats)}")
-print(f"📄 Total documents: {len(all_documents)}")
+print(f"📄 Total documents: {len(index)}")
 print(f"📋 Total agendas: {sum(c['agendas'] for c in council_stats)}")
 print(f"📝 Total minutes: {sum(c['minutes'] for c in council_stats)}")
 
@@ -245,46 +301,44 @@ for stat in sorted(council_stats, key=lambda x: x['total'], reverse=True):
     print(f"  {status} {stat['name']:20} - {stat['total']:3} docs in {time_str:>6}")
 
 # Save results
+if index.stats()['collapsed']:
+    print(f"🧹 Collapsed {index.stats()['collapsed']} duplicate documents")
+
 output_data = {
     'scrape_date': datetime.now().isoformat(),
     'total_scrape_time': total_elapsed,
     'total_councils': len(council_stats),
     'working_councils': sum(1 for c in council_stats if c['working']),
-    'total_documents': len(all_documents),
+    'total_documents': len(index),
     'council_stats': council_stats,
-    'documents': [
-        {
-            'council_id': doc.council_id,
-            'council_name': doc.council_name,
-            'document_type': doc.document_type,
-            'meeting_type': doc.meeting_type,
-            'title': doc.title,
-            'date': doc.date,
-            'url': doc.url,
-            'webpage_url': doc.webpage_url
-        }
-        for doc in all_documents
-    ]
+    'host_metrics': get_scheduler().metrics(),
+    'dedup': index.stats(),
+    'documents': index.documents
 }
 
 # Save to file
-with open('m9_scraper_results.json', 'w') as f:
+with open(output_path, 'w') as f:
     json.dump(output_data, f, indent=2)
 
-print(f"\n💾 Results saved to m9_scraper_results.json")
+print(f"\n💾 Results saved to {output_path}")
+if args.metrics:
+    write_prometheus(args.metrics, council_stats)
+    print(f"📈 Metrics saved to {args.metrics}")
+if profiler and profiler.write_summary():
+    print(f"🔬 Profiles saved to {profiler.out_dir}/ (summary.txt)")
 
-# Check if we achieved 9/9 for M9 councils
-m9_working = sum(1 for c in council_stats[:9] if c['working'])
-if m9_working == 9:
+# Check if we achieved 9/9 for M9 councils (the first entries in council_stats)
+m9_working = sum(1 for c in council_stats[:len(scrapers)] if c['working'])
+if m9_working == len(M9_SCRAPERS):
     print("\n🎉 " * 10)
     print("SUCCESS! ALL 9 M9 COUNCILS ARE WORKING!")
     print("🎉 " * 10)
 
-print(f"\n📊 FINAL STATUS: {m9_working}/9 M9 councils operational")
-print(f"📄 Total of {len(all_documents)} documents ready for processing")
+print(f"\n📊 FINAL STATUS: {m9_working}/{len(scrapers)} M9 councils operational")
+print(f"📄 Total of {len(index)} documents ready for processing")
 
 # Exit with error if no documents were found
-if len(all_documents) == 0:
+if len(index) == 0:
     print("\n⚠️  WARNING: No documents were scraped. This may indicate a problem.")
     sys.exit(1)
 
@@ -5,11 +5,28 @@ Monitor all 79 Victorian councils and post to BlueSky
 """
 
 import sys
-import subprocess
+import runpy
 import argparse
 from pathlib import Path
 
-def main():
+# Command modules are imported inside each branch so that e.g. `status`
+# never loads the scrapers or atproto.
+
+
+def run_script(path: str, args=()) -> int:
+    """Run a top-level script in this interpreter and return its exit code"""
+    saved_argv = sys.argv
+    sys.argv = [path, *args]
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description='Victorian Council Bot - Automated transparency for local government',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -17,10 +34,16 @@ def main():
 Examples:
   python run.py scrape              # Scrape all councils
   python run.py scrape --limit 10   # Scrape 10 councils
+  python run.py scrape --shard 1/4  # Scrape a quarter of the councils
+  python run.py scrape --record cassettes/today.zip  # Save all HTTP traffic
+  python run.py scrape --replay cassettes/today.zip  # Re-run offline from it
+  python run.py merge               # Combine shard results into one file
   python run.py post                # Post to BlueSky
   python run.py post --batch 5      # Post 5 documents
   python run.py status              # Show current status
   python run.py test                # Run tests
+  python run.py daemon              # Scrape on the meeting calendar, preview posts
+  python run.py daemon --live       # ...and post to BlueSky
         """
     )
     
@@ -30,6 +53,15 @@ Examples:
     scrape_parser = subparsers.add_parser('scrape', help='Scrape council websites')
     scrape_parser.add_argument('--limit', type=int, help='Limit number of councils')
     scrape_parser.add_argument('--council', help='Scrape specific council by ID')
+    scrape_parser.add_argument('--shard', help='Scrape only shard i/N of the registry')
+    scrape_parser.add_argument('--jobs', type=int, help='Scrape in N processes and merge the results')
+    scrape_parser.add_argument('--record', metavar='PATH', help='Record all HTTP traffic to a cassette file')
+    scrape_parser.add_argument('--replay', metavar='PATH', help='Replay a cassette instead of using the network')
+    
+    # Merge command
+    merge_parser = subparsers.add_parser('merge', help='Merge shard results files')
+    merge_parser.add_argument('files', nargs='*', help='Shard results files (default: all_councils_results.shard-*.json)')
+    merge_parser.add_argument('--output', default='all_councils_results.json', help='Merged results file')
     
     # Post command
     post_parser = subparsers.add_parser('post', help='Post to BlueSky')
@@ -42,7 +74,16 @@ Examples:
     # Test command
     subparsers.add_parser('test', help='Run tests')
     
-    args = parser.parse_args()
+    # Daemon command
+    daemon_parser = subparsers.add_parser('daemon', help='Scrape and post in a long-running process')
+    daemon_parser.add_argument('--live', action='store_true', help='Post to BlueSky instead of dry-run')
+    daemon_parser.add_argument('--batch', type=int, default=1, help='Posts per posting interval (default: 1)')
+    daemon_parser.add_argument('--post-interval', type=int, default=60, help='Minutes between posts (default: 60)')
+    daemon_parser.add_argument('--limit', type=int, help='Limit number of councils')
+    daemon_parser.add_argument('--hours', type=float, help='Stop after N hours (default: run forever)')
+    daemon_parser.add_argument('--seed', type=int, help='Seed for deterministic ranking jitter')
+    
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -50,27 +91,56 @@ Examples:
     
     # Execute commands
     if args.command == 'scrape':
-        cmd = [sys.executable, 'universal_scraper.py']
+        import universal_scraper
+        cmd = []
         if args.limit:
             cmd.extend(['--limit', str(args.limit)])
         if args.council:
             cmd.extend(['--council', args.council])
-        return subprocess.call(cmd)
+        if args.shard:
+            cmd.extend(['--shard', args.shard])
+        if args.jobs:
+            cmd.extend(['--jobs', str(args.jobs)])
+        if args.record:
+            cmd.extend(['--record', args.record])
+        if args.replay:
+            cmd.extend(['--replay', args.replay])
+        return universal_scraper.main(cmd)
+    
+    elif args.command == 'merge':
+        from scripts import merge_results
+        return merge_results.main([*args.files, '--output', args.output])
     
     elif args.command == 'post':
-        cmd = [sys.executable, 'enhanced_scheduler.py']
-        cmd.extend(['--batch', str(args.batch)])
-        if not args.continuous:
+        import enhanced_scheduler
+        cmd = ['--batch', str(args.batch)]
+        if args.continuous:
+            cmd.append('--continuous')
+        else:
             cmd.append('--once')
-        return subprocess.call(cmd)
+        return enhanced_scheduler.main(cmd)
     
     elif args.command == 'status':
-        return subprocess.call([sys.executable, 'scripts/monitor.py'])
+        from scripts import monitor
+        return monitor.main([])
     
     elif args.command == 'test':
         # Run M9 scraper as a test
         print("Testing with M9 councils...")
-        return subprocess.call([sys.executable, 'm9_unified_scraper.py'])
+        return run_script('m9_unified_scraper.py')
+    
+    elif args.command == 'daemon':
+        from datetime import timedelta
+        from src.daemon import CouncilDaemon
+        daemon = CouncilDaemon(
+            dry_run=not args.live,
+            batch=args.batch,
+            post_interval=timedelta(minutes=args.post_interval),
+            limit=args.limit,
+            seed=args.seed
+        )
+        daemon.run(hours=args.hours)
+        return 0
     
     return 0
 
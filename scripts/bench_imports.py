@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup / import time.
+
+Each case runs in a fresh interpreter (so nothing is already cached in
+sys.modules) and the median wall time over --runs is reported. With
+--importtime, the slowest modules from `python -X importtime` are listed
+for each case.
+
+Usage:
+  python scripts/bench_imports.py
+  python scripts/bench_imports.py --runs 10 --importtime
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES = [
+    ('python (baseline)', 'pass'),
+    ('import universal_scraper', 'import universal_scraper'),
+    ('universal_scraper + Melbourne class',
+     "import universal_scraper; from scraper_registry import get_scraper_class; "
+     "get_scraper_class('MelbourneScraper')"),
+    ('universal_scraper + InfoCouncil classes',
+     "import universal_scraper; from scraper_registry import get_type_classes; "
+     "get_type_classes('infocouncil')"),
+    ('all scraper modules (eager)',
+     "import sys; sys.path.append('src/scrapers'); import scraper_registry as r; "
+     "[r.resolve(p) for p in r.SCRAPER_PATHS.values()]; "
+     "[r.resolve(p) for t in r.TYPE_PATHS.values() for p in t if p]"),
+    ('run.py --help', None),
+]
+
+
+def _command(stmt):
+    if stmt is None:
+        return [sys.executable, 'run.py', '--help']
+    return [sys.executable, '-c', stmt]
+
+
+def time_case(stmt, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(_command(stmt), cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def slowest_imports(stmt, top):
+    """Return [(cumulative_us, module)] for the slowest imports of a case."""
+    cmd = _command(stmt)
+    cmd.insert(1, '-X')
+    cmd.insert(2, 'importtime')
+    proc = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            _, cumulative, module = line[len('import time:'):].split('|', 2)
+            rows.append((int(cumulative), module.rstrip()))
+        except ValueError:
+            continue
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLI import time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per case (median reported)')
+    parser.add_argument('--importtime', action='store_true', help='Show slowest imports per case')
+    parser.add_argument('--top', type=int, default=8, help='Modules to list with --importtime')
+    args = parser.parse_args()
+
+    print(f"{'case':45} {'median':>10}")
+    print('-' * 56)
+    for label, stmt in CASES:
+        print(f"{label:45} {time_case(stmt, args.runs) * 1000:8.1f}ms")
+        if args.importtime:
+            for cumulative, module in slowest_imports(stmt, args.top):
+                print(f"    {cumulative / 1000:8.1f}ms {module}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scrape and post pipeline offline.
+
+Every council host is served by a local stand-in server
+(src/utils/standin_server.py) instead of the live sites, and these run end
+to end against it:
+
+  m9         m9_unified_scraper.py (the script itself, output to a temp file)
+  universal  VictorianCouncilScraper.scrape_all
+  scheduler  Scheduler.run in dry-run mode on the universal (or m9) results,
+             downloading and extracting every scheduled PDF
+
+Each phase reports wall time, documents (or posts) per second, requests
+by status, bytes served and peak traced memory. Per-host politeness is on
+but unthrottled by default (--host-rate 0), so the numbers measure our
+code rather than sleeps. Probe and session caches and circuit breaker
+state are not read or written.
+
+With --record the stand-in traffic is also saved as an HTTP cassette
+(src/utils/http_cassette.py); --replay answers from a cassette instead of
+the stand-in, e.g. one recorded against the live sites with
+`python run.py scrape --record`.
+
+Usage:
+  python scripts/bench_pipeline.py
+  python scripts/bench_pipeline.py --phases universal,scheduler --limit 20
+  python scripts/bench_pipeline.py --latency 0.05 --jitter 0.05 --error-rate 0.02 --json bench.json
+  python scripts/bench_pipeline.py --replay cassettes/live.zip
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import runpy
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PHASES = ('m9', 'universal', 'scheduler')
+
+
+def run_m9(ctx):
+    output = os.path.join(ctx['tmp'], 'm9_results.json')
+    saved_argv = sys.argv
+    sys.argv = ['m9_unified_scraper.py', '--output', output]
+    try:
+        runpy.run_path(str(ROOT / 'm9_unified_scraper.py'), run_name='__main__')
+    except SystemExit:
+        pass
+    finally:
+        sys.argv = saved_argv
+    with open(output) as f:
+        ctx['m9'] = json.load(f)
+    return ctx['m9']['total_documents'], 'documents'
+
+
+def run_universal(ctx):
+    from universal_scraper import VictorianCouncilScraper
+    ctx['universal'] = VictorianCouncilScraper().scrape_all(limit=ctx['limit'])
+    return ctx['universal']['total_documents'], 'documents'
+
+
+def run_scheduler(ctx):
+    from src.posting.scheduler import Scheduler
+    results = ctx.get('universal') or ctx.get('m9')
+    if results is None:
+        raise SystemExit('scheduler phase needs the m9 or universal phase to run first')
+    sched = Scheduler(results=results, posted_file=os.path.join(ctx['tmp'], 'posted.json'), dry_run=True,
+                      seed=ctx['seed'])
+    return len(sched.run()), 'posts'
+
+
+RUNNERS = {'m9': run_m9, 'universal': run_universal, 'scheduler': run_scheduler}
+
+
+def measure(name, ctx, source, quiet=True):
+    """Run one phase; returns its report row. `source` is the server or cassette answering."""
+    before = source.stats()
+    tracemalloc.start()
+    start = time.perf_counter()
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+        units, unit = RUNNERS[name](ctx)
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = source.stats()
+    by_status = {k: v - before['by_status'].get(k, 0) for k, v in after['by_status'].items()
+                 if v - before['by_status'].get(k, 0)}
+    requests = after['requests'] - before['requests']
+    return {
+        'phase': name,
+        'wall_s': round(wall, 3),
+        unit: units,
+        'per_s': round(units / wall, 2) if wall else None,
+        'requests': requests,
+        'requests_per_s': round(requests / wall, 1) if wall else None,
+        'by_status': by_status,
+        'bytes': after['bytes'] - before['bytes'],
+        'peak_mb': round(peak / 1e6, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline against a local stand-in server')
+    parser.add_argument('--phases', default=','.join(PHASES), help='Comma-separated phases to run, in order')
+    parser.add_argument('--limit', type=int, help='Councils for the universal phase')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds, random')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503, help='Status for injected errors')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Fraction of connections closed without a response')
+    parser.add_argument('--fixtures', help='Directory of recorded pages, laid out as <host>/<path>')
+    parser.add_argument('--host-rate', default='0', help='SCRAPE_HOST_RATE for the run (0 = unthrottled)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency, error injection and ranking jitter')
+    parser.add_argument('--record', metavar='PATH', help='Also save the traffic as an HTTP cassette')
+    parser.add_argument('--replay', metavar='PATH', help='Answer from an HTTP cassette instead of the stand-in')
+    parser.add_argument('--json', help='Also write the report to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show scraper output and logs')
+    args = parser.parse_args(argv)
+
+    if args.record and args.replay:
+        parser.error('--record and --replay are mutually exclusive')
+    phases = [p.strip() for p in args.phases.split(',') if p.strip()]
+    unknown = [p for p in phases if p not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown phase(s): {', '.join(unknown)}")
+
+    # Settings are read at import time, so set them before importing the pipeline
+    os.environ['SCRAPE_HOST_RATE'] = args.host_rate
+    os.environ['PROBE_CACHE_FILE'] = ''
+    os.environ['HTTP_SESSION_FILE'] = ''
+    os.environ['CIRCUIT_FILE'] = ''
+    os.environ.pop('FAST_PREVIEW', None)
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+    sys.path.append(str(ROOT / 'src' / 'scrapers'))
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    from src.utils.http_cassette import Cassette
+    from src.utils.standin_server import SiteModel, StandinServer, routed_to
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+        ctx = {'tmp': tmp, 'limit': args.limit, 'seed': args.seed}
+        if args.replay:
+            source = stack.enter_context(Cassette(args.replay, 'replay'))
+        else:
+            source = stack.enter_context(StandinServer(
+                SiteModel(fixtures=args.fixtures), latency=args.latency, jitter=args.jitter,
+                error_rate=args.error_rate, error_status=args.error_status,
+                drop_rate=args.drop_rate, seed=args.seed))
+            stack.enter_context(routed_to(source.base_url))
+            if args.record:
+                # Installed after routing, so it records the real URLs
+                stack.enter_context(Cassette(args.record, 'record'))
+        for name in phases:
+            rows.append(measure(name, ctx, source, quiet=not args.verbose))
+
+    print(f"{'phase':10} {'wall':>8} {'units':>12} {'per s':>8} {'requests':>9} {'req/s':>8} "
+          f"{'MB sent':>8} {'peak MB':>8}")
+    print('-' * 80)
+    for row in rows:
+        unit = 'posts' if 'posts' in row else 'documents'
+        print(f"{row['phase']:10} {row['wall_s']:7.2f}s {row[unit]:>6} {unit:5} {row['per_s'] or 0:8.1f} "
+              f"{row['requests']:9} {row['requests_per_s'] or 0:8.1f} {row['bytes'] / 1e6:8.2f} {row['peak_mb']:8.1f}")
+        print(f"{'':10} statuses: {json.dumps(row['by_status'], sort_keys=True)}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'phases': rows}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Merge sharded scrape results into one results file.
+
+Each `--shard i/N` run writes e.g. all_councils_results.shard-2-of-4.json;
+this combines them (documents deduplicated by canonical URL) so the
+scheduler, monitor and coverage report see a single file.
+
+Usage:
+  python scripts/merge_results.py                          # all_councils_results.shard-*.json
+  python scripts/merge_results.py a.json b.json --output all_councils_results.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.sharding import merge_results
+from src.utils.state_files import atomic_write
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Merge sharded scrape results')
+    p.add_argument('files', nargs='*', help='Shard results files')
+    p.add_argument('--output', default='all_councils_results.json', help='Merged results file')
+    args = p.parse_args(argv)
+
+    stem, suffix = os.path.splitext(args.output)
+    files = args.files or sorted(glob.glob(f"{stem}.shard-*-of-*{suffix}"))
+    if not files:
+        print(f"No shard files found for {args.output}")
+        return 1
+
+    parts = []
+    for path in files:
+        with open(path, 'r') as f:
+            parts.append(json.load(f))
+
+    results = merge_results(parts)
+    with atomic_write(args.output) as f:
+        json.dump(results, f, indent=2)
+
+    print(f"Merged {len(files)} shard files: {results['total_councils']} councils, "
+          f"{results['total_documents']} documents -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
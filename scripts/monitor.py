@@ -28,7 +28,7 @@ def format_time_ago(date_str):
     except:
         return date_str
 
-def main():
+def main(argv=None):
     print("""
 ╔════════════════════════════════════════════════════════════════╗
 ║          VICTORIAN COUNCIL BOT - STATUS MONITOR               ║
@@ -132,6 +132,7 @@ def main():
     print("\n" + "=" * 60)
     print("Monitor complete. Bot is ready for deployment!")
     print("\n🌐 BlueSky: https://bsky.app/profile/councilbot.bsky.social")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Show or export the meeting-aware scrape polling plan.
+
+Reads the council registry and the verified meeting ICS/CSV data, takes
+each council's last scrape time from the results file (the `last_scraped`
+field written by the daemon) and prints when each council should be
+scraped next.
+
+Usage:
+  python scripts/poll_plan.py                    # table, soonest first
+  python scripts/poll_plan.py --due              # ids of councils due now
+  python scripts/poll_plan.py --output poll_plan.json
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from src.utils.meeting_calendar import MeetingCalendar, MEETINGS_CSV, MEETINGS_ICS
+
+
+def load_last_polled(results_path: Path, councils) -> dict:
+    if not results_path.exists():
+        return {}
+    try:
+        data = json.loads(results_path.read_text())
+    except Exception:
+        return {}
+    ids = {c.get('name'): c.get('id') for c in councils}
+    last = {}
+    for stat in data.get('council_stats', []):
+        when = stat.get('last_scraped')
+        cid = stat.get('id') or ids.get(stat.get('name'))
+        if when and cid:
+            try:
+                last[cid] = datetime.fromisoformat(when)
+            except ValueError:
+                continue
+    return last
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Meeting-aware scrape polling plan')
+    p.add_argument('--registry', default=str(ROOT / 'src' / 'registry' / 'all_councils.json'))
+    p.add_argument('--ics', default=str(ROOT / MEETINGS_ICS))
+    p.add_argument('--csv', default=str(ROOT / MEETINGS_CSV))
+    p.add_argument('--results', default=str(ROOT / 'all_councils_results.json'))
+    p.add_argument('--due', action='store_true', help='Print only the ids of councils due now')
+    p.add_argument('--output', help='Write the plan as JSON to this file')
+    args = p.parse_args(argv)
+
+    councils = json.loads(Path(args.registry).read_text()).get('councils', [])
+    calendar = MeetingCalendar.from_files(args.ics, args.csv)
+    now = datetime.now()
+    plan = calendar.plan(councils, now, load_last_polled(Path(args.results), councils))
+
+    if args.due:
+        for when, council in plan:
+            if when <= now:
+                print(council['id'])
+        return 0
+
+    if args.output:
+        payload = {
+            'generated': now.isoformat(timespec='seconds'),
+            'councils': {
+                council['id']: {
+                    'name': council.get('name'),
+                    'next_poll': when.isoformat(timespec='minutes'),
+                    'meetings': [m.isoformat(timespec='minutes') for m in calendar.meetings_for(council.get('name', ''))],
+                }
+                for when, council in plan
+            },
+        }
+        Path(args.output).write_text(json.dumps(payload, indent=2))
+        print(f"Wrote plan for {len(plan)} councils to {args.output}")
+        return 0
+
+    print(f"{'next poll':17}  {'council':35} meetings")
+    print('-' * 70)
+    for when, council in plan:
+        meetings = calendar.meetings_for(council.get('name', ''))
+        known = ', '.join(m.strftime('%Y-%m-%d') for m in meetings[-2:]) or '-'
+        label = 'now' if when <= now else when.strftime('%Y-%m-%d %H:%M')
+        print(f"{label:17}  {council.get('name', ''):35} {known}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
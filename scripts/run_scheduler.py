@@ -16,6 +16,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
 from src.posting.scheduler import Scheduler
+from src.utils.profiling import add_profile_args, start_profiler_from_args
 
 
 def main():
@@ -24,7 +25,11 @@ def main():
     p.add_argument('--posted-file', default='posted_bluesky.json')
     p.add_argument('--live', action='store_true', help='Post to BlueSky instead of dry-run')
     p.add_argument('--max-posts', type=int, help='Maximum number of posts per run')
+    p.add_argument('--concurrency', type=int, default=1, help='Post up to N threads concurrently (live mode)')
+    p.add_argument('--seed', type=int, help='Seed for deterministic ranking jitter')
+    add_profile_args(p)
     args = p.parse_args()
+    profiler = start_profiler_from_args(args)
 
     # Check if results file exists
     results_path = Path(args.results)
@@ -38,7 +43,7 @@ def main():
         os.environ['MAX_POSTS_PER_RUN'] = str(args.max_posts)
 
     try:
-        sched = Scheduler(results_path=args.results, posted_file=args.posted_file, dry_run=not args.live)
+        sched = Scheduler(results_path=args.results, posted_file=args.posted_file, dry_run=not args.live, seed=args.seed, concurrency=args.concurrency)
         actions = sched.run()
     except Exception as e:
         print(f"Error running scheduler: {e}")
@@ -60,6 +65,9 @@ def main():
                 print("- Thread summary: (none)")
         print("\nDone. This is a dry-run schedule. Use --live to publish.")
 
+    if profiler and profiler.write_summary():
+        print(f"Profiles written to {profiler.out_dir}/ (summary.txt)")
+
 
 if __name__ == '__main__':
     main()
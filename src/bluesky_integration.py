@@ -6,16 +6,78 @@ This module posts meeting documents to BlueSky for transparency.
 import os
 from datetime import datetime
 from atproto import Client, models
-import hashlib
 import json
-from src.utils.url_canonicalize import canonicalize_doc_url
+from types import SimpleNamespace
+from src.utils.url_canonicalize import document_hashes, url_only_hash
 from src.utils.date_format import format_long_date, rewrite_date_in_title
+from src.posting.rate_limit import RateLimiter, observe_rate_limits
+from src.posting.journal import PostJournal
+from src.utils.state_files import atomic_write
+
+
+def chunk_bullets(bullets, limit=290):
+    """Group bullets into reply texts of at most ~300 chars each, in order.
+
+    Each bullet is rendered as "• text"; a reply holds as many whole bullets
+    as fit under `limit` (leaving some buffer), and any single overlong
+    bullet is hard-trimmed to 300 chars.
+    """
+    replies = []
+    chunk = []
+    current_len = 0
+
+    def flush():
+        nonlocal chunk, current_len
+        if not chunk:
+            return
+        text = "\n".join(f"• {b.strip()}" for b in chunk)
+        # Hard trim as safeguard
+        if len(text) > 300:
+            text = text[:297] + "..."
+        replies.append(text)
+        chunk = []
+        current_len = 0
+
+    for b in [x for x in bullets if x and x.strip()]:
+        line = f"• {b.strip()}"
+        if current_len == 0:
+            chunk.append(b)
+            current_len = len(line)
+        elif current_len + 1 + len(line) <= limit:
+            chunk.append(b)
+            current_len += 1 + len(line)
+        else:
+            flush()
+            chunk.append(b)
+            current_len = len(line)
+    flush()
+    return replies
+
+
+def chunk_text(text, limit=300):
+    """Split a paragraph into <=300 char replies by sentence boundaries."""
+    chunks = []
+    remaining = (text or "").strip()
+    while remaining:
+        if len(remaining) <= limit:
+            chunks.append(remaining)
+            break
+        # Find last sentence end before the limit
+        boundary = max(remaining.rfind('. ', 0, limit), remaining.rfind('; ', 0, limit))
+        if boundary <= 0:
+            chunks.append(remaining[:limit])
+            remaining = remaining[limit:]
+        else:
+            chunks.append(remaining[:boundary+1])
+            remaining = remaining[boundary+1:].lstrip()
+    return chunks
 
 
 class BlueSkyPoster:
     """Posts council meeting documents to BlueSky"""
     
-    def __init__(self, handle=None, password=None, posted_file='posted_bluesky.json'):
+    def __init__(self, handle=None, password=None, posted_file='posted_bluesky.json', rate_limiter=None,
+                 journal=None):
         """
         Initialize BlueSky poster
         
@@ -23,11 +85,68 @@ class BlueSkyPoster:
             handle: BlueSky handle (defaults to env var BLUESKY_HANDLE)
             password: BlueSky password (defaults to env var BLUESKY_PASSWORD)
             posted_file: Path to file tracking posted documents
+            rate_limiter: Optional RateLimiter (defaults to persisted token buckets)
+            journal: Optional PostJournal (defaults to the write-ahead journal file)
         """
         self.handle = handle or os.environ.get('BLUESKY_HANDLE')
         self.password = password or os.environ.get('BLUESKY_PASSWORD')
         self.posted_file = posted_file
         self.posted_docs = self._load_posted_docs()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.journal = journal if journal is not None else PostJournal()
+        self._client = None
+        # Reconcile intents left by a previous run on first login
+        self._needs_reconcile = bool(self.journal.pending())
+        self._recover_from_journal()
+        # Only drop finished entries once their roots are in the posted store
+        self.journal.compact()
+        
+    def _get_client(self):
+        """Return a logged-in Client, reusing one session for all posts and replies."""
+        if self._client is None:
+            client = observe_rate_limits(Client(), self.rate_limiter)
+            self.rate_limiter.acquire('createSession')
+            client.login(self.handle, self.password)
+            self._client = client
+        if self._needs_reconcile:
+            self._reconcile_journal(self._client)
+        return self._client
+
+    @staticmethod
+    def _feed_posts(feed_response):
+        """Flatten an author feed response into (text, uri, cid) tuples."""
+        out = []
+        for item in getattr(feed_response, 'feed', None) or []:
+            post = item.post
+            out.append((getattr(post.record, 'text', ''), post.uri, post.cid))
+        return out
+
+    def _reconcile_journal(self, client, limit=100):
+        """Resolve unfinished journal intents against the account's recent posts."""
+        try:
+            feed = client.get_author_feed(actor=self.handle or client.me.did, limit=limit)
+        except Exception as e:
+            print(f"⚠️  Could not reconcile post journal: {e}")
+            return
+        found = self.journal.reconcile(self._feed_posts(feed))
+        if found:
+            print(f"↻ Recovered {found} post(s) that were sent but not recorded")
+        self._needs_reconcile = False
+        self._recover_from_journal()
+
+    def _recover_from_journal(self):
+        """Add journaled root posts missing from the posted store (crash recovery)."""
+        for key, doc, (uri, cid) in list(self.journal.completed_roots()):
+            if key in self.posted_docs:
+                continue
+            ref = SimpleNamespace(uri=uri, cid=cid)
+            if doc:
+                self._record_post(doc['council_name'], doc['doc_type'], doc['doc_title'],
+                                  doc['doc_url'], doc.get('date_str'), ref)
+            else:
+                self.posted_docs.add(key)
+                self._post_index[key] = {'uri': uri, 'cid': cid}
+                self._save_posted_docs()
         
     def _load_posted_docs(self):
         """Load previously posted documents (backwards-compatible)."""
@@ -49,20 +168,25 @@ class BlueSkyPoster:
             'posted': list(self.posted_docs),
             'posts': getattr(self, '_post_index', {}),
         }
-        with open(self.posted_file, 'w') as f:
+        # Write-then-rename so a crash never leaves a truncated store
+        with atomic_write(self.posted_file) as f:
             json.dump(payload, f, indent=2)
     
     def _hash_url_only(self, council_name, doc_url):
         """Stable hash based on council + canonical URL only (title-agnostic)."""
-        canon = canonicalize_doc_url(doc_url)
-        return hashlib.md5(f"{council_name}|{canon}".encode()).hexdigest()
+        return url_only_hash(council_name, doc_url)
 
     def _legacy_hashes(self, council_name, doc_title, doc_url):
         """Return legacy hashes used previously for backward compatibility."""
-        canon = canonicalize_doc_url(doc_url)
-        h_canon_with_title = hashlib.md5(f"{council_name}|{doc_title}|{canon}".encode()).hexdigest()
-        h_raw_with_title = hashlib.md5(f"{council_name}|{doc_title}|{doc_url}".encode()).hexdigest()
-        return h_canon_with_title, h_raw_with_title
+        hashes = document_hashes(council_name, doc_title, doc_url)
+        return hashes.legacy_canon, hashes.legacy_raw
+    
+    def is_posted(self, council_name, doc_title, doc_url):
+        """True if the document matches a url-only or legacy posted hash."""
+        url_only = self._hash_url_only(council_name, doc_url)
+        if url_only in self.posted_docs:
+            return True
+        return any(h in self.posted_docs for h in self._legacy_hashes(council_name, doc_title, doc_url))
     
     def post_document(self, council_name, doc_type, doc_title, doc_url, 
                       date_str=None, council_hashtag=None):
@@ -81,11 +205,52 @@ class BlueSkyPoster:
             bool: True if posted successfully, False otherwise
         """
         # Check if already posted (url-only and legacy title-based)
-        url_only = self._hash_url_only(council_name, doc_url)
-        h_canon_title, h_raw_title = self._legacy_hashes(council_name, doc_title, doc_url)
-        if any(h in self.posted_docs for h in (url_only, h_canon_title, h_raw_title)):
+        if self.is_posted(council_name, doc_title, doc_url):
             return False
         
+        post_text, facets = self._compose_post(council_name, doc_type, doc_title, doc_url,
+                                               date_str=date_str, council_hashtag=council_hashtag)
+        
+        # Post to BlueSky
+        try:
+            client = self._get_client()
+            # Journal reconciliation may just have found this document
+            if self.is_posted(council_name, doc_title, doc_url):
+                return False
+            self.rate_limiter.acquire('createRecord')
+
+            key = self._hash_url_only(council_name, doc_url)
+            self.journal.begin(key, 0, post_text, doc={
+                'council_name': council_name, 'doc_type': doc_type, 'doc_title': doc_title,
+                'doc_url': doc_url, 'date_str': date_str,
+            })
+            try:
+                if facets:
+                    resp = client.send_post(text=post_text, facets=facets)
+                else:
+                    resp = client.send_post(text=post_text)
+            except Exception:
+                # The post may have landed; check the feed before the next send
+                self._needs_reconcile = True
+                raise
+            self.journal.complete(key, 0, resp.uri, resp.cid)
+
+            self._record_post(council_name, doc_type, doc_title, doc_url, date_str, resp)
+
+            print(f"✅ Posted: {doc_title}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error posting to BlueSky: {e}")
+            return False
+
+    def _compose_post(self, council_name, doc_type, doc_title, doc_url,
+                      date_str=None, council_hashtag=None):
+        """Build the root post text and link facets for a document.
+
+        Returns:
+            (post_text, facets) where facets is None if TextBuilder is unavailable
+        """
         # Create post text (no emojis, plain clickable URL)
         pretty_date = format_long_date(date_str) if date_str else None
         date_info = f" ({pretty_date})" if pretty_date else ""
@@ -103,61 +268,58 @@ class BlueSkyPoster:
             if available > 20:
                 doc_title = doc_title[:available] + "..."
                 post_text = f"{header}\n\n{doc_title}\n\n{footer}"
-        
-        # Post to BlueSky
-        try:
-            client = Client()
-            client.login(self.handle, self.password)
 
-            # Build facets to ensure the URL is clickable across clients
-            facets = None
+        # Build facets to ensure the URL is clickable across clients
+        facets = None
+        try:
             try:
-                try:
-                    from atproto_client.utils.text_builder import TextBuilder  # type: ignore
-                except Exception:
-                    from atproto.utils.text_builder import TextBuilder  # type: ignore
-                tb = TextBuilder()
-                tb.text(f"{header}\n\n{doc_title_fmt}\n\n")
-                tb.link(doc_url)
-                tb.text(f"\n\n#VicCouncils {hashtag} #OpenGov".strip())
-                post_text = tb.get_text()
-                facets = tb.get_facets()
+                from atproto_client.utils.text_builder import TextBuilder  # type: ignore
             except Exception:
-                pass  # Fallback to plain text; most clients autolink
+                from atproto.utils.text_builder import TextBuilder  # type: ignore
+            tb = TextBuilder()
+            tb.text(f"{header}\n\n{doc_title_fmt}\n\n")
+            tb.link(doc_url)
+            tb.text(f"\n\n#VicCouncils {hashtag} #OpenGov".strip())
+            post_text = tb.get_text()
+            facets = tb.get_facets()
+        except Exception:
+            pass  # Fallback to plain text; most clients autolink
+        return post_text, facets
 
-            if facets:
-                resp = client.send_post(text=post_text, facets=facets)
-            else:
-                resp = client.send_post(text=post_text)
-
-            # Mark as posted and index the root post
-            # Save url-only plus legacy hashes for backward compatibility
-            self.posted_docs.add(url_only)
-            self.posted_docs.add(h_canon_title)
-            self.posted_docs.add(h_raw_title)
-            if not hasattr(self, '_post_index'):
-                self._post_index = {}
-            self._post_index[url_only] = {'uri': resp.uri, 'cid': resp.cid}
-            self._save_posted_docs()
-
-            # Append to posts log for easy tracking in repo
-            try:
-                ts = datetime.utcnow().isoformat(timespec='seconds') + 'Z'
-                line = f"- {ts} | {council_name} | {doc_type} | {date_str or ''} | {doc_url} | {resp.uri}\n"
-                if not os.path.exists('posts.md'):
-                    with open('posts.md', 'w') as f:
-                        f.write('# Posted Items\n\n')
-                with open('posts.md', 'a') as f:
-                    f.write(line)
-            except Exception:
-                pass
+    def _record_post(self, council_name, doc_type, doc_title, doc_url, date_str, resp):
+        """Mark a document as posted, index its root post and log it to posts.md."""
+        # Save url-only plus legacy hashes for backward compatibility
+        url_only = self._hash_url_only(council_name, doc_url)
+        h_canon_title, h_raw_title = self._legacy_hashes(council_name, doc_title, doc_url)
+        self.posted_docs.add(url_only)
+        self.posted_docs.add(h_canon_title)
+        self.posted_docs.add(h_raw_title)
+        if not hasattr(self, '_post_index'):
+            self._post_index = {}
+        self._post_index[url_only] = {'uri': resp.uri, 'cid': resp.cid}
+        self._save_posted_docs()
 
-            print(f"✅ Posted: {doc_title}")
-            return True
+        # Append to posts log for easy tracking in repo
+        try:
+            ts = datetime.utcnow().isoformat(timespec='seconds') + 'Z'
+            line = f"- {ts} | {council_name} | {doc_type} | {date_str or ''} | {doc_url} | {resp.uri}\n"
+            if not os.path.exists('posts.md'):
+                with open('posts.md', 'w') as f:
+                    f.write('# Posted Items\n\n')
+            with open('posts.md', 'a') as f:
+                f.write(line)
+        except Exception:
+            pass
 
-        except Exception as e:
-            print(f"❌ Error posting to BlueSky: {e}")
-            return False
+    def _root_ref(self, council_name, doc_title, doc_url):
+        """Return the stored {'uri','cid'} of a document's root post, if any."""
+        # Try url-only, then legacy indices
+        index = getattr(self, '_post_index', {})
+        ref = index.get(self._hash_url_only(council_name, doc_url))
+        if not ref:
+            h_canon_title, h_raw_title = self._legacy_hashes(council_name, doc_title, doc_url)
+            ref = index.get(h_canon_title) or index.get(h_raw_title)
+        return ref
 
     def post_reply(self, parent_uri: str, parent_cid: str, text: str, root_uri: str = None, root_cid: str = None):
         """Post a reply under a given parent post.
@@ -166,15 +328,15 @@ class BlueSkyPoster:
         Returns the API response on success, None on failure.
         """
         try:
-            client = Client()
-            client.login(self.handle, self.password)
+            client = self._get_client()
+            self.rate_limiter.acquire('createRecord')
 
             root_uri = root_uri or parent_uri
             root_cid = root_cid or parent_cid
 
             reply_ref = models.AppBskyFeedPost.ReplyRef(
-                root=models.AppBskyFeedPost.StrongRef(uri=root_uri, cid=root_cid),
-                parent=models.AppBskyFeedPost.StrongRef(uri=parent_uri, cid=parent_cid),
+                root=models.ComAtprotoRepoStrongRef.Main(uri=root_uri, cid=root_cid),
+                parent=models.ComAtprotoRepoStrongRef.Main(uri=parent_uri, cid=parent_cid),
             )
 
             resp = client.send_post(text=text, reply_to=reply_ref)
@@ -193,67 +355,8 @@ class BlueSkyPoster:
           respecting the ~300 char limit per post.
         - Returns True if root post succeeded (reply failures are logged but non-fatal).
         """
-        # First post the baseline document
-        ok = self.post_document(
-            council_name=council_name,
-            doc_type=doc_type,
-            doc_title=doc_title,
-            doc_url=doc_url,
-            date_str=date_str,
-            council_hashtag=council_hashtag,
-        )
-        if not ok:
-            return False
-
-        # Fetch the stored root reference
-        # Try url-only, then legacy indices
-        url_only = self._hash_url_only(council_name, doc_url)
-        ref = getattr(self, '_post_index', {}).get(url_only)
-        if not ref:
-            h_canon_title, h_raw_title = self._legacy_hashes(council_name, doc_title, doc_url)
-            ref = getattr(self, '_post_index', {}).get(h_canon_title) or getattr(self, '_post_index', {}).get(h_raw_title)
-        if not ref:
-            return ok
-
-        # Prepare a multi-reply thread to include all bullets as needed
-        if bullets:
-            # Chunk bullets into replies under 300 chars each
-            root_uri = ref['uri']
-            root_cid = ref['cid']
-            parent_uri = root_uri
-            parent_cid = root_cid
-
-            chunk = []
-            current_len = 0
-            def flush():
-                nonlocal chunk, current_len, parent_uri, parent_cid
-                if not chunk:
-                    return
-                text = "\n".join(f"• {b.strip()}" for b in chunk)
-                # Hard trim as safeguard
-                if len(text) > 300:
-                    text = text[:297] + "..."
-                resp = self.post_reply(parent_uri=parent_uri, parent_cid=parent_cid, text=text, root_uri=root_uri, root_cid=root_cid)
-                # Continue the thread by replying to the last reply
-                if resp:
-                    parent_uri, parent_cid = resp.uri, resp.cid
-                chunk = []
-                current_len = 0
-
-            for b in [x for x in bullets if x and x.strip()]:
-                line = f"• {b.strip()}"
-                if current_len == 0:
-                    chunk.append(b)
-                    current_len = len(line)
-                elif current_len + 1 + len(line) <= 290:  # keep some buffer
-                    chunk.append(b)
-                    current_len += 1 + len(line)
-                else:
-                    flush()
-                    chunk.append(b)
-                    current_len = len(line)
-            flush()
-        return ok
+        return self._post_thread(council_name, doc_type, doc_title, doc_url, date_str,
+                                 council_hashtag, chunk_bullets(bullets or []))
 
     def post_document_with_reply_text(self, council_name, doc_type, doc_title, doc_url,
                                       date_str=None, council_hashtag=None, text: str = ""):
@@ -262,47 +365,71 @@ class BlueSkyPoster:
         If the paragraph exceeds ~300 chars, splits into multiple replies by sentence
         or chunk boundaries while preserving order.
         """
-        ok = self.post_document(
-            council_name=council_name,
-            doc_type=doc_type,
-            doc_title=doc_title,
-            doc_url=doc_url,
-            date_str=date_str,
-            council_hashtag=council_hashtag,
-        )
-        if not ok or not text:
-            return ok
+        return self._post_thread(council_name, doc_type, doc_title, doc_url, date_str,
+                                 council_hashtag, chunk_text(text))
 
-        # Fetch root ref
-        doc_hash = self._create_doc_hash(council_name, doc_title, doc_url)
-        ref = getattr(self, '_post_index', {}).get(doc_hash)
-        if not ref:
-            return ok
-
-        parent_uri = ref['uri']
-        parent_cid = ref['cid']
+    def _post_thread(self, council_name, doc_type, doc_title, doc_url, date_str, council_hashtag, replies):
+        """Post a root document and its replies, resuming an interrupted thread.
 
-        # Split into <=300 char chunks by sentence boundaries
-        chunks = []
-        remaining = text.strip()
-        while remaining:
-            if len(remaining) <= 300:
-                chunks.append(remaining)
-                break
-            # Find last sentence end before 300
-            boundary = max(remaining.rfind('. ', 0, 300), remaining.rfind('; ', 0, 300))
-            if boundary <= 0:
-                chunks.append(remaining[:300])
-                remaining = remaining[300:]
-            else:
-                chunks.append(remaining[:boundary+1])
-                remaining = remaining[boundary+1:].lstrip()
+        Returns True only if the root post was made by this call.
+        """
+        key = self._hash_url_only(council_name, doc_url)
+        if self.is_posted(council_name, doc_title, doc_url):
+            # Root already live: only finish a thread a crash cut short
+            if not self.journal.incomplete(key):
+                return False
+            ok = False
+        else:
+            if replies:
+                self.journal.plan(key, len(replies))
+            ok = self.post_document(
+                council_name=council_name,
+                doc_type=doc_type,
+                doc_title=doc_title,
+                doc_url=doc_url,
+                date_str=date_str,
+                council_hashtag=council_hashtag,
+            )
+            # Login-time reconciliation may have found the root already live
+            if not ok and not self.journal.incomplete(key):
+                return False
 
-        for ch in chunks:
-            resp = self.post_reply(parent_uri=parent_uri, parent_cid=parent_cid, text=ch)
-            if resp:
-                parent_uri, parent_cid = resp.uri, resp.cid
+        # Fetch the stored root reference
+        ref = self._root_ref(council_name, doc_title, doc_url)
+        if ref and replies:
+            self._post_replies(key, ref, replies)
         return ok
+
+    def _post_replies(self, key, root_ref, replies):
+        """Post replies in order under root_ref, skipping parts already journaled."""
+        done = self.journal.progress(key)
+        root_uri = parent_uri = root_ref['uri']
+        root_cid = parent_cid = root_ref['cid']
+        for part, text in enumerate(replies, 1):
+            if part in done:
+                parent_uri, parent_cid = done[part]
+                continue
+            try:
+                self._get_client()
+            except Exception as e:
+                print(f"❌ Error posting reply: {e}")
+                break
+            # Login may have reconciled this part from the feed
+            done = self.journal.progress(key)
+            if part in done:
+                parent_uri, parent_cid = done[part]
+                continue
+            self.journal.begin(key, part, text)
+            resp = self.post_reply(parent_uri=parent_uri, parent_cid=parent_cid, text=text,
+                                   root_uri=root_uri, root_cid=root_cid)
+            if not resp:
+                # Leave the intent pending; the next login reconciles and resumes
+                self._needs_reconcile = True
+                break
+            # Continue the thread by replying to the last reply
+            self.journal.complete(key, part, resp.uri, resp.cid)
+            parent_uri, parent_cid = resp.uri, resp.cid
+        self.journal.sync()
     
     def post_from_scraper_return(self, scraper_return, council_name, council_hashtag=None):
         """
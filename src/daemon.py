@@ -0,0 +1,205 @@
+"""
+Long-running scrape-and-post daemon for CouncilBot.
+
+Replaces the cron chain (scrape -> results file -> run_scheduler.py) with a
+single process that keeps everything warm between cycles:
+
+- the council registry and one scraper instance (and HTTP session) per council,
+- the document set, merged in memory as councils are scraped,
+- the Scheduler with its posted-document hashes and prepared post text,
+- the logged-in BlueSky client (live mode).
+
+Each council is scraped when the meeting-calendar planner says it is due, and
+new documents go straight to the posting Scheduler. The results file is
+still written after every scrape so the monitor and coverage report work.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from universal_scraper import VictorianCouncilScraper
+from src.posting.scheduler import Scheduler
+from src.utils.circuit_breaker import get_breaker, save_breaker
+from src.utils.http_politeness import get_scheduler
+from src.utils.meeting_calendar import MeetingCalendar, MEETINGS_CSV, MEETINGS_ICS
+from src.utils.http_sessions import get_host_sessions
+from src.utils.probe_memo import reset_probe_memo, save_probe_memo
+from src.utils.state_files import atomic_write
+from src.utils.url_canonicalize import canonicalize_doc_url
+
+logger = logging.getLogger(__name__)
+
+
+class CouncilDaemon:
+    """Scrapes councils when due and posts new documents at a steady rate."""
+
+    def __init__(self,
+                 registry_path: str = 'src/registry/all_councils.json',
+                 calendar_path: str = MEETINGS_ICS,
+                 calendar_csv_path: Optional[str] = MEETINGS_CSV,
+                 results_path: str = 'all_councils_results.json',
+                 posted_file: str = 'posted_bluesky.json',
+                 dry_run: bool = True,
+                 batch: int = 1,
+                 post_interval: timedelta = timedelta(hours=1),
+                 limit: Optional[int] = None,
+                 seed: Optional[int] = None,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.results_path = results_path
+        self.batch = batch
+        self.post_interval = post_interval
+        self.clock = clock
+
+        self.scraper = VictorianCouncilScraper(registry_path, reuse_scrapers=True)
+        if limit:
+            self.scraper.councils = self.scraper.councils[:limit]
+        self.calendar = MeetingCalendar.from_files(calendar_path, calendar_csv_path)
+
+        # (council_name, canonical url) -> serialized document
+        self.documents: Dict[Tuple[str, str], Dict] = {}
+        # Keyed by council id: registry rows can share a name
+        self.council_stats: Dict[str, Dict] = {}
+        self._load_existing()
+
+        self.scheduler = Scheduler(results_path=results_path, posted_file=posted_file,
+                                   dry_run=dry_run, seed=seed, results={'documents': []})
+
+        # Min-heap of (due time, registry index, council) so ties keep registry order
+        now = self.clock()
+        self._due: List[Tuple[datetime, int, Dict]] = []
+        for idx, council in enumerate(self.scraper.councils):
+            heapq.heappush(self._due, (now, idx, council))
+        self.next_post = now
+
+    @staticmethod
+    def _doc_key(doc: Dict) -> Tuple[str, str]:
+        return doc.get('council_name', ''), canonicalize_doc_url(doc.get('url', ''))
+
+    def _load_existing(self):
+        """Seed the document set from the last results file, if any."""
+        if not os.path.exists(self.results_path):
+            return
+        try:
+            with open(self.results_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load {self.results_path}: {e}")
+            return
+        self.ingest(data.get('documents', []))
+        for stat in data.get('council_stats', []):
+            key = stat.get('id') or stat.get('name')
+            if key:
+                self.council_stats[key] = stat
+
+    def ingest(self, documents: List[Dict]) -> List[Dict]:
+        """Merge scraped documents; return the ones not seen before."""
+        new = []
+        for doc in documents:
+            if not doc.get('url'):
+                continue
+            key = self._doc_key(doc)
+            if key not in self.documents:
+                new.append(doc)
+            self.documents[key] = doc
+        return new
+
+    def scrape_due(self, now: Optional[datetime] = None) -> int:
+        """Scrape every council whose poll time has passed; return new document count."""
+        now = now or self.clock()
+        new_total = 0
+        scraped = 0
+        if self._due and self._due[0][0] <= now:
+            # Each round of scrapes is a new run for probe results
+            reset_probe_memo()
+        while self._due and self._due[0][0] <= now:
+            _, idx, council = heapq.heappop(self._due)
+            name = council.get('name')
+            docs = self.scraper._serialize_documents(self.scraper.scrape_council(council))
+            new = self.ingest(docs)
+            new_total += len(new)
+            scraped += 1
+            self.council_stats[council.get('id') or name] = {
+                'id': council.get('id'),
+                'name': name,
+                'region': council.get('region'),
+                'total': len(docs),
+                'agendas': sum(1 for d in docs if d.get('document_type') == 'agenda'),
+                'minutes': sum(1 for d in docs if d.get('document_type') == 'minutes'),
+                'working': len(docs) > 0,
+                'hashtag': council.get('hashtag'),
+                'last_scraped': self.clock().isoformat(timespec='seconds'),
+                **get_breaker().summary(self.scraper.circuit_key(council)),
+            }
+            next_poll = self.calendar.next_poll(name, self.clock())
+            heapq.heappush(self._due, (next_poll, idx, council))
+            logger.info(f"{name}: {len(docs)} documents ({len(new)} new), "
+                        f"next scrape {next_poll.isoformat(timespec='minutes')}")
+        if scraped:
+            save_probe_memo()
+            save_breaker()
+            get_host_sessions().save()
+            self.save_results()
+        return new_total
+
+    def post_due(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Post up to `batch` documents if the posting interval has elapsed."""
+        now = now or self.clock()
+        if now < self.next_post:
+            return []
+        self.scheduler.results = {'documents': list(self.documents.values())}
+        actions = self.scheduler.run(limit=self.batch)
+        for action in actions:
+            # In dry-run, each document is previewed once per daemon lifetime
+            if self.scheduler.dry_run or action.get('posted'):
+                self.scheduler.mark_posted(action['council'], action['title'], action['url'])
+            logger.info(f"{'Posted' if action.get('posted') else 'Queued'}: "
+                        f"{action['council']} — {action['title']}")
+        self.next_post = now + self.post_interval
+        return actions
+
+    def next_wakeup(self) -> datetime:
+        due = self._due[0][0] if self._due else self.next_post
+        return min(due, self.next_post)
+
+    def run_once(self) -> Tuple[int, List[Dict]]:
+        """One tick: scrape what is due, then post if due."""
+        new = self.scrape_due()
+        return new, self.post_due()
+
+    def run(self, hours: Optional[float] = None, max_sleep: float = 300, sleep=time.sleep):
+        """Tick until the deadline (or forever), sleeping until the next due event."""
+        deadline = self.clock() + timedelta(hours=hours) if hours else None
+        logger.info(f"Daemon started: {len(self.scraper.councils)} councils, "
+                    f"{len(self.calendar.meetings)} with calendar entries")
+        while True:
+            self.run_once()
+            now = self.clock()
+            if deadline and now >= deadline:
+                break
+            wait = (self.next_wakeup() - now).total_seconds()
+            if deadline:
+                wait = min(wait, (deadline - now).total_seconds())
+            sleep(min(max(wait, 1.0), max_sleep))
+        logger.info("Daemon stopped")
+
+    def save_results(self):
+        """Write the merged document set in the usual results file format."""
+        stats = list(self.council_stats.values())
+        payload = {
+            'scrape_date': self.clock().isoformat(),
+            'total_councils': len(self.scraper.councils),
+            'working_councils': sum(1 for s in stats if s.get('working')),
+            'total_documents': len(self.documents),
+            'council_stats': stats,
+            'host_metrics': get_scheduler().metrics(),
+            'documents': list(self.documents.values()),
+        }
+        with atomic_write(self.results_path) as f:
+            json.dump(payload, f, indent=2)
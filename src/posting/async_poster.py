@@ -0,0 +1,223 @@
+"""
+Async threaded posting pipeline for CouncilBot.
+
+- Logs in once (concurrent jobs wait for the first login) and shares one
+  authenticated AsyncClient across all threads.
+- Pre-chunks reply text before any network call, so a thread is just a
+  sequence of sends.
+- Retries individual sends with backoff instead of restarting the thread,
+  but only when the server's answer (429 or 5xx) shows nothing was
+  created. A timeout or dropped connection may have posted, so that intent
+  is left for reconciliation against the feed instead of being resent.
+- Posts several independent documents concurrently, bounded by a semaphore,
+  a global minimum interval between sends and the poster's token buckets.
+
+Replies within one thread stay strictly ordered (each reply's parent is the
+previous reply); only separate documents run concurrently. Every send goes
+through the poster's write-ahead journal, so an interrupted batch resumes
+mid-thread on the next run without duplicates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from atproto import AsyncClient, models
+
+from src.bluesky_integration import BlueSkyPoster, chunk_bullets, chunk_text
+from src.posting.rate_limit import observe_rate_limits
+
+
+@dataclass
+class ThreadJob:
+    council_name: str
+    doc_type: str
+    doc_title: str
+    doc_url: str
+    date_str: Optional[str] = None
+    council_hashtag: Optional[str] = None
+    replies: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_bullets(cls, bullets: List[str], **kwargs) -> 'ThreadJob':
+        return cls(replies=chunk_bullets(bullets or []), **kwargs)
+
+    @classmethod
+    def from_text(cls, text: str, **kwargs) -> 'ThreadJob':
+        return cls(replies=chunk_text(text or ''), **kwargs)
+
+
+def _not_delivered(error: Exception) -> bool:
+    """True if the error is a 429/5xx response, so the record was not created and may be resent."""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class AsyncRateLimiter:
+    """Global limiter: at most one send per `min_interval` seconds."""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._last = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            wait = self._last + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last = time.monotonic()
+
+
+class AsyncThreadPoster:
+    """Posts ThreadJobs concurrently on a single authenticated session.
+
+    Deduplication and the posted-document store are shared with the given
+    BlueSkyPoster, so sync and async paths never double-post.
+    """
+
+    def __init__(self,
+                 poster: BlueSkyPoster,
+                 concurrency: int = 4,
+                 min_interval: float = 1.0,
+                 max_retries: int = 3,
+                 retry_backoff: float = 2.0,
+                 limiter=None):
+        self.poster = poster
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.limiter = limiter or AsyncRateLimiter(min_interval)
+        self._client: Optional[AsyncClient] = None
+        self._session_lock = asyncio.Lock()
+        self._inflight = set()
+
+    async def _session(self) -> AsyncClient:
+        # One login and one reconcile, however many jobs ask at once
+        async with self._session_lock:
+            if self._client is None:
+                client = observe_rate_limits(AsyncClient(), self.poster.rate_limiter)
+                await self.poster.rate_limiter.acquire_async('createSession')
+                await client.login(self.poster.handle, self.poster.password)
+                self._client = client
+            if self.poster._needs_reconcile:
+                await self._reconcile(self._client)
+            return self._client
+
+    async def _reconcile(self, client, limit: int = 100):
+        """Resolve unfinished journal intents against the account's recent posts."""
+        try:
+            feed = await client.get_author_feed(actor=self.poster.handle or client.me.did, limit=limit)
+        except Exception as e:
+            print(f"⚠️  Could not reconcile post journal: {e}")
+            return
+        self.poster.journal.reconcile(self.poster._feed_posts(feed))
+        self.poster._needs_reconcile = False
+        self.poster._recover_from_journal()
+
+    async def _send(self, text: str, facets=None, reply_to=None):
+        """Send one record, retrying refused sends with exponential backoff.
+
+        Returns None on failure, including errors that leave the outcome
+        unknown; the caller then leaves the intent for reconciliation.
+        """
+        client = await self._session()
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            await self.poster.rate_limiter.acquire_async('createRecord')
+            try:
+                return await client.send_post(text=text, facets=facets, reply_to=reply_to)
+            except Exception as e:
+                if not _not_delivered(e):
+                    print(f"❌ Error posting to BlueSky (may have been posted): {e}")
+                    return None
+                if attempt == self.max_retries:
+                    print(f"❌ Error posting to BlueSky after {attempt + 1} attempts: {e}")
+                    return None
+                await asyncio.sleep(delay)
+                delay *= 2
+        return None
+
+    async def post_thread(self, job: ThreadJob) -> bool:
+        """Post the root and its replies. True if the root post was made by this call.
+
+        If the root is already live but the journal shows missing replies,
+        only the missing replies are posted.
+        """
+        poster = self.poster
+        journal = poster.journal
+        key = poster._hash_url_only(job.council_name, job.doc_url)
+        if key in self._inflight:
+            return False
+        self._inflight.add(key)
+        await self._session()
+
+        if poster.is_posted(job.council_name, job.doc_title, job.doc_url):
+            ref = poster._root_ref(job.council_name, job.doc_title, job.doc_url)
+            if not ref or not job.replies or not journal.incomplete(key):
+                return False
+            root_uri, root_cid, posted_root = ref['uri'], ref['cid'], False
+        else:
+            text, facets = poster._compose_post(job.council_name, job.doc_type, job.doc_title, job.doc_url,
+                                                date_str=job.date_str, council_hashtag=job.council_hashtag)
+            if job.replies:
+                journal.plan(key, len(job.replies))
+            journal.begin(key, 0, text, doc={
+                'council_name': job.council_name, 'doc_type': job.doc_type, 'doc_title': job.doc_title,
+                'doc_url': job.doc_url, 'date_str': job.date_str,
+            })
+            root = await self._send(text, facets=facets)
+            if root is None:
+                # Outcome unknown; leave the intent for reconciliation next login
+                poster._needs_reconcile = True
+                self._inflight.discard(key)
+                return False
+            journal.complete(key, 0, root.uri, root.cid)
+            poster._record_post(job.council_name, job.doc_type, job.doc_title, job.doc_url, job.date_str, root)
+            print(f"✅ Posted: {job.doc_title}")
+            root_uri, root_cid, posted_root = root.uri, root.cid, True
+
+        done = journal.progress(key)
+        root_ref = models.ComAtprotoRepoStrongRef.Main(uri=root_uri, cid=root_cid)
+        parent_ref = root_ref
+        for idx, reply_text in enumerate(job.replies, 1):
+            if idx in done:
+                parent_ref = models.ComAtprotoRepoStrongRef.Main(uri=done[idx][0], cid=done[idx][1])
+                continue
+            reply_to = models.AppBskyFeedPost.ReplyRef(root=root_ref, parent=parent_ref)
+            journal.begin(key, idx, reply_text)
+            resp = await self._send(reply_text, reply_to=reply_to)
+            if resp is None:
+                # Later replies would attach to the wrong parent; stop this thread only
+                poster._needs_reconcile = True
+                print(f"❌ Thread for {job.doc_title} stopped at reply {idx}/{len(job.replies)}")
+                break
+            journal.complete(key, idx, resp.uri, resp.cid)
+            parent_ref = models.ComAtprotoRepoStrongRef.Main(uri=resp.uri, cid=resp.cid)
+        journal.sync()
+        return posted_root
+
+    async def post_many(self, jobs: List[ThreadJob]) -> List[bool]:
+        """Post independent threads concurrently; results follow input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: ThreadJob) -> bool:
+            async with semaphore:
+                try:
+                    return await self.post_thread(job)
+                except Exception as e:
+                    print(f"❌ Error posting thread: {e}")
+                    return False
+
+        return list(await asyncio.gather(*(run(j) for j in jobs)))
+
+
+def post_threads(poster: BlueSkyPoster, jobs: List[ThreadJob], **kwargs) -> List[bool]:
+    """Synchronous entry point: post all jobs and return per-job success."""
+    if not jobs:
+        return []
+    return asyncio.run(AsyncThreadPoster(poster, **kwargs).post_many(jobs))
@@ -0,0 +1,199 @@
+"""
+Write-ahead journal of BlueSky posts.
+
+Every send is bracketed by two JSON-lines records:
+
+- intent: written and fsync'd *before* the network call, with a hash of the
+  exact text and (for roots) the document metadata.
+- done:   written after the server returns, with the post's uri/cid. These
+  are buffered and fsync'd in small batches.
+
+Threads also record a plan (number of replies) so a crash mid-thread can be
+resumed from the last completed reply instead of restarting or duplicating.
+
+An intent without a done record means "maybe posted". Such intents are
+reconciled against the account's recent feed on the next login: matches are
+completed, the rest are abandoned so the document is retried.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.state_files import atomic_write
+
+
+POST_JOURNAL_FILE = os.environ.get('POST_JOURNAL_FILE', 'post_journal.jsonl')
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1((text or '').encode()).hexdigest()[:16]
+
+
+class PostJournal:
+    """Append-only post journal with batched fsync.
+
+    Loading does not compact: the owner calls compact() once completed roots
+    have been copied into the posted store, so a crash between the done
+    record and the store write cannot lose them.
+    """
+
+    def __init__(self, path: Optional[str] = POST_JOURNAL_FILE, batch_size: int = 8):
+        self.path = path
+        self.batch_size = batch_size
+        # key -> {'parts': int|None, 'intents': {part: hash}, 'done': {part: [uri, cid]}, 'doc': dict}
+        self.entries: Dict[str, Dict] = {}
+        self._buffer: List[str] = []
+        self._fh = None
+        self._load()
+
+    # -- storage -----------------------------------------------------------
+
+    def _entry(self, key: str) -> Dict:
+        return self.entries.setdefault(key, {'parts': None, 'intents': {}, 'done': {}, 'doc': None})
+
+    def _apply(self, rec: Dict):
+        entry = self._entry(rec['key'])
+        op = rec.get('op')
+        part = int(rec.get('part', 0))
+        if op == 'plan':
+            entry['parts'] = int(rec['parts'])
+        elif op == 'intent':
+            entry['intents'][part] = rec.get('text')
+            if rec.get('doc'):
+                entry['doc'] = rec['doc']
+        elif op == 'done':
+            entry['done'][part] = [rec['uri'], rec['cid']]
+        elif op == 'abandon':
+            entry['intents'].pop(part, None)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except Exception:
+                    continue  # torn last line after a crash
+
+    def _write(self, rec: Dict, sync: bool = False):
+        self._apply(rec)
+        if not self.path:
+            return
+        self._buffer.append(json.dumps(rec, separators=(',', ':')) + '\n')
+        if sync or len(self._buffer) >= self.batch_size:
+            self.sync()
+
+    def sync(self):
+        """Flush buffered records and fsync the journal."""
+        if not self.path or not self._buffer:
+            return
+        if self._fh is None:
+            self._fh = open(self.path, 'a')
+        self._fh.write(''.join(self._buffer))
+        self._buffer.clear()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self):
+        self.sync()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def compact(self):
+        """Rewrite the journal keeping only unfinished entries."""
+        if not self.path:
+            return
+        self.entries = {k: e for k, e in self.entries.items() if not self._finished(e)}
+        if not os.path.exists(self.path) and not self.entries:
+            return
+        lines = []
+        for key, e in self.entries.items():
+            if e['parts'] is not None:
+                lines.append({'op': 'plan', 'key': key, 'parts': e['parts']})
+            for part, h in e['intents'].items():
+                rec = {'op': 'intent', 'key': key, 'part': part, 'text': h}
+                if part == 0 and e['doc']:
+                    rec['doc'] = e['doc']
+                lines.append(rec)
+            for part, (uri, cid) in e['done'].items():
+                lines.append({'op': 'done', 'key': key, 'part': part, 'uri': uri, 'cid': cid})
+        with atomic_write(self.path, fsync=True) as f:
+            f.write(''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in lines))
+
+    # -- state queries -----------------------------------------------------
+
+    @staticmethod
+    def _finished(entry: Dict) -> bool:
+        if any(p not in entry['done'] for p in entry['intents']):
+            return False
+        parts = entry['parts']
+        if parts is not None and 0 in entry['done']:
+            return all(p in entry['done'] for p in range(parts + 1))
+        return True
+
+    def pending(self) -> List[Tuple[str, int, str]]:
+        """Intents with no completion: (key, part, text_hash)."""
+        return [(k, p, h) for k, e in self.entries.items()
+                for p, h in e['intents'].items() if p not in e['done']]
+
+    def incomplete(self, key: str) -> bool:
+        """True if the root is posted but planned replies are missing."""
+        e = self.entries.get(key)
+        return bool(e) and 0 in e['done'] and not self._finished(e)
+
+    def progress(self, key: str) -> Dict[int, Tuple[str, str]]:
+        """Completed parts of a thread: {part: (uri, cid)}; part 0 is the root."""
+        e = self.entries.get(key)
+        return {p: tuple(ref) for p, ref in e['done'].items()} if e else {}
+
+    def completed_roots(self) -> Iterable[Tuple[str, Dict, Tuple[str, str]]]:
+        """(key, doc metadata, root ref) for every root known to be posted."""
+        for key, e in self.entries.items():
+            if 0 in e['done']:
+                yield key, e['doc'], tuple(e['done'][0])
+
+    # -- recording ---------------------------------------------------------
+
+    def plan(self, key: str, parts: int):
+        self._write({'op': 'plan', 'key': key, 'parts': parts})
+
+    def begin(self, key: str, part: int, text: str, doc: Optional[Dict] = None):
+        """Record intent and fsync before the caller sends anything."""
+        rec = {'op': 'intent', 'key': key, 'part': part, 'text': text_hash(text), 'ts': int(time.time())}
+        if doc:
+            rec['doc'] = doc
+        self._write(rec, sync=True)
+
+    def complete(self, key: str, part: int, uri: str, cid: str):
+        self._write({'op': 'done', 'key': key, 'part': part, 'uri': uri, 'cid': cid})
+
+    def abandon(self, key: str, part: int):
+        """Drop an intent that never reached the server (send failed)."""
+        self._write({'op': 'abandon', 'key': key, 'part': part})
+
+    def reconcile(self, feed: Iterable[Tuple[str, str, str]]) -> int:
+        """Match pending intents against recent posts: (text, uri, cid) tuples.
+
+        Matched intents are completed; unmatched ones are abandoned so the
+        post is retried. Returns the number of intents found on the server.
+        """
+        by_hash = {}
+        for text, uri, cid in feed:
+            by_hash.setdefault(text_hash(text), (uri, cid))
+        found = 0
+        for key, part, h in self.pending():
+            ref = by_hash.get(h)
+            if ref:
+                self.complete(key, part, *ref)
+                found += 1
+            else:
+                self.abandon(key, part)
+        self.sync()
+        return found
@@ -0,0 +1,184 @@
+"""
+Shared document ranking engine for CouncilBot.
+
+- Parses document dates once (memoised per distinct date string).
+- Scores each document once and caches the score per document key.
+- Adds a small jitter to vary councils. With a seed it is fixed per
+  document; without one it is drawn again for every ranking pass.
+- Returns top-k lazily via heapq.nlargest instead of sorting the archive.
+- top_k(newest_first=True) orders by date first, then by the score
+  without jitter, then by URL, so the order is the same on every pass;
+  the posting Scheduler uses this to keep its newest-first order.
+
+Used by both enhanced_scheduler.CouncilBotScheduler and
+src.posting.scheduler.Scheduler so they agree on what to post first.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+from datetime import datetime, date
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d %B %Y', '%B %d, %Y')
+JITTER_MAX = 5
+
+
+@lru_cache(maxsize=4096)
+def parse_doc_date(date_str: str) -> Optional[datetime]:
+    """Parse a scraped document date, trying ISO first then known formats.
+
+    Returns None if the string is empty or matches no known format.
+    """
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def doc_key(doc: Dict) -> Tuple:
+    """Return a hashable key covering every field that affects the score."""
+    return (
+        doc.get('council_name', ''),
+        doc.get('url', ''),
+        doc.get('date', ''),
+        doc.get('document_type', ''),
+        doc.get('meeting_type', '') or '',
+    )
+
+
+class RankingEngine:
+    """Scores and ranks scraped documents for posting.
+
+    Base scores are cached per document key and invalidated when the
+    calendar day changes, since the date component is relative to today.
+    Unseeded jitter is cached only for one ranking pass (rank, top_k or a
+    whole iter_ranked), so each pass draws it again.
+    """
+
+    def __init__(self, seed: Optional[int] = None, today: Optional[date] = None):
+        self.seed = seed
+        self._fixed_today = today
+        self._rng = random.Random()
+        self._scores: Dict[Tuple, Tuple[int, str]] = {}
+        self._jitters: Dict[Tuple, int] = {}
+        self._scored_on: Optional[date] = None
+
+    def _today(self) -> date:
+        return self._fixed_today or date.today()
+
+    def _jitter(self, key: Tuple) -> int:
+        """Small random bonus to vary councils; stable per document when seeded."""
+        jitter = self._jitters.get(key)
+        if jitter is None:
+            if self.seed is None:
+                jitter = self._rng.randint(0, JITTER_MAX)
+            else:
+                jitter = random.Random(f"{self.seed}|{key[0]}|{key[1]}").randint(0, JITTER_MAX)
+            self._jitters[key] = jitter
+        return jitter
+
+    def _new_draw(self):
+        """Start a ranking pass: unseeded jitter is drawn again."""
+        if self.seed is None:
+            self._jitters.clear()
+
+    def _compute(self, doc: Dict, today: date) -> int:
+        score = 0
+
+        # Prefer agendas over minutes (agendas are forward-looking)
+        if doc.get('document_type') == 'agenda':
+            score += 10
+
+        # Prefer recent dates; upcoming meetings get higher priority
+        doc_date = parse_doc_date(doc.get('date', '') or '')
+        if doc_date is not None:
+            days_diff = (doc_date.date() - today).days
+            if 0 <= days_diff <= 7:
+                score += 20
+            elif 7 < days_diff <= 14:
+                score += 15
+            elif -7 < days_diff < 0:
+                score += 5  # Recent past
+
+        # Prefer certain meeting types
+        meeting_type = (doc.get('meeting_type', '') or '').lower()
+        if 'ordinary' in meeting_type or 'regular' in meeting_type:
+            score += 5
+        elif 'special' in meeting_type:
+            score += 8
+
+        return score
+
+    def score(self, doc: Dict) -> Tuple[int, str]:
+        """Return the sort key for a document: (score, ISO date) so newer wins ties."""
+        key = doc_key(doc)
+        base, iso = self._base(doc, key)
+        return base + self._jitter(key), iso
+
+    def _base(self, doc: Dict, key: Tuple) -> Tuple[int, str]:
+        """(score without jitter, ISO date), cached per document key."""
+        today = self._today()
+        if today != self._scored_on:
+            self._scores.clear()
+            self._scored_on = today
+        cached = self._scores.get(key)
+        if cached is None:
+            doc_date = parse_doc_date(doc.get('date', '') or '')
+            iso = doc_date.strftime('%Y-%m-%d') if doc_date else ''
+            cached = (self._compute(doc, today), iso)
+            self._scores[key] = cached
+        return cached
+
+    def recency(self, doc: Dict) -> Tuple[str, int, str]:
+        """Sort key for newest-first order: (ISO date, unjittered score, URL)."""
+        score, iso = self._base(doc, doc_key(doc))
+        return iso, score, doc.get('url', '')
+
+    def _top_k(self, documents: Iterable[Dict], k: int, newest_first: bool = False) -> List[Dict]:
+        if k <= 0:
+            return []
+        return heapq.nlargest(k, documents, key=self.recency if newest_first else self.score)
+
+    def top_k(self, documents: Iterable[Dict], k: int, newest_first: bool = False) -> List[Dict]:
+        """Return the k highest-ranked documents without sorting the rest."""
+        self._new_draw()
+        return self._top_k(documents, k, newest_first)
+
+    def iter_ranked(self, documents: List[Dict], k: int = 10) -> Iterator[Dict]:
+        """Yield documents best-first, materialising the ranking in growing windows.
+
+        The first k come from a single nlargest pass; only if the caller keeps
+        consuming (e.g. because candidates were skipped) is a larger window
+        ranked. Most batches never look past the first window.
+        """
+        self._new_draw()
+        window = max(k, 1)
+        yielded = 0
+        while yielded < len(documents):
+            top = self._top_k(documents, window)
+            for doc in top[yielded:]:
+                yield doc
+            yielded = len(top)
+            window *= 2
+
+    def rank(self, documents: Iterable[Dict]) -> List[Dict]:
+        """Return all documents in ranked order (full sort, for reports)."""
+        self._new_draw()
+        return sorted(documents, key=self.score, reverse=True)
+
+    def clear(self):
+        """Drop cached scores (e.g. after the results file is reloaded)."""
+        self._scores.clear()
+        self._jitters.clear()
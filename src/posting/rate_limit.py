@@ -0,0 +1,250 @@
+"""
+Token-bucket rate limiting for BlueSky posting.
+
+- One or more token buckets per action type (createSession, createRecord,
+  plus policy actions such as 'post' configured by the schedulers).
+- State is persisted to a small JSON file so limits survive restarts.
+- Server rate-limit headers (ratelimit-remaining / ratelimit-reset /
+  ratelimit-policy) tighten the local buckets, and a 429 blocks the action
+  until the advertised reset time.
+
+Callers sleep only for as long as the emptiest bucket needs to refill.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.state_files import atomic_write
+
+
+RATE_LIMIT_STATE_FILE = os.environ.get('RATE_LIMIT_STATE_FILE', 'bluesky_rate_limits.json')
+
+# (capacity, period_seconds) per bucket, from the published PDS limits.
+# createRecord is points-based (3 points per create; 5000/hour, 35000/day).
+DEFAULT_LIMITS: Dict[str, List[Tuple[int, int]]] = {
+    'createSession': [(30, 300), (300, 86400)],
+    'createRecord': [(1666, 3600), (11666, 86400)],
+}
+
+# XRPC method suffix -> action, for header observation
+_NSID_ACTIONS = {
+    'com.atproto.server.createSession': 'createSession',
+    'com.atproto.repo.createRecord': 'createRecord',
+}
+
+
+@dataclass
+class TokenBucket:
+    capacity: float
+    period: float
+    tokens: float
+    updated: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        self.refill(now)
+        deficit = cost - self.tokens
+        return 0.0 if deficit <= 0 else deficit / self.rate
+
+
+class RateLimiter:
+    """Per-action token buckets with persisted state.
+
+    Uses wall-clock time so refill continues while the process is stopped.
+    """
+
+    def __init__(self, state_file: Optional[str] = RATE_LIMIT_STATE_FILE,
+                 limits: Optional[Dict[str, List[Tuple[int, int]]]] = None,
+                 clock=time.time):
+        self.state_file = state_file
+        self.clock = clock
+        self.buckets: Dict[str, List[TokenBucket]] = {}
+        self.blocked_until: Dict[str, float] = {}
+        self._saved: Dict[str, List[Dict]] = {}
+        self._load()
+        for action, specs in (limits or DEFAULT_LIMITS).items():
+            self.configure(action, specs)
+        self._alock = None
+
+    def configure(self, action: str, specs: List[Tuple[int, int]]):
+        """Set the buckets for an action, keeping saved levels for matching periods."""
+        now = self.clock()
+        old = {float(b['period']): b for b in self._saved.get(action, [])}
+        old.update({b.period: asdict(b) for b in self.buckets.get(action, [])})
+        buckets = []
+        for capacity, period in specs:
+            prev = old.get(float(period))
+            if prev:
+                bucket = TokenBucket(capacity, period, min(capacity, float(prev['tokens'])), float(prev['updated']))
+            else:
+                bucket = TokenBucket(capacity, period, capacity, now)
+            buckets.append(bucket)
+        self.buckets[action] = buckets
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                data = json.load(f)
+        except Exception:
+            return
+        self._saved = data.get('buckets', {})
+        self.blocked_until.update({k: float(v) for k, v in data.get('blocked_until', {}).items()})
+
+    def save(self):
+        if not self.state_file:
+            return
+        buckets = dict(self._saved)
+        buckets.update({a: [asdict(b) for b in bs] for a, bs in self.buckets.items()})
+        payload = {
+            'buckets': buckets,
+            'blocked_until': {a: t for a, t in self.blocked_until.items() if t > self.clock()},
+        }
+        with atomic_write(self.state_file) as f:
+            json.dump(payload, f)
+
+    def wait_time(self, action: str, cost: float = 1) -> float:
+        """Seconds until `cost` tokens are available for `action` (0 if now)."""
+        now = self.clock()
+        wait = max(0.0, self.blocked_until.get(action, 0.0) - now)
+        for bucket in self.buckets.get(action, []):
+            wait = max(wait, bucket.wait_time(cost, now))
+        return wait
+
+    def available(self, action: str) -> float:
+        """Whole tokens currently available (inf for unlimited actions)."""
+        now = self.clock()
+        if self.blocked_until.get(action, 0.0) > now:
+            return 0
+        buckets = self.buckets.get(action, [])
+        for bucket in buckets:
+            bucket.refill(now)
+        return min((int(b.tokens) for b in buckets), default=float('inf'))
+
+    def consume(self, action: str, cost: float = 1):
+        now = self.clock()
+        for bucket in self.buckets.get(action, []):
+            bucket.refill(now)
+            bucket.tokens -= cost
+        self.save()
+
+    def try_acquire(self, action: str, cost: float = 1) -> bool:
+        if self.wait_time(action, cost) > 0:
+            return False
+        self.consume(action, cost)
+        return True
+
+    def acquire(self, action: str, cost: float = 1, sleep=time.sleep) -> float:
+        """Block until tokens are available, consume them, return seconds waited."""
+        waited = 0.0
+        wait = self.wait_time(action, cost)
+        while wait > 0:
+            sleep(wait)
+            waited += wait
+            wait = self.wait_time(action, cost)
+        self.consume(action, cost)
+        return waited
+
+    async def acquire_async(self, action: str, cost: float = 1) -> float:
+        """Async acquire; concurrent callers are served one at a time."""
+        if self._alock is None:
+            self._alock = asyncio.Lock()
+        async with self._alock:
+            waited = 0.0
+            wait = self.wait_time(action, cost)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+                wait = self.wait_time(action, cost)
+            self.consume(action, cost)
+            return waited
+
+    def update_from_headers(self, action: str, headers: Dict[str, str], status: Optional[int] = None):
+        """Tighten local state from server ratelimit-* headers (lowercase keys)."""
+        if not headers:
+            return
+        try:
+            remaining = headers.get('ratelimit-remaining')
+            limit = headers.get('ratelimit-limit')
+            reset = headers.get('ratelimit-reset')
+            policy = headers.get('ratelimit-policy', '')
+            window = None
+            if ';w=' in policy:
+                window = float(policy.split(';w=', 1)[1].split(';', 1)[0])
+        except Exception:
+            return
+
+        buckets = self.buckets.get(action, [])
+        target = next((b for b in buckets if window and b.period == window), buckets[0] if buckets else None)
+        now = self.clock()
+        if remaining is not None and target is not None:
+            left = float(remaining)
+            if limit:
+                # Server may count in points (e.g. 3 per createRecord); rescale
+                left = left * target.capacity / float(limit)
+            target.refill(now)
+            target.tokens = min(target.tokens, left)
+        if reset is not None and (status == 429 or remaining in ('0', 0)):
+            self.blocked_until[action] = float(reset)
+        self.save()
+
+
+def action_for_url(url: str) -> Optional[str]:
+    for nsid, action in _NSID_ACTIONS.items():
+        if url.endswith(nsid):
+            return action
+    return None
+
+
+def observe_rate_limits(client, limiter: RateLimiter):
+    """Wrap an atproto Client/AsyncClient so every response feeds the limiter.
+
+    Works by shadowing the instance's _invoke; if the installed atproto
+    version does not have it, the client is returned unchanged.
+    """
+    original = getattr(client, '_invoke', None)
+    if original is None:
+        return client
+
+    def observe(url, response):
+        action = action_for_url(url or '')
+        if action and response is not None:
+            limiter.update_from_headers(action, getattr(response, 'headers', None) or {},
+                                        getattr(response, 'status_code', None))
+
+    if asyncio.iscoroutinefunction(original):
+        async def _invoke(invoke_type, **kwargs):
+            try:
+                response = await original(invoke_type, **kwargs)
+            except Exception as e:
+                observe(kwargs.get('url'), getattr(e, 'response', None))
+                raise
+            observe(kwargs.get('url'), response)
+            return response
+    else:
+        def _invoke(invoke_type, **kwargs):
+            try:
+                response = original(invoke_type, **kwargs)
+            except Exception as e:
+                observe(kwargs.get('url'), getattr(e, 'response', None))
+                raise
+            observe(kwargs.get('url'), response)
+            return response
+
+    client._invoke = _invoke
+    return client
@@ -3,6 +3,8 @@ Posting scheduler for CouncilBot.
 
 - Builds a 24h queue with 1 post/hour, round-robin across councils,
   and a per-council cooldown.
+- Orders each council's queue newest first, breaking ties with the
+  shared RankingEngine score.
 - Composes base posts and threads with all high-value bullets.
 - Can run in dry-run (log only) or live posting mode.
 """
@@ -11,7 +13,6 @@ from __future__ import annotations
 
 import os
 import json
-import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -25,7 +26,10 @@ from src.processors.summarize import (
     refine_toc_lines,
 )
 from src.bluesky_integration import BlueSkyPoster
-from src.utils.url_canonicalize import canonicalize_doc_url
+from src.posting.async_poster import ThreadJob, post_threads
+from src.posting.ranking import RankingEngine
+from src.utils.profiling import get_profiler
+from src.utils.url_canonicalize import document_hashes, hash_documents
 
 
 FRESH_MINUTES_LAST_DAYS = int(os.environ.get('FRESH_MINUTES_LAST_DAYS', '14'))
@@ -45,21 +49,31 @@ class QueueItem:
     url: str
     webpage_url: str
     scheduled_for: Optional[datetime] = None
+    council_id: str = ''
 
 
 class Scheduler:
     def __init__(self,
                  results_path: str = 'm9_scraper_results.json',
                  posted_file: str = 'posted_bluesky.json',
-                 dry_run: bool = True):
+                 dry_run: bool = True,
+                 seed: Optional[int] = None,
+                 concurrency: int = 1,
+                 results: Optional[Dict] = None):
         self.results_path = results_path
         self.posted_file = posted_file
         self.dry_run = dry_run
         self.extractor = PDFExtractor()
+        self.ranking = RankingEngine(seed=seed)
+        self.concurrency = concurrency
         # Poster is used only in live mode
         self.poster = None if dry_run else BlueSkyPoster(posted_file=posted_file)
 
-        self.results = self._load_results()
+        # Prepared post text per document URL (PDF download + summary)
+        self._prepared: Dict[str, Dict] = {}
+
+        # Long-running callers pass results in memory instead of a file
+        self.results = results if results is not None else self._load_results()
         self.already_posted = self._load_posted_hashes()
 
     def _load_results(self) -> Dict:
@@ -85,11 +99,11 @@ class Scheduler:
     @staticmethod
     def _doc_hashes(council_name: str, title: str, url: str):
         """Return url-only and legacy title-based hashes for compatibility."""
-        canon_url = canonicalize_doc_url(url)
-        url_only = hashlib.md5(f"{council_name}|{canon_url}".encode()).hexdigest()
-        legacy_raw = hashlib.md5(f"{council_name}|{title}|{url}".encode()).hexdigest()
-        legacy_canon = hashlib.md5(f"{council_name}|{title}|{canon_url}".encode()).hexdigest()
-        return {url_only, legacy_canon, legacy_raw}
+        return set(document_hashes(council_name, title, url))
+
+    def mark_posted(self, council_name: str, title: str, url: str):
+        """Exclude a document from later schedules built by this instance."""
+        self.already_posted.update(self._doc_hashes(council_name, title, url))
 
     def _is_fresh(self, doc: Dict) -> bool:
         try:
@@ -105,25 +119,28 @@ class Scheduler:
 
     def _candidate_docs(self) -> List[QueueItem]:
         docs = self.results.get('documents', [])
-        candidates: List[QueueItem] = []
-        for d in docs:
-            # Baseline policy: post all agendas/minutes; prioritize fresh first
-            if not self._is_fresh(d):
-                continue
-            hashes = self._doc_hashes(d['council_name'], d['title'], d['url'])
+        per_council: Dict[str, List[Dict]] = defaultdict(list)
+        fresh = [d for d in docs if self._is_fresh(d)]
+        # Baseline policy: post all agendas/minutes; prioritize fresh first
+        for d, hashes in zip(fresh, hash_documents(fresh)):
             if any(h in self.already_posted for h in hashes):
                 continue
-            candidates.append(QueueItem(
-                council_name=d['council_name'],
-                doc_type=d['document_type'],
-                meeting_type=d.get('meeting_type'),
-                title=d['title'],
-                date=d.get('date', ''),
-                url=d['url'],
-                webpage_url=d.get('webpage_url', ''),
-            ))
-        # Sort newest first
-        candidates.sort(key=lambda x: x.date, reverse=True)
+            per_council[d['council_name']].append(d)
+
+        # No council can contribute more than a full run, so take only its newest k
+        candidates: List[QueueItem] = []
+        for name in sorted(per_council):
+            for d in self.ranking.top_k(per_council[name], MAX_POSTS_PER_RUN, newest_first=True):
+                candidates.append(QueueItem(
+                    council_name=d['council_name'],
+                    doc_type=d['document_type'],
+                    meeting_type=d.get('meeting_type'),
+                    title=d['title'],
+                    date=d.get('date', ''),
+                    url=d['url'],
+                    webpage_url=d.get('webpage_url', ''),
+                    council_id=d.get('council_id', ''),
+                ))
         return candidates
 
     def build_schedule(self) -> List[QueueItem]:
@@ -165,6 +182,15 @@ class Scheduler:
         return scheduled
 
     def _prepare_post(self, q: QueueItem) -> Dict:
+        cached = self._prepared.get(q.url)
+        if cached is None:
+            cached = self._build_post(q)
+            # An empty summary usually means the PDF fetch failed; retry next run
+            if cached['summary']:
+                self._prepared[q.url] = cached
+        return cached
+
+    def _build_post(self, q: QueueItem) -> Dict:
         # Download PDF and extract text
         fast = os.environ.get('FAST_PREVIEW', '').lower() in ('1', 'true', 'yes')
         if fast:
@@ -189,18 +215,25 @@ class Scheduler:
         summary = build_summary_paragraph(q.council_name, text or q.title, lines=toc_lines or None, min_score=3)
         return {'base_post': base, 'summary': summary}
 
-    def run(self) -> List[Dict]:
+    def run(self, limit: Optional[int] = None) -> List[Dict]:
         """Run the scheduler once. Returns a list of actions for logging or testing.
 
         In dry-run mode, this only composes posts and returns them with times.
         In live mode, it posts immediately in sequence (not waiting hourly) —
-        external cron should drive cadence.
+        external cron should drive cadence. With concurrency > 1, threads are
+        posted through the async pipeline on one session instead.
+        `limit` caps how many scheduled items are handled in this call.
         """
         schedule = self.build_schedule()
+        if limit is not None:
+            schedule = schedule[:limit]
         actions: List[Dict] = []
+        jobs: List[ThreadJob] = []
         use_summary = os.environ.get('POST_SUMMARY', '1').lower() in ('1', 'true', 'yes')
+        profiler = get_profiler()
         for q in schedule:
-            prepared = self._prepare_post(q)
+            with profiler.unit('post', q.council_name, q.council_id):
+                prepared = self._prepare_post(q)
             action = {
                 'when': (q.scheduled_for or datetime.now()).isoformat(timespec='minutes'),
                 'council': q.council_name,
@@ -213,7 +246,17 @@ class Scheduler:
             }
             actions.append(action)
 
-            if not self.dry_run:
+            if not self.dry_run and self.concurrency > 1:
+                # Defer to the async pipeline below
+                jobs.append(ThreadJob.from_text(
+                    prepared['summary'] if use_summary else '',
+                    council_name=q.council_name,
+                    doc_type=q.doc_type,
+                    doc_title=q.title,
+                    doc_url=q.url,
+                    date_str=q.date,
+                ))
+            elif not self.dry_run:
                 # Post now (caller controls actual timing via cron)
                 poster = self.poster or BlueSkyPoster(posted_file=self.posted_file)
                 if use_summary and prepared['summary']:
@@ -236,4 +279,10 @@ class Scheduler:
                         council_hashtag=None,
                     )
                 action['posted'] = bool(ok)
+
+        if jobs:
+            poster = self.poster or BlueSkyPoster(posted_file=self.posted_file)
+            results = post_threads(poster, jobs, concurrency=self.concurrency)
+            for action, ok in zip(actions, results):
+                action['posted'] = bool(ok)
         return actions
@@ -7,24 +7,14 @@ from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 from dateutil.parser import parse as parse_date
-from dataclasses import dataclass
 from typing import Optional, List
-import requests
-import cloudscraper
-from src.utils.infocouncil import discover_month_files, parse_infocouncil_filename
-
-
-@dataclass
-class MeetingDocument:
-    """Data class for meeting documents"""
-    council_id: str
-    council_name: str
-    document_type: str  # agenda, minutes
-    meeting_type: str   # council, delegated, special
-    title: str
-    date: str          # YYYY-MM-DD format
-    url: str
-    webpage_url: str
+from src.utils.documents import MeetingDocument
+from src.utils.instrumentation import timed
+from src.utils.infocouncil import discover_months, parse_infocouncil_filename, recent_months
+from src.utils.http_politeness import polite
+from src.utils.http_sessions import shared_session
+from src.utils.probe_engine import ProbeEngine, ProbeSpec, infocouncil_template, weekly
+from src.utils.probe_memo import PROBE_PDF_TYPE, range_probe
 
 
 class DarebinScraper:
@@ -41,12 +31,8 @@ class DarebinScraper:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-AU,en;q=0.9',
         }
-        try:
-            self.session = cloudscraper.create_scraper()
-            self.session.headers.update(self.headers)
-        except Exception:
-            self.session = requests.Session()
-            self.session.headers.update(self.headers)
+        self.session = shared_session(self.headers)
+        polite(self.session)
     
     def fetch_page(self, url: str) -> str:
         """Fetch a page using a session to handle 403s and redirects"""
@@ -61,6 +47,7 @@ class DarebinScraper:
             print(f"Error fetching {url}: {e}")
             return ""
     
+    @timed('dates')
     def extract_date(self, text: str) -> Optional[str]:
         """Extract date from text and return in YYYY-MM-DD format"""
         date_patterns = [
@@ -116,72 +103,48 @@ class DarebinScraper:
         """
         base = "https://darebin.infocouncil.biz"
         out: List[MeetingDocument] = []
-        today = datetime.now()
-        from datetime import timedelta
-        for weeks_back in range(0, 26):  # ~6 months
-            d = today - timedelta(weeks=weeks_back)
-            # Try likely meeting days: Tue, Mon, Wed, Thu
-            for offset in (1, 0, 2, 3):
-                target = d - timedelta(days=(d.weekday() - offset) % 7)
-                date_code = target.strftime("%d%m%Y")
-                month_year = target.strftime("%Y/%m")
-                formatted = target.strftime('%Y-%m-%d')
-                prefixes = ["ORD", "OCM", "CM"]
-                files = [(f"{p}_{date_code}_AGN_AT.PDF", 'agenda') for p in prefixes] + \
-                        [(f"{p}_{date_code}_AGN.PDF", 'agenda') for p in prefixes] + \
-                        [(f"{p}_{date_code}_MIN.PDF", 'minutes') for p in prefixes]
-                for fname, kind in files:
-                    direct = f"{base}/Open/{month_year}/{fname}"
-                    redir = f"{base}/RedirectToDoc.aspx?URL=Open/{month_year}/{fname}"
-                    try:
-                        r = self.session.get(direct, headers={'Range': 'bytes=0-0', **self.headers}, timeout=8, allow_redirects=True)
-                        if r.status_code in (200, 206) and 'pdf' in r.headers.get('Content-Type', '').lower():
-                            out.append(MeetingDocument(
-                                council_id=self.council_id,
-                                council_name=self.council_name,
-                                document_type=kind,
-                                meeting_type='council',
-                                title=f"Council Meeting {kind.title()} - {formatted}",
-                                date=formatted,
-                                url=direct,
-                                webpage_url=base,
-                            ))
-                            continue
-                        # Try redirector
-                        r2 = self.session.get(redir, headers={'Range': 'bytes=0-0', **self.headers}, timeout=8, allow_redirects=True)
-                        if r2.status_code in (200, 206) and 'pdf' in r2.headers.get('Content-Type', '').lower():
-                            out.append(MeetingDocument(
-                                council_id=self.council_id,
-                                council_name=self.council_name,
-                                document_type=kind,
-                                meeting_type='council',
-                                title=f"Council Meeting {kind.title()} - {formatted}",
-                                date=formatted,
-                                url=redir,
-                                webpage_url=base,
-                            ))
-                    except Exception:
-                        pass
+        prefixes = ["ORD", "OCM", "CM"]
+        spec = ProbeSpec(
+            templates=[
+                infocouncil_template('agenda', '{prefix}_{ddmmyyyy}_AGN_AT.PDF', prefix=prefixes),
+                infocouncil_template('agenda', '{prefix}_{ddmmyyyy}_AGN.PDF', prefix=prefixes),
+                infocouncil_template('minutes', '{prefix}_{ddmmyyyy}_MIN.PDF', prefix=prefixes),
+            ],
+            # Try likely meeting days: Tue, Mon, Wed, Thu over ~6 months
+            dates=weekly([1, 0, 2, 3], weeks=26),
+            context={'base': base},
+            name=self.council_name,
+        )
+        engine = ProbeEngine(lambda u: range_probe(self.session, u, self.headers, strict_type=True),
+                             mode=PROBE_PDF_TYPE)
+        for hit in engine.run(spec).hits:
+            out.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='council',
+                title=f"Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=base,
+            ))
         # Try month discovery if nothing found yet (last 6 months)
         if not out:
-            from datetime import timedelta
-            for i in range(0, 6):
-                dt = datetime.now() - timedelta(days=30*i)
-                files = discover_month_files(base, dt.year, dt.month, self.session, self.headers)
-                for u in files:
-                    kind, iso = parse_infocouncil_filename(u)
-                    if not kind or not iso:
-                        continue
-                    out.append(MeetingDocument(
-                        council_id=self.council_id,
-                        council_name=self.council_name,
-                        document_type=kind,
-                        meeting_type='council',
-                        title=f"Council Meeting {kind.title()} - {iso}",
-                        date=iso,
-                        url=u,
-                        webpage_url=base,
-                    ))
+            files = discover_months(base, recent_months(datetime.now(), 6), self.session, self.headers)
+            for u in files:
+                kind, iso = parse_infocouncil_filename(u)
+                if not kind or not iso:
+                    continue
+                out.append(MeetingDocument(
+                    council_id=self.council_id,
+                    council_name=self.council_name,
+                    document_type=kind,
+                    meeting_type='council',
+                    title=f"Council Meeting {kind.title()} - {iso}",
+                    date=iso,
+                    url=u,
+                    webpage_url=base,
+                ))
 
         # Dedupe
         seen = set(); uniq = []
@@ -2,10 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import List
-import requests
-import cloudscraper
 
 from m9_adapted import BaseM9Scraper, MeetingDocument
+from src.utils.http_sessions import shared_session
 
 
 @dataclass
@@ -43,9 +42,7 @@ class JsonListScraper(BaseM9Scraper):
 
     def scrape(self) -> List[MeetingDocument]:
         try:
-            sess = getattr(self, 'session', None)
-            if not sess:
-                sess = cloudscraper.create_scraper()
+            sess = getattr(self, 'session', None) or shared_session(self.headers)
             r = sess.get(self.cfg.endpoint, headers=self.headers, timeout=20)
             r.raise_for_status()
             data = r.json()
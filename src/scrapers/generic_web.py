@@ -8,26 +8,15 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
 from datetime import datetime, timedelta
-from dataclasses import dataclass
 from typing import List, Optional
 import logging
+from src.utils.documents import MeetingDocument
+from src.utils.instrumentation import timed
+from src.utils.http_politeness import polite_get
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class Document:
-    """Standard document structure"""
-    council_id: str
-    council_name: str
-    document_type: str  # 'agenda' or 'minutes'
-    meeting_type: str
-    title: str
-    date: str
-    url: str
-    webpage_url: str = ''
-
-
 class GenericCouncilScraper:
     """Generic scraper that handles common council website patterns"""
     
@@ -43,10 +32,10 @@ class GenericCouncilScraper:
         parsed = urlparse(url)
         return f"{parsed.scheme}://{parsed.netloc}"
     
-    def scrape(self) -> List[Document]:
+    def scrape(self) -> List[MeetingDocument]:
         """Main scraping method"""
         try:
-            response = requests.get(self.meeting_url, timeout=30)
+            response = polite_get(self.meeting_url, timeout=30)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -72,7 +61,7 @@ class GenericCouncilScraper:
             logger.error(f"Error scraping {self.council_name}: {e}")
             return []
     
-    def _find_pdf_links(self, soup: BeautifulSoup) -> List[Document]:
+    def _find_pdf_links(self, soup: BeautifulSoup) -> List[MeetingDocument]:
         """Find direct PDF links on the page"""
         documents = []
         
@@ -92,7 +81,7 @@ class GenericCouncilScraper:
                     # Make URL absolute
                     full_url = urljoin(self.meeting_url, href)
                     
-                    doc = Document(
+                    doc = MeetingDocument(
                         council_id=self.council_id,
                         council_name=self.council_name,
                         document_type=doc_type,
@@ -106,7 +95,7 @@ class GenericCouncilScraper:
         
         return documents
     
-    def _find_meeting_lists(self, soup: BeautifulSoup) -> List[Document]:
+    def _find_meeting_lists(self, soup: BeautifulSoup) -> List[MeetingDocument]:
         """Find meetings in list structures"""
         documents = []
         
@@ -125,7 +114,7 @@ class GenericCouncilScraper:
                         date_str = self._extract_date(text + ' ' + link_text)
                         full_url = urljoin(self.meeting_url, href)
                         
-                        doc = Document(
+                        doc = MeetingDocument(
                             council_id=self.council_id,
                             council_name=self.council_name,
                             document_type=doc_type,
@@ -139,7 +128,7 @@ class GenericCouncilScraper:
         
         return documents
     
-    def _find_table_rows(self, soup: BeautifulSoup) -> List[Document]:
+    def _find_table_rows(self, soup: BeautifulSoup) -> List[MeetingDocument]:
         """Find meetings in table structures"""
         documents = []
         
@@ -160,7 +149,7 @@ class GenericCouncilScraper:
                             date_str = self._extract_date(row_text)
                             full_url = urljoin(self.meeting_url, href)
                             
-                            doc = Document(
+                            doc = MeetingDocument(
                                 council_id=self.council_id,
                                 council_name=self.council_name,
                                 document_type=doc_type,
@@ -174,7 +163,7 @@ class GenericCouncilScraper:
         
         return documents
     
-    def _find_infocouncil_pattern(self, soup: BeautifulSoup) -> List[Document]:
+    def _find_infocouncil_pattern(self, soup: BeautifulSoup) -> List[MeetingDocument]:
         """Find InfoCouncil/ePathway style meeting links"""
         documents = []
         
@@ -194,7 +183,7 @@ class GenericCouncilScraper:
                     date_str = self._extract_date(text)
                     full_url = urljoin(self.meeting_url, href)
                     
-                    doc = Document(
+                    doc = MeetingDocument(
                         council_id=self.council_id,
                         council_name=self.council_name,
                         document_type=doc_type,
@@ -208,6 +197,7 @@ class GenericCouncilScraper:
         
         return documents
     
+    @timed('dates')
     def _extract_date(self, text: str) -> str:
         """Extract date from text"""
         # Common date patterns
@@ -250,7 +240,7 @@ class GenericCouncilScraper:
 class SmartCouncilScraper(GenericCouncilScraper):
     """Enhanced scraper with more intelligent pattern detection"""
     
-    def scrape(self) -> List[Document]:
+    def scrape(self) -> List[MeetingDocument]:
         """Enhanced scraping with multiple strategies"""
         documents = []
         
@@ -272,7 +262,7 @@ class SmartCouncilScraper(GenericCouncilScraper):
             try:
                 # Try as path segment
                 test_url = urljoin(self.meeting_url, subpage)
-                response = requests.get(test_url, timeout=10)
+                response = polite_get(test_url, timeout=10)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
                     documents.extend(self._find_pdf_links(soup))
@@ -282,7 +272,7 @@ class SmartCouncilScraper(GenericCouncilScraper):
         
         # Try to find "View more" or "Archive" links
         try:
-            response = requests.get(self.meeting_url, timeout=30)
+            response = polite_get(self.meeting_url, timeout=30)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             for link in soup.find_all('a', href=True):
@@ -290,7 +280,7 @@ class SmartCouncilScraper(GenericCouncilScraper):
                 if any(word in link_text for word in ['more', 'archive', 'previous', 'past', 'all']):
                     archive_url = urljoin(self.meeting_url, link['href'])
                     try:
-                        archive_response = requests.get(archive_url, timeout=10)
+                        archive_response = polite_get(archive_url, timeout=10)
                         if archive_response.status_code == 200:
                             archive_soup = BeautifulSoup(archive_response.text, 'html.parser')
                             documents.extend(self._find_pdf_links(archive_soup))
@@ -6,22 +6,11 @@ from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 from dateutil.parser import parse as parse_date
-from dataclasses import dataclass
 from typing import Optional, List
+from src.utils.documents import MeetingDocument
+from src.utils.instrumentation import timed
 import requests
-
-
-@dataclass
-class MeetingDocument:
-    """Data class for meeting documents"""
-    council_id: str
-    council_name: str
-    document_type: str  # agenda, minutes
-    meeting_type: str   # council, delegated, special
-    title: str
-    date: str          # YYYY-MM-DD format
-    url: str
-    webpage_url: str
+from src.utils.http_politeness import polite_get
 
 
 class HobsonsBayScraper:
@@ -39,13 +28,14 @@ class HobsonsBayScraper:
     def fetch_page(self, url: str) -> str:
         """Fetch a page with requests"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = polite_get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.text
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return ""
     
+    @timed('dates')
     def extract_date(self, text: str) -> Optional[str]:
         """Extract date from text and return in YYYY-MM-DD format"""
         date_patterns = [
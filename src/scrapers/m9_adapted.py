@@ -7,24 +7,14 @@ from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 from dateutil.parser import parse as parse_date
-from dataclasses import dataclass
 from typing import Optional, List
-import requests
-import cloudscraper
-from src.utils.infocouncil import discover_month_files, parse_infocouncil_filename
-
-
-@dataclass
-class MeetingDocument:
-    """Data class for meeting documents"""
-    council_id: str
-    council_name: str
-    document_type: str  # agenda, minutes
-    meeting_type: str   # council, delegated, special
-    title: str
-    date: str          # YYYY-MM-DD format
-    url: str
-    webpage_url: str
+from src.utils.documents import MeetingDocument
+from src.utils.instrumentation import timed
+from src.utils.infocouncil import discover_months, parse_infocouncil_filename, recent_months
+from src.utils.http_politeness import polite
+from src.utils.http_sessions import shared_session
+from src.utils.probe_engine import ProbeEngine, ProbeSpec, infocouncil_template, weekly
+from src.utils.probe_memo import PROBE_PDF_TYPE, get_probe_memo, infocouncil_variants, probe_mode, range_probe
 
 
 class BaseM9Scraper:
@@ -41,13 +31,11 @@ class BaseM9Scraper:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache',
         }
-        # Create a Cloudscraper session to better handle 403/5xx and anti-bot
-        try:
-            self.session = cloudscraper.create_scraper()
-            self.session.headers.update(self.headers)
-        except Exception:
-            self.session = requests.Session()
-            self.session.headers.update(self.headers)
+        # Per-host sessions shared across scrapers; hosts that challenge us get
+        # cloudscraper, and clearance cookies persist between runs
+        self.session = shared_session(self.headers)
+        # Per-host spacing and backoff shared with every other scraper
+        polite(self.session)
     
     def fetch_page(self, url: str, referer: Optional[str] = None) -> str:
         """Fetch a page using a session that can bypass simple 403s."""
@@ -62,21 +50,24 @@ class BaseM9Scraper:
             print(f"Error fetching {url}: {e}")
             return ""
 
-    def probe_url(self, url: str, expect_pdf: bool = True) -> bool:
-        """HEAD probe to check if a URL exists (and optionally is a PDF)."""
-        try:
-            test_headers = dict(self.headers)
-            # Use a range request to avoid full download when some hosts disallow HEAD
-            test_headers['Range'] = 'bytes=0-0'
-            resp = self.session.get(url, headers=test_headers, timeout=8, allow_redirects=True)
-            ctype = resp.headers.get('Content-Type', '').lower()
-            ok = resp.status_code in (200, 206)
-            if expect_pdf:
-                return ok and ('pdf' in ctype or url.lower().endswith('.pdf'))
-            return ok
-        except Exception:
-            return False
+    def probe_url(self, url: str, expect_pdf: bool = True, strict_type: bool = False) -> bool:
+        """Range-GET probe to check if a URL exists (and optionally is a PDF).
+
+        PDF probes are memoised per run and shared across scrapers.
+        """
+        if not expect_pdf:
+            return bool(range_probe(self.session, url, self.headers, expect_pdf=False))
+        return get_probe_memo().probe(
+            url, lambda u: range_probe(self.session, u, self.headers, strict_type=strict_type),
+            probe_mode(strict_type=strict_type))
+
+    def resolve_infocouncil(self, base: str, path: str) -> Optional[str]:
+        """Return the working URL (direct or redirector) for an InfoCouncil path, or None."""
+        return get_probe_memo().resolve(
+            infocouncil_variants(base, path),
+            lambda u: range_probe(self.session, u, self.headers, strict_type=True), PROBE_PDF_TYPE)
     
+    @timed('dates')
     def extract_date(self, text: str) -> Optional[str]:
         """Extract date from text and return in YYYY-MM-DD format"""
         date_patterns = [
@@ -131,43 +122,29 @@ class MaribyrnongScraper(BaseM9Scraper):
     def _probe_infocouncil(self) -> List[MeetingDocument]:
         base = "https://maribyrnong.infocouncil.biz"
         out: List[MeetingDocument] = []
-        from datetime import timedelta
         today = datetime.now()
-        for weeks_back in range(0, 26):
-            d = today - timedelta(weeks=weeks_back)
-            # Try Tue, Wed, Mon
-            for offset in (1, 2, 0):
-                target = d - timedelta(days=(d.weekday() - offset) % 7)
-                code = target.strftime("%d%m%Y")
-                y_m = target.strftime("%Y/%m")
-                date_str = target.strftime('%Y-%m-%d')
-                prefixes = ["ORD", "OCM", "CM"]
-                agn = ["AGN_AT.PDF", "AGN.PDF"]
-                mins = ["MIN.PDF"]
-                for p in prefixes:
-                    for s in agn:
-                        direct = f"{base}/Open/{y_m}/{p}_{code}_{s}"
-                        redir = f"{base}/RedirectToDoc.aspx?URL=Open/{y_m}/{p}_{code}_{s}"
-                        if self.probe_url(direct) or self.probe_url(redir):
-                            url = direct if self.probe_url(direct) else redir
-                            out.append(MeetingDocument(self.council_id, self.council_name, 'agenda', 'council', f"Council Meeting Agenda - {date_str}", date_str, url, base))
-                    for s in mins:
-                        direct = f"{base}/Open/{y_m}/{p}_{code}_{s}"
-                        redir = f"{base}/RedirectToDoc.aspx?URL=Open/{y_m}/{p}_{code}_{s}"
-                        if self.probe_url(direct) or self.probe_url(redir):
-                            url = direct if self.probe_url(direct) else redir
-                            out.append(MeetingDocument(self.council_id, self.council_name, 'minutes', 'council', f"Council Meeting Minutes - {date_str}", date_str, url, base))
+        prefixes = ["ORD", "OCM", "CM"]
+        spec = ProbeSpec(
+            templates=[
+                infocouncil_template('agenda', '{prefix}_{ddmmyyyy}_{suffix}', prefix=prefixes, suffix=["AGN_AT.PDF", "AGN.PDF"]),
+                infocouncil_template('minutes', '{prefix}_{ddmmyyyy}_MIN.PDF', prefix=prefixes),
+            ],
+            dates=weekly([1, 2, 0], weeks=26, now=today),  # Tue, Wed, Mon
+            context={'base': base},
+            name=self.council_name,
+        )
+        engine = ProbeEngine(lambda u: range_probe(self.session, u, self.headers, strict_type=True),
+                             mode=PROBE_PDF_TYPE)
+        for hit in engine.run(spec).hits:
+            out.append(MeetingDocument(self.council_id, self.council_name, hit.document_type, 'council', f"Council Meeting {hit.document_type.title()} - {hit.iso}", hit.iso, hit.url, base))
         # Month discovery if empty
         if not out:
-            for i in range(0, 6):
-                from datetime import timedelta
-                dt = today - timedelta(days=30*i)
-                files = discover_month_files(base, dt.year, dt.month, self.session, self.headers)
-                for u in files:
-                    kind, iso = parse_infocouncil_filename(u)
-                    if not kind or not iso:
-                        continue
-                    out.append(MeetingDocument(self.council_id, self.council_name, kind, 'council', f"Council Meeting {kind.title()} - {iso}", iso, u, base))
+            files = discover_months(base, recent_months(today, 6), self.session, self.headers)
+            for u in files:
+                kind, iso = parse_infocouncil_filename(u)
+                if not kind or not iso:
+                    continue
+                out.append(MeetingDocument(self.council_id, self.council_name, kind, 'council', f"Council Meeting {kind.title()} - {iso}", iso, u, base))
 
         # Dedupe/sort
         seen=set(); uniq=[]
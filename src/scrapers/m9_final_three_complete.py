@@ -3,12 +3,12 @@ Final implementation of Yarra, Stonnington, and Port Phillip scrapers
 Using all discovered patterns
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
-from datetime import datetime, timedelta
 from dateutil.parser import parse as parse_date
 from m9_adapted import MeetingDocument, BaseM9Scraper
+from src.utils.probe_engine import ProbeEngine, ProbeSpec, UrlTemplate, weekly
+from src.utils.probe_memo import PROBE_PDF_TYPE, range_probe
 
 
 class YarraFinalScraper(BaseM9Scraper):
@@ -29,7 +29,7 @@ class YarraFinalScraper(BaseM9Scraper):
         list_url = "https://www.yarracity.vic.gov.au/about-us/committees-meetings-and-minutes"
         
         try:
-            response = requests.get(list_url, headers=self.headers, timeout=30)
+            response = self.session.get(list_url, timeout=30)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
                 
@@ -83,7 +83,7 @@ class YarraFinalScraper(BaseM9Scraper):
                 # Visit each meeting page
                 for meeting_url in meeting_links[:10]:  # Limit to recent 10
                     try:
-                        meeting_resp = requests.get(meeting_url, headers=self.headers, timeout=30)
+                        meeting_resp = self.session.get(meeting_url, timeout=30)
                         if meeting_resp.status_code == 200:
                             meeting_soup = BeautifulSoup(meeting_resp.text, 'html.parser')
                             
@@ -145,73 +145,42 @@ class StonningtonFinalScraper(BaseM9Scraper):
         )
     
     def scrape(self):
-        """Scrape Stonnington by constructing known file paths and probing with HEAD"""
+        """Scrape Stonnington by constructing known file paths and probing them"""
         results = []
 
-        def try_url(url: str) -> bool:
-            try:
-                # Use Range header to avoid downloading full files
-                test_headers = dict(self.headers)
-                test_headers['Range'] = 'bytes=0-0'
-                resp = requests.get(url, headers=test_headers, timeout=3, allow_redirects=True)
-                ctype = resp.headers.get('Content-Type', '')
-                return resp.status_code in (200, 206) and 'pdf' in ctype.lower()
-            except Exception:
-                return False
-
-        # Iterate recent dates and try known patterns
-        today = datetime.now()
-        base = f"{self.base_url}/files/assets/public/v/2/about/council-meetings"
-
-        session = requests.Session()
-        session.headers.update(self.headers)
-
+        # Monday and Tuesday of recent weeks; slugs use short or full month names
         import os
         max_weeks = int(os.environ.get('STON_WEEKS', '26'))
-        for weeks_back in range(0, max_weeks):  # ~6 months of weeks by default
-            # Check Monday and Tuesday of each week
-            base_day = today - timedelta(weeks=weeks_back)
-            monday = base_day - timedelta(days=(base_day.weekday() % 7))
-            for d in (monday, monday + timedelta(days=1)):
-                dd = d.strftime('%d')
-                year = d.strftime('%Y')
-                month_full = d.strftime('%B').lower()
-                month_short = d.strftime('%b').lower()
-
-                slugs = [f"{dd}-{month_short}-{year}", f"{dd}-{month_full}-{year}"]
-                filenames = [
-                    'agenda.pdf',
-                    'minutes.pdf',
-                    f'council-meeting-agenda-{dd}-{month_full}-{year}.pdf',
-                    f'council-meeting-minutes-{dd}-{month_full}-{year}.pdf',
+        slugs = ['{dd}-{mon}-{yyyy}', '{dd}-{month}-{yyyy}']
+        spec = ProbeSpec(
+            templates=[
+                UrlTemplate(kind, [f"{{base}}/{{yyyy}}/{slug}/{fname}" for slug in slugs])
+                for kind, fname in [
+                    ('agenda', 'agenda.pdf'),
+                    ('minutes', 'minutes.pdf'),
+                    ('agenda', 'council-meeting-agenda-{dd}-{month}-{yyyy}.pdf'),
+                    ('minutes', 'council-meeting-minutes-{dd}-{month}-{yyyy}.pdf'),
                 ]
-
-                for slug in slugs:
-                    for fname in filenames:
-                        url = f"{base}/{year}/{slug}/{fname}"
-                        # Prefer the lightweight GET probe
-                        ok = try_url(url)
-                        if ok:
-                            doc_type = 'minutes' if 'minutes' in fname else 'agenda'
-                            formatted_date = d.strftime('%Y-%m-%d')
-                            title = f"Council Meeting {doc_type.title()} - {formatted_date}"
-
-                            results.append(MeetingDocument(
-                                council_id=self.council_id,
-                                council_name=self.council_name,
-                                document_type=doc_type,
-                                meeting_type='council',
-                                title=title,
-                                date=formatted_date,
-                                url=url,
-                                webpage_url=f"https://www.stonnington.vic.gov.au/About/Council-meetings"
-                            ))
-
-                # If we have gathered a decent number, stop early
-                if len(results) >= 16:
-                    break
-            if len(results) >= 16:
-                break
+            ],
+            dates=weekly([1, 0], weeks=max_weeks),
+            # If we have gathered a decent number, stop early
+            max_hits=16,
+            context={'base': f"{self.base_url}/files/assets/public/v/2/about/council-meetings"},
+            name=self.council_name,
+        )
+        engine = ProbeEngine(lambda u: range_probe(self.session, u, self.headers, strict_type=True),
+                             mode=PROBE_PDF_TYPE)
+        for hit in engine.run(spec).hits:
+            results.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='council',
+                title=f"Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=f"https://www.stonnington.vic.gov.au/About/Council-meetings"
+            ))
 
         # Dedupe and sort
         seen = set()
@@ -243,54 +212,30 @@ class PortPhillipFinalScraper(BaseM9Scraper):
         # Pattern: ORD_DDMMYYYY_AGN_AT.PDF for agenda
         # Pattern: ORD_DDMMYYYY_MIN.PDF for minutes
         
-        current_date = datetime.now()
-        
-        # Check last 6 months of potential meeting dates
-        for weeks_back in range(26):  # ~6 months
-            check_date = current_date - timedelta(weeks=weeks_back)
-            
-            # Find Wednesday of that week
-            days_ahead = 2 - check_date.weekday()  # Wednesday is 2
-            if days_ahead <= 0:  # Target day already happened this week
-                days_ahead += 7
-            wednesday = check_date + timedelta(days=days_ahead)
-            
-            # Also check Tuesday (since they moved it this week)
-            tuesday = wednesday - timedelta(days=1)
-            
-            for meeting_day in [wednesday, tuesday]:
-                # Format date as DDMMYYYY
-                date_str = meeting_day.strftime("%d%m%Y")
-                formatted_date = meeting_day.strftime("%Y-%m-%d")
-                month_year = meeting_day.strftime("%Y/%m")
-                
-                # Generate URLs for agenda and minutes
-                agenda_url = f"{self.base_url}/RedirectToDoc.aspx?URL=Open/{month_year}/ORD_{date_str}_AGN_AT.PDF"
-                minutes_url = f"{self.base_url}/RedirectToDoc.aspx?URL=Open/{month_year}/ORD_{date_str}_MIN.PDF"
-                
-                # Test if documents exist
-                for doc_type, url in [('agenda', agenda_url), ('minutes', minutes_url)]:
-                    try:
-                        # Use HEAD request to check if document exists
-                        response = requests.head(url, headers=self.headers, timeout=10, allow_redirects=True)
-                        
-                        # Check if it's a PDF
-                        content_type = response.headers.get('Content-Type', '')
-                        if response.status_code == 200 and 'pdf' in content_type.lower():
-                            doc = MeetingDocument(
-                                council_id=self.council_id,
-                                council_name=self.council_name,
-                                document_type=doc_type,
-                                meeting_type='ordinary',
-                                title=f"Ordinary Council Meeting {doc_type.title()} - {formatted_date}",
-                                date=formatted_date,
-                                url=url,
-                                webpage_url=self.base_url
-                            )
-                            results.append(doc)
-                            print(f"  Found: {formatted_date} ({meeting_day.strftime('%A')}) - {doc_type}")
-                    except:
-                        pass
+        # Wednesday, and Tuesday (they have moved meetings), over ~6 months
+        spec = ProbeSpec(
+            templates=[
+                UrlTemplate('agenda', ["{base}/RedirectToDoc.aspx?URL=Open/{yyyy}/{mm}/ORD_{ddmmyyyy}_AGN_AT.PDF"]),
+                UrlTemplate('minutes', ["{base}/RedirectToDoc.aspx?URL=Open/{yyyy}/{mm}/ORD_{ddmmyyyy}_MIN.PDF"]),
+            ],
+            dates=weekly([2, 1], weeks=26),
+            context={'base': self.base_url},
+            name=self.council_name,
+        )
+        engine = ProbeEngine(lambda u: range_probe(self.session, u, self.headers, strict_type=True),
+                             mode=PROBE_PDF_TYPE)
+        for hit in engine.run(spec).hits:
+            results.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='ordinary',
+                title=f"Ordinary Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=self.base_url
+            ))
+            print(f"  Found: {hit.iso} ({hit.date.strftime('%A')}) - {hit.document_type}")
         
         # Sort by date
         results.sort(key=lambda x: x.date, reverse=True)
@@ -0,0 +1,82 @@
+"""
+Lazy scraper registry.
+
+Maps the `scraper` names and `type` values used in the council registries
+to "module:attribute" import paths, and imports a module only when a council
+that needs it is actually scraped. A single-council run therefore loads one
+scraper module instead of every scraper (and cloudscraper/bs4/selenium).
+
+Modules are resolved from src/scrapers on sys.path, the same way the
+orchestrators import scrapers directly.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Custom M9 scrapers, by the `scraper` name used in all_councils.json
+SCRAPER_PATHS: Dict[str, str] = {
+    'MelbourneScraper': 'melbourne_m9_v2:MelbourneScraper',
+    'DarebinScraper': 'darebin_m9:DarebinScraper',
+    'HobsonsBayScraper': 'hobsonsbay_m9_fixed:HobsonsBayScraper',
+    'MaribyrnongScraper': 'm9_adapted:MaribyrnongScraper',
+    'MerribekScraper': 'm9_adapted:MerribekScraper',
+    'MooneeValleyFixedScraper': 'moonee_valley_fixed:MooneeValleyFixedScraper',
+    'YarraFixedScraper': 'yarra_stonnington_fixed:YarraFixedScraper',
+    'StonningtonFixedScraper': 'yarra_stonnington_fixed:StonningtonFixedScraper',
+    'PortPhillipFinalScraper': 'm9_final_three_complete:PortPhillipFinalScraper',
+}
+
+# Generic scrapers, by council `type`: (scraper class path, config class path)
+TYPE_PATHS: Dict[str, Tuple[str, Optional[str]]] = {
+    'infocouncil': ('infocouncil_generic:InfoCouncilScraper', 'infocouncil_generic:InfoCouncilConfig'),
+    'direct_page': ('generic_direct:DirectPageScraper', 'generic_direct:DirectPageConfig'),
+    'json_list': ('generic_json:JsonListScraper', 'generic_json:JsonListConfig'),
+    'generic': ('generic_web:SmartCouncilScraper', None),
+}
+
+# The M9 run order used by m9_unified_scraper.py: (display name, scraper name,
+# council id). The id is the one the scraper puts on its documents, so the
+# council's row, circuit and instruments share a key with them.
+M9_SCRAPERS: List[Tuple[str, str, str]] = [
+    ("Melbourne", 'MelbourneScraper', 'MELB'),
+    ("Darebin", 'DarebinScraper', 'DARE'),
+    ("Hobsons Bay", 'HobsonsBayScraper', 'HBAY'),
+    ("Maribyrnong", 'MaribyrnongScraper', 'MARI'),
+    ("Merri-bek", 'MerribekScraper', 'MERR'),
+    ("Moonee Valley", 'MooneeValleyFixedScraper', 'MOON'),
+    ("Yarra", 'YarraFixedScraper', 'YARR'),
+    ("Stonnington", 'StonningtonFixedScraper', 'STON'),
+    ("Port Phillip", 'PortPhillipFinalScraper', 'PORT'),
+]
+
+_resolved: Dict[str, Any] = {}
+
+
+def resolve(path: str) -> Any:
+    """Import and return the object at "module:attribute" (cached)."""
+    obj = _resolved.get(path)
+    if obj is None:
+        module_name, attr = path.split(':', 1)
+        obj = getattr(importlib.import_module(module_name), attr)
+        _resolved[path] = obj
+    return obj
+
+
+def get_scraper_class(name: str) -> Any:
+    """Return the custom scraper class for a registry `scraper` name.
+
+    Raises KeyError for unknown names.
+    """
+    return resolve(SCRAPER_PATHS[name])
+
+
+def get_type_classes(council_type: str) -> Tuple[Any, Optional[Any]]:
+    """Return (scraper class, config class or None) for a council `type`.
+
+    Unknown types fall back to the generic web scraper.
+    """
+    scraper_path, config_path = TYPE_PATHS.get(council_type, TYPE_PATHS['generic'])
+    return resolve(scraper_path), (resolve(config_path) if config_path else None)
@@ -6,8 +6,11 @@ These replace the non-working scrapers with improved versions
 import requests
 from bs4 import BeautifulSoup
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from m9_adapted import MeetingDocument, BaseM9Scraper
+from src.utils.http_politeness import polite_get, polite_head
+from src.utils.probe_engine import ProbeEngine, ProbeSpec, UrlTemplate, nth_weekdays, weekly
+from src.utils.probe_memo import PROBE_PDF_TYPE, get_probe_memo
 
 
 class YarraFixedScraper(BaseM9Scraper):
@@ -21,13 +24,18 @@ class YarraFixedScraper(BaseM9Scraper):
         )
     
     def probe_url(self, url):
-        """Check if a URL exists and is a PDF"""
+        """Check if a URL exists and is a PDF (memoised per run)"""
+        return get_probe_memo().probe(url, self._probe_once, PROBE_PDF_TYPE)
+    
+    def _probe_once(self, url):
         try:
-            response = requests.head(url, headers=self.headers, timeout=3, allow_redirects=True)
+            response = polite_head(url, headers=self.headers, timeout=3, allow_redirects=True)
+            if response.status_code == 429 or response.status_code >= 500:
+                return None  # inconclusive; not cached across runs
             content_type = response.headers.get('Content-Type', '').lower()
             return response.status_code in (200, 206) and 'pdf' in content_type
         except:
-            return False
+            return None
     
     def scrape(self):
         """Scrape Yarra using multiple approaches"""
@@ -40,7 +48,7 @@ class YarraFixedScraper(BaseM9Scraper):
             "https://www.yarracity.vic.gov.au/about-us/council-and-committee-meetings/upcoming-council-and-committee-meetings",
         ]:
             try:
-                response = requests.get(meetings_url, headers=self.headers, timeout=30)
+                response = polite_get(meetings_url, headers=self.headers, timeout=30)
                 if response.status_code != 200:
                     continue
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -91,61 +99,29 @@ class YarraFixedScraper(BaseM9Scraper):
                 continue
         
         # Approach 2: Try known URL patterns for recent months
-        current_date = datetime.now()
-        
-        # Check last 6 months of potential meeting dates
-        for months_back in range(6):
-            check_month = current_date - timedelta(days=30 * months_back)
-            year = check_month.strftime('%Y')
-            month = check_month.strftime('%m')
-            year_month = f"{year}-{month}"
-            
-            # Yarra typically meets on 2nd and 4th Tuesday
-            # Generate potential meeting dates
-            potential_dates = []
-            
-            # Find all Tuesdays in the month
-            first_day = datetime(check_month.year, check_month.month, 1)
-            for day in range(1, 32):
-                try:
-                    date = datetime(check_month.year, check_month.month, day)
-                    if date.weekday() == 1:  # Tuesday
-                        potential_dates.append(date)
-                except:
-                    break
-            
-            # Check 2nd and 4th Tuesday (if they exist)
-            for i in [1, 3]:  # 2nd and 4th elements
-                if i < len(potential_dates):
-                    date = potential_dates[i]
-                    if date <= current_date:
-                        day = date.strftime('%d')
-                        date_str = date.strftime('%Y-%m-%d')
-                        
-                        # Try various URL patterns
-                        patterns = [
-                            f"/sites/default/files/{year_month}/{year}{month}{day}-council-agenda.pdf",
-                            f"/sites/default/files/{year_month}/{year}{month}{day}_council_agenda.pdf",
-                            f"/sites/default/files/{year_month}/{year}{month}{day}-council-minutes.pdf",
-                            f"/sites/default/files/{year_month}/{year}{month}{day}_council_minutes.pdf",
-                        ]
-                        
-                        for pattern in patterns:
-                            url = self.base_url + pattern
-                            if self.probe_url(url):
-                                doc_type = 'minutes' if 'minutes' in pattern else 'agenda'
-                                
-                                doc = MeetingDocument(
-                                    council_id=self.council_id,
-                                    council_name=self.council_name,
-                                    document_type=doc_type,
-                                    meeting_type='council',
-                                    title=f"Council Meeting {doc_type.title()} - {date_str}",
-                                    date=date_str,
-                                    url=url,
-                                    webpage_url=self.base_url + "/about-us/council-meetings"
-                                )
-                                results.append(doc)
+        # Yarra typically meets on the 2nd and 4th Tuesday
+        spec = ProbeSpec(
+            templates=[
+                UrlTemplate('agenda', ['{base}/sites/default/files/{yyyy}-{mm}/{yyyymmdd}-council-agenda.pdf',
+                                       '{base}/sites/default/files/{yyyy}-{mm}/{yyyymmdd}_council_agenda.pdf']),
+                UrlTemplate('minutes', ['{base}/sites/default/files/{yyyy}-{mm}/{yyyymmdd}-council-minutes.pdf',
+                                        '{base}/sites/default/files/{yyyy}-{mm}/{yyyymmdd}_council_minutes.pdf']),
+            ],
+            dates=nth_weekdays(1, (2, 4), months=6),
+            context={'base': self.base_url},
+            name=self.council_name,
+        )
+        for hit in ProbeEngine(self._probe_once, mode=PROBE_PDF_TYPE).run(spec).hits:
+            results.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='council',
+                title=f"Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=self.base_url + "/about-us/council-meetings"
+            ))
         
         # Remove duplicates
         seen_urls = set()
@@ -173,133 +149,94 @@ class StonningtonFixedScraper(BaseM9Scraper):
         self.infocouncil_base = "https://stonnington.infocouncil.biz"
     
     def probe_url(self, url):
-        """Check if a URL exists and is a PDF"""
+        """Check if a URL exists and is a PDF (memoised per run)"""
+        return get_probe_memo().probe(url, self._probe_once, PROBE_PDF_TYPE)
+    
+    def _probe_once(self, url):
         try:
             # Use Range header to avoid downloading full files
             test_headers = dict(self.headers)
             test_headers['Range'] = 'bytes=0-0'
-            response = requests.get(url, headers=test_headers, timeout=3, allow_redirects=True)
+            response = polite_get(url, headers=test_headers, timeout=3, allow_redirects=True)
+            if response.status_code == 429 or response.status_code >= 500:
+                return None  # inconclusive; not cached across runs
             content_type = response.headers.get('Content-Type', '').lower()
             return response.status_code in (200, 206) and 'pdf' in content_type
         except:
-            return False
+            return None
     
     def scrape(self):
         """Scrape Stonnington using multiple approaches"""
         results = []
         
-        # Approach 1: Try the main council website patterns
-        base = f"{self.base_url}/files/assets/public/v/2/about/council-meetings"
-        
-        current_date = datetime.now()
-        
-        # Check last 4 months of potential meeting dates
-        for weeks_back in range(16):
-            check_date = current_date - timedelta(weeks=weeks_back)
-            
-            # Stonnington typically meets on Tuesdays
-            # Find Tuesday of that week
-            days_until_tuesday = (1 - check_date.weekday()) % 7
-            if days_until_tuesday == 0:
-                tuesday = check_date
-            else:
-                tuesday = check_date + timedelta(days=days_until_tuesday)
-            
-            if tuesday > current_date:
-                continue
-            
-            year = tuesday.strftime('%Y')
-            dd = tuesday.strftime('%d')
-            month_full = tuesday.strftime('%B').lower()
-            month_short = tuesday.strftime('%b').lower()
-            date_str = tuesday.strftime('%Y-%m-%d')
-            
-            # Try various URL patterns
-            patterns = [
-                (f"{base}/{year}/{dd}-{month_short}-{year}/agenda.pdf", 'agenda'),
-                (f"{base}/{year}/{dd}-{month_full}-{year}/agenda.pdf", 'agenda'),
-                (f"{base}/{year}/{dd}-{month_short}-{year}/minutes.pdf", 'minutes'),
-                (f"{base}/{year}/{dd}-{month_full}-{year}/minutes.pdf", 'minutes'),
-            ]
-            
-            for url, doc_type in patterns:
-                if self.probe_url(url):
-                    doc = MeetingDocument(
-                        council_id=self.council_id,
-                        council_name=self.council_name,
-                        document_type=doc_type,
-                        meeting_type='council',
-                        title=f"Council Meeting {doc_type.title()} - {date_str}",
-                        date=date_str,
-                        url=url,
-                        webpage_url=f"{self.base_url}/About/Council-meetings"
-                    )
-                    results.append(doc)
-                    break  # Found a working pattern for this date
+        # Approach 1: Try the main council website patterns (Tuesday meetings)
+        engine = ProbeEngine(self._probe_once, mode=PROBE_PDF_TYPE)
+        site = ProbeSpec(
+            templates=[
+                UrlTemplate(kind, [f"{{base}}/{{yyyy}}/{{dd}}-{{mon}}-{{yyyy}}/{kind}.pdf",
+                                   f"{{base}}/{{yyyy}}/{{dd}}-{{month}}-{{yyyy}}/{kind}.pdf"])
+                for kind in ('agenda', 'minutes')
+            ],
+            dates=weekly([1], weeks=16),
+            context={'base': f"{self.base_url}/files/assets/public/v/2/about/council-meetings"},
+            name=f"{self.council_name} (site)",
+        )
+        for hit in engine.run(site).hits:
+            results.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='council',
+                title=f"Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=f"{self.base_url}/About/Council-meetings"
+            ))
         
         # Approach 2: Try InfoCouncil pattern
         # InfoCouncil uses formats like: ORD_DDMMYYYY_AGN_AT.PDF, OCM_DDMMYYYY_MIN.PDF
-        
-        for weeks_back in range(16):
-            check_date = current_date - timedelta(weeks=weeks_back)
-            
-            # Find Tuesday of that week
-            days_until_tuesday = (1 - check_date.weekday()) % 7
-            if days_until_tuesday == 0:
-                tuesday = check_date
-            else:
-                tuesday = check_date + timedelta(days=days_until_tuesday)
-            
-            if tuesday > current_date:
-                continue
-            
-            # Format date as DDMMYYYY
-            date_code = tuesday.strftime("%d%m%Y")
-            date_str = tuesday.strftime("%Y-%m-%d")
-            month_year = tuesday.strftime("%Y/%m")
-            
-            # Try both direct and redirect URLs, with multiple prefixes
-            patterns = []
-            for p in ["ORD", "OCM", "CM"]:
-                patterns.append((f"{self.infocouncil_base}/Open/{month_year}/{p}_{date_code}_AGN_AT.PDF", 'agenda'))
-                patterns.append((f"{self.infocouncil_base}/Open/{month_year}/{p}_{date_code}_AGN.PDF", 'agenda'))
-                patterns.append((f"{self.infocouncil_base}/Open/{month_year}/{p}_{date_code}_MIN.PDF", 'minutes'))
-            
-            for url, doc_type in patterns:
-                if self.probe_url(url):
-                    doc = MeetingDocument(
-                        council_id=self.council_id,
-                        council_name=self.council_name,
-                        document_type=doc_type,
-                        meeting_type='council',
-                        title=f"Council Meeting {doc_type.title()} - {date_str}",
-                        date=date_str,
-                        url=url,
-                        webpage_url=self.infocouncil_base
-                    )
-                    results.append(doc)
+        prefixes = ["ORD", "OCM", "CM"]
+        infocouncil = ProbeSpec(
+            templates=[
+                UrlTemplate('agenda', ["{base}/Open/{yyyy}/{mm}/{prefix}_{ddmmyyyy}_AGN_AT.PDF"], {'prefix': prefixes}),
+                UrlTemplate('agenda', ["{base}/Open/{yyyy}/{mm}/{prefix}_{ddmmyyyy}_AGN.PDF"], {'prefix': prefixes}),
+                UrlTemplate('minutes', ["{base}/Open/{yyyy}/{mm}/{prefix}_{ddmmyyyy}_MIN.PDF"], {'prefix': prefixes}),
+            ],
+            dates=weekly([1], weeks=16),
+            context={'base': self.infocouncil_base},
+            name=f"{self.council_name} (InfoCouncil)",
+        )
+        for hit in engine.run(infocouncil).hits:
+            results.append(MeetingDocument(
+                council_id=self.council_id,
+                council_name=self.council_name,
+                document_type=hit.document_type,
+                meeting_type='council',
+                title=f"Council Meeting {hit.document_type.title()} - {hit.iso}",
+                date=hit.iso,
+                url=hit.url,
+                webpage_url=self.infocouncil_base
+            ))
 
         # Month discovery fallback
         if not results:
             try:
-                from src.utils.infocouncil import discover_month_files, parse_infocouncil_filename
-                for i in range(0, 6):
-                    dt = current_date - timedelta(days=30*i)
-                    files = discover_month_files(self.infocouncil_base, dt.year, dt.month, self.session, self.headers)
-                    for u in files:
-                        kind, iso = parse_infocouncil_filename(u)
-                        if not kind or not iso:
-                            continue
-                        results.append(MeetingDocument(
-                            council_id=self.council_id,
-                            council_name=self.council_name,
-                            document_type=kind,
-                            meeting_type='council',
-                            title=f"Council Meeting {kind.title()} - {iso}",
-                            date=iso,
-                            url=u,
-                            webpage_url=self.infocouncil_base
-                        ))
+                from src.utils.infocouncil import discover_months, parse_infocouncil_filename, recent_months
+                files = discover_months(self.infocouncil_base, recent_months(datetime.now(), 6), self.session, self.headers)
+                for u in files:
+                    kind, iso = parse_infocouncil_filename(u)
+                    if not kind or not iso:
+                        continue
+                    results.append(MeetingDocument(
+                        council_id=self.council_id,
+                        council_name=self.council_name,
+                        document_type=kind,
+                        meeting_type='council',
+                        title=f"Council Meeting {kind.title()} - {iso}",
+                        date=iso,
+                        url=u,
+                        webpage_url=self.infocouncil_base
+                    ))
             except Exception:
                 pass
         
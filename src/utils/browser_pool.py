@@ -0,0 +1,182 @@
+"""
+Shared headless-browser pool for councils whose pages need JavaScript.
+
+Starting Chrome is the slowest single step of a scrape, so drivers are
+created lazily, kept warm and handed out to scrapers one at a time:
+
+- BrowserPool(size) holds up to BROWSER_POOL_SIZE drivers (default 1);
+  pool.driver() lends one in a `with` block, and a driver that raises is
+  quit and replaced on next use. Drivers are quit at interpreter exit.
+- fetch_rendered(url, ready) tries a plain HTTP GET first and returns that
+  HTML if ready(html) is true; only otherwise does it load the page in a
+  pooled browser, waiting until ready(page_source) instead of sleeping.
+
+The browser does its own networking, so an HTTP cassette never sees it.
+When a cassette is replaying, fetch_rendered() skips the browser and
+returns '' (the page is treated as unavailable, keeping replays offline
+and deterministic); when one is recording, the browser is still used but
+the rendered page is not captured, so its replay will come back empty.
+
+Selenium is imported only when a browser is actually needed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.utils.http_cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', '1'))
+BROWSER_READY_TIMEOUT = float(os.environ.get('BROWSER_READY_TIMEOUT', '15'))
+
+
+def chrome_driver():
+    """A headless Chrome driver (the default pool factory)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    return webdriver.Chrome(options=options)
+
+
+class BrowserPool:
+    """Lazily created, reusable browser drivers."""
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, factory: Callable[[], object] = chrome_driver):
+        self.size = max(1, size)
+        self.factory = factory
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._all: List[object] = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def _acquire(self, timeout: Optional[float]):
+        try:
+            driver = self._idle.get_nowait()
+            self.reused += 1
+            return driver
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                driver = self.factory()
+                self._all.append(driver)
+                self.created += 1
+                return driver
+        # Pool is full: wait for a driver to come back
+        driver = self._idle.get(timeout=timeout)
+        self.reused += 1
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[object]:
+        """Borrow a driver; a driver whose use raised is quit rather than returned."""
+        driver = self._acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self._discard(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': self.size, 'live': len(self._all), 'created': self.created, 'reused': self.reused}
+
+    def close(self):
+        """Quit every driver."""
+        with self._lock:
+            drivers, self._all = self._all, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool shared by every browser-rendered scraper."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+    return _pool
+
+
+def wait_until(driver, ready: Callable[[str], bool], timeout: float = BROWSER_READY_TIMEOUT,
+               poll: float = 0.25) -> bool:
+    """Wait until ready(page_source) holds; False on timeout."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(lambda d: ready(d.page_source))
+        return True
+    except TimeoutException:
+        return False
+
+
+def fetch_rendered(url: str, ready: Callable[[str], bool], session=None, headers: Optional[Dict] = None,
+                   pool: Optional[BrowserPool] = None, timeout: float = BROWSER_READY_TIMEOUT) -> str:
+    """HTML for a page, from plain HTTP when that suffices, else from a pooled browser.
+
+    `ready(html)` decides both whether the HTTP response already has the
+    content and when the browser page has finished rendering. Returns the
+    browser's page source even if it never became ready ('' on failure).
+    """
+    try:
+        if session is not None:
+            resp = session.get(url, headers=headers, timeout=20)
+        else:
+            from src.utils.http_politeness import polite_get
+            resp = polite_get(url, headers=headers, timeout=20)
+        if resp.status_code == 200 and ready(resp.text):
+            logger.info(f"{url}: plain HTTP was enough")
+            return resp.text
+    except Exception as e:
+        logger.info(f"{url}: HTTP fetch failed ({e}), trying browser")
+
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == 'replay':
+        logger.warning(f"{url}: needs a browser, which a cassette replay can't provide")
+        return ''
+    if cassette is not None:
+        logger.warning(f"{url}: rendered in a browser, not captured by the cassette")
+
+    pool = pool or get_browser_pool()
+    try:
+        with pool.driver() as driver:
+            driver.get(url)
+            if not wait_until(driver, ready, timeout):
+                logger.warning(f"{url}: page not ready after {timeout:.0f}s")
+            return driver.page_source
+    except Exception as e:
+        logger.error(f"{url}: browser fetch failed: {e}")
+        return ''
@@ -0,0 +1,296 @@
+"""
+Circuit breakers for hosts and councils that keep failing.
+
+A site that is down or blocking us otherwise costs its full budget every
+run: 30s page timeouts, then hundreds of probe timeouts until the 120s
+alarm. CircuitBreaker keeps two kinds of circuit and persists both across
+runs in CIRCUIT_FILE:
+
+- Host circuits, checked by HostScheduler on every request. Timeouts,
+  connection errors and 5xx responses are failures; any other response is
+  a success. After CIRCUIT_HOST_FAILURES consecutive failures the circuit
+  opens, and requests to the host fail at once with CircuitOpen (a
+  requests.ConnectionError, so scrapers handle it like an offline host).
+- Council circuits, updated by the scrape loops after each council. A run
+  that errors, times out or finds no documents is a failure. After
+  CIRCUIT_COUNCIL_FAILURES failed runs in a row the circuit opens, and
+  while it is open the council's expensive fallback path (ProbeEngine URL
+  guessing) is skipped. Its pages are still fetched, and a run that finds
+  documents closes the circuit.
+
+An open circuit turns half-open once its backoff has passed: a host lets
+one trial request through, a council gets one full run. Success closes the
+circuit, and failure reopens it with the backoff doubled (hosts:
+CIRCUIT_HOST_BACKOFF seconds, up to CIRCUIT_HOST_MAX_BACKOFF; councils:
+CIRCUIT_COUNCIL_BACKOFF_HOURS, up to CIRCUIT_COUNCIL_MAX_BACKOFF_HOURS).
+
+Council circuits are keyed by council_key(entry point, council id): registry
+rows can share a display name, and universal_scraper and m9_unified_scraper
+scrape the same councils with different code, so each keeps its own
+circuits. Files from before CIRCUIT_VERSION 2, keyed by name, keep their
+host circuits only.
+
+summary(key) gives the `circuit` entry for a council's council_stats. An
+empty CIRCUIT_FILE keeps circuits for the current process only. save()
+merges the circuits this process touched into the file under its lock, so
+concurrent shard processes don't drop each other's circuits. In CI the
+file is carried between runs in the Actions cache, like session_state.json.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional, Set
+
+import requests
+
+from src.utils.state_files import atomic_write, locked, read_json
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_FILE = os.environ.get('CIRCUIT_FILE', 'circuit_state.json')
+CIRCUIT_HOST_FAILURES = int(os.environ.get('CIRCUIT_HOST_FAILURES', '5'))
+CIRCUIT_HOST_BACKOFF = float(os.environ.get('CIRCUIT_HOST_BACKOFF', '60'))
+CIRCUIT_HOST_MAX_BACKOFF = float(os.environ.get('CIRCUIT_HOST_MAX_BACKOFF', str(6 * 3600)))
+CIRCUIT_COUNCIL_FAILURES = int(os.environ.get('CIRCUIT_COUNCIL_FAILURES', '3'))
+CIRCUIT_COUNCIL_BACKOFF_HOURS = float(os.environ.get('CIRCUIT_COUNCIL_BACKOFF_HOURS', '6'))
+CIRCUIT_COUNCIL_MAX_BACKOFF_HOURS = float(os.environ.get('CIRCUIT_COUNCIL_MAX_BACKOFF_HOURS', '168'))
+
+CIRCUIT_VERSION = 2
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+def council_key(entry_point: str, council_id: str) -> str:
+    """The council circuit key for a council scraped by `entry_point` (e.g. 'universal', 'm9')."""
+    return f"{entry_point}:{council_id}"
+
+
+class CircuitOpen(requests.ConnectionError):
+    """A request refused because its host's circuit is open."""
+
+
+@dataclass
+class Circuit:
+    state: str = CLOSED
+    failures: int = 0      # consecutive
+    trips: int = 0         # consecutive openings; sets the backoff
+    retry_at: float = 0.0  # epoch seconds when an open circuit turns half-open
+    error: str = ''
+    trial: bool = False    # a half-open host's trial request is in flight
+    skipped: int = 0       # fallbacks skipped during the council's current run
+
+    def to_dict(self) -> Dict:
+        # An unfinished half-open trial is retried next time
+        state = OPEN if self.state == HALF_OPEN else self.state
+        return {'state': state, 'failures': self.failures, 'trips': self.trips,
+                'retry_at': self.retry_at, 'error': self.error}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Circuit':
+        return cls(data.get('state', CLOSED), data.get('failures', 0), data.get('trips', 0),
+                   data.get('retry_at', 0.0), data.get('error', ''))
+
+
+class CircuitBreaker:
+    """Host and council circuits with backoff, persisted across runs."""
+
+    def __init__(self, path: Optional[str] = CIRCUIT_FILE,
+                 host_failures: int = CIRCUIT_HOST_FAILURES,
+                 host_backoff: float = CIRCUIT_HOST_BACKOFF,
+                 host_max_backoff: float = CIRCUIT_HOST_MAX_BACKOFF,
+                 council_failures: int = CIRCUIT_COUNCIL_FAILURES,
+                 council_backoff: float = CIRCUIT_COUNCIL_BACKOFF_HOURS * 3600,
+                 council_max_backoff: float = CIRCUIT_COUNCIL_MAX_BACKOFF_HOURS * 3600,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.host_limits = (max(1, host_failures), host_backoff, host_max_backoff)
+        self.council_limits = (max(1, council_failures), council_backoff, council_max_backoff)
+        self.clock = clock
+        self.hosts: Dict[str, Circuit] = {}
+        self.councils: Dict[str, Circuit] = {}
+        # Circuits updated by this process, which save() writes over the file's
+        self._touched: Dict[str, Set[str]] = {'hosts': set(), 'councils': set()}
+        self._current: Optional[Circuit] = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def _update(self, circuit: Circuit, ok: bool, limits, error: str) -> Optional[str]:
+        """Apply one outcome; returns the new state if it changed."""
+        if ok:
+            changed = circuit.state != CLOSED
+            circuit.state, circuit.failures, circuit.trips, circuit.error = CLOSED, 0, 0, ''
+            circuit.trial = False
+            return CLOSED if changed else None
+        threshold, backoff, max_backoff = limits
+        circuit.failures += 1
+        circuit.error = str(error)[:200]
+        circuit.trial = False
+        if circuit.state == HALF_OPEN or (circuit.state == CLOSED and circuit.failures >= threshold):
+            circuit.trips += 1
+            circuit.state = OPEN
+            circuit.retry_at = self.clock() + min(max_backoff, backoff * 2 ** (circuit.trips - 1))
+            return OPEN
+        return None
+
+    @staticmethod
+    def _log(kind: str, name: str, circuit: Circuit, change: Optional[str]):
+        if change == OPEN:
+            retry = datetime.fromtimestamp(circuit.retry_at).isoformat(timespec='seconds')
+            logger.warning(f"Circuit open for {kind} {name} after {circuit.failures} failures "
+                           f"({circuit.error}); retry after {retry}")
+        elif change == CLOSED:
+            logger.info(f"Circuit closed for {kind} {name}")
+
+    # -- hosts ----------------------------------------------------------
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to `host` may go out now (claims the half-open trial)."""
+        with self._lock:
+            circuit = self.hosts.get(host)
+            if circuit is None or circuit.state == CLOSED:
+                return True
+            if circuit.state == OPEN and self.clock() >= circuit.retry_at:
+                circuit.state, circuit.trial = HALF_OPEN, False
+            if circuit.state == HALF_OPEN and not circuit.trial:
+                circuit.trial = True
+                return True
+            return False
+
+    def record(self, host: str, ok: bool, error: str = ''):
+        """One request outcome for `host`."""
+        with self._lock:
+            circuit = self.hosts.get(host)
+            if circuit is None:
+                if ok:
+                    return
+                circuit = self.hosts[host] = Circuit()
+            self._touched['hosts'].add(host)
+            change = self._update(circuit, ok, self.host_limits, error)
+        self._log('host', host, circuit, change)
+
+    def host_state(self, host: str) -> str:
+        with self._lock:
+            circuit = self.hosts.get(host)
+            return circuit.state if circuit else CLOSED
+
+    # -- councils -------------------------------------------------------
+
+    @contextmanager
+    def council(self, key: str) -> Iterator[Circuit]:
+        """Scope one council's scrape; an open circuit whose backoff has passed turns half-open."""
+        with self._lock:
+            circuit = self.councils.setdefault(key, Circuit())
+            circuit.skipped = 0
+            if circuit.state == OPEN and self.clock() >= circuit.retry_at:
+                circuit.state = HALF_OPEN
+                logger.info(f"Circuit half-open for council {key}: trying a full scrape")
+            previous, self._current = self._current, circuit
+        try:
+            yield circuit
+        finally:
+            with self._lock:
+                self._current = previous
+
+    def fallbacks_allowed(self) -> bool:
+        """False while the council being scraped has an open circuit."""
+        with self._lock:
+            circuit = self._current
+            if circuit is None or circuit.state != OPEN:
+                return True
+            circuit.skipped += 1
+            return False
+
+    def record_council(self, key: str, ok: bool, error: str = ''):
+        """One scrape outcome for a council (ok = it found documents)."""
+        with self._lock:
+            circuit = self.councils.setdefault(key, Circuit())
+            self._touched['councils'].add(key)
+            change = self._update(circuit, ok, self.council_limits, error or 'no documents')
+        self._log('council', key, circuit, change)
+
+    def summary(self, key: str) -> Dict:
+        """The `circuit` entry for the council's council_stats."""
+        with self._lock:
+            circuit = self.councils.get(key) or Circuit()
+            entry = {'state': circuit.state, 'failures': circuit.failures}
+            if circuit.state != CLOSED:
+                entry['retry_at'] = datetime.fromtimestamp(circuit.retry_at).isoformat(timespec='seconds')
+            if circuit.error:
+                entry['error'] = circuit.error
+            if circuit.skipped:
+                entry['fallbacks_skipped'] = circuit.skipped
+            return {'circuit': entry}
+
+    # -- persistence ----------------------------------------------------
+
+    def _read(self) -> Dict[str, Dict]:
+        """The file's saved circuits by kind; council circuits from older versions are dropped."""
+        data = read_json(self.path) or {}
+        councils = data.get('councils', {}) if data.get('version') == CIRCUIT_VERSION else {}
+        return {'hosts': dict(data.get('hosts', {})), 'councils': dict(councils)}
+
+    def load(self):
+        if not self.path:
+            return
+        state = self._read()
+        self.hosts = {h: Circuit.from_dict(c) for h, c in state['hosts'].items()}
+        self.councils = {k: Circuit.from_dict(c) for k, c in state['councils'].items()}
+
+    def save(self):
+        """Merge the circuits this process touched into the file (locked, write-then-rename).
+
+        Only circuits that are open or have failures are kept.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            # name -> saved circuit, or None to drop it from the file
+            ours = {kind: {name: circuits[name].to_dict()
+                           if circuits[name].state != CLOSED or circuits[name].failures else None
+                           for name in self._touched[kind]}
+                    for kind, circuits in (('hosts', self.hosts), ('councils', self.councils))}
+            for touched in self._touched.values():
+                touched.clear()
+        if not any(c for circuits in ours.values() for c in circuits.values()) and not os.path.exists(self.path):
+            return
+        with locked(self.path):
+            state = self._read()
+            for kind, circuits in ours.items():
+                for name, circuit in circuits.items():
+                    if circuit is None:
+                        state[kind].pop(name, None)
+                    else:
+                        state[kind][name] = circuit
+            with atomic_write(self.path) as f:
+                json.dump({'version': CIRCUIT_VERSION, **{k: dict(sorted(v.items())) for k, v in state.items()}}, f, indent=1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hosts_open': sum(c.state != CLOSED for c in self.hosts.values()),
+                    'councils_open': sum(c.state != CLOSED for c in self.councils.values())}
+
+
+_breaker: Optional[CircuitBreaker] = None
+_breaker_lock = threading.Lock()
+
+
+def get_breaker() -> CircuitBreaker:
+    """The process-wide breaker (persistent unless CIRCUIT_FILE is empty)."""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(os.environ.get('CIRCUIT_FILE', CIRCUIT_FILE))
+    return _breaker
+
+
+def save_breaker():
+    """End of a run: write the circuit state."""
+    get_breaker().save()
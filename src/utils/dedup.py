@@ -0,0 +1,130 @@
+"""
+Cross-council document deduplication for results files.
+
+Scrapers only drop exact-URL repeats within their own output, so the same
+PDF can reach the results file several times: via InfoCouncil's /Open/ path
+and its RedirectToDoc.aspx?URL= redirector, via http and https, or from two
+scrapers covering the same council (Darebin is both an M9 scraper and a
+registry entry). DocumentIndex collapses these once, when results are
+assembled or merged:
+
+- by URL: canonicalize_doc_url() with the scheme and host case ignored;
+- by content: documents carrying a `fingerprint` (e.g. a content hash) also
+  match any earlier document with the same fingerprint.
+
+The first occurrence is kept. Documents without a URL are dropped rather
+than collapsed into each other. stats() reports what was collapsed and why.
+
+Scrape loops index each council's documents as they go (keep()) and build
+its council_stats counts from the survivors with council_counts(), so the
+counts add up to total_documents; `collapsed` says how many of the
+council's documents duplicated earlier ones.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from src.utils.url_canonicalize import canonicalize_doc_url
+
+
+def dedup_key(url: str) -> str:
+    """Canonical URL without scheme, host lower-cased: http and https match."""
+    canon = canonicalize_doc_url(url or '')
+    try:
+        p = urlsplit(canon)
+    except ValueError:
+        return canon
+    return urlunsplit(('', p.netloc.lower(), p.path, p.query, ''))
+
+
+class DocumentIndex:
+    """Set of results-file documents keyed by canonical URL and fingerprint."""
+
+    def __init__(self):
+        self.documents: List[Dict] = []
+        self._by_url: Dict[str, Dict] = {}
+        self._by_fingerprint: Dict[str, Dict] = {}
+        self.seen = 0
+        self.no_url = 0
+        self.collapsed: Counter = Counter()
+        self.collapsed_by_council: Counter = Counter()
+
+    def find(self, doc: Dict) -> Optional[Dict]:
+        """The already-indexed document this one duplicates, if any."""
+        match = self._by_url.get(dedup_key(doc.get('url', '')))
+        if match is None and doc.get('fingerprint'):
+            match = self._by_fingerprint.get(doc['fingerprint'])
+        return match
+
+    def add(self, doc: Dict) -> bool:
+        """Index a document; False if it has no URL or duplicates one already kept."""
+        self.seen += 1
+        if not doc.get('url'):
+            self.no_url += 1
+            return False
+        key = dedup_key(doc['url'])
+        fingerprint = doc.get('fingerprint')
+        if key in self._by_url:
+            self._collapse(doc, 'url')
+            return False
+        if fingerprint and fingerprint in self._by_fingerprint:
+            # Same content under another URL: remember the URL too
+            self._by_url[key] = self._by_fingerprint[fingerprint]
+            self._collapse(doc, 'fingerprint')
+            return False
+        self._by_url[key] = doc
+        if fingerprint:
+            self._by_fingerprint[fingerprint] = doc
+        self.documents.append(doc)
+        return True
+
+    def keep(self, documents: Iterable[Dict]) -> List[Dict]:
+        """Add documents in order; return the ones kept."""
+        return [doc for doc in documents if self.add(doc)]
+
+    def extend(self, documents: Iterable[Dict]) -> int:
+        """Add documents in order; return how many were kept."""
+        return len(self.keep(documents))
+
+    def _collapse(self, doc: Dict, reason: str):
+        self.collapsed[reason] += 1
+        self.collapsed_by_council[doc.get('council_name', '')] += 1
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, doc: Dict) -> bool:
+        return self.find(doc) is not None
+
+    def stats(self) -> Dict:
+        """Counts for the results file's `dedup` field."""
+        return {
+            'input': self.seen,
+            'kept': len(self.documents),
+            'collapsed': sum(self.collapsed.values()),
+            'no_url': self.no_url,
+            'by_reason': dict(self.collapsed),
+            'by_council': dict(self.collapsed_by_council.most_common()),
+        }
+
+
+def council_counts(kept: List[Dict], found: int) -> Dict[str, int]:
+    """total/agendas/minutes for a council_stats entry, from its surviving documents."""
+    counts = {
+        'total': len(kept),
+        'agendas': sum(1 for d in kept if d.get('document_type') == 'agenda'),
+        'minutes': sum(1 for d in kept if d.get('document_type') == 'minutes'),
+    }
+    if found > len(kept):
+        counts['collapsed'] = found - len(kept)
+    return counts
+
+
+def dedupe_documents(documents: Iterable[Dict]) -> DocumentIndex:
+    """Index a document list; the index's .documents are the survivors."""
+    index = DocumentIndex()
+    index.extend(documents)
+    return index
@@ -0,0 +1,88 @@
+"""
+The one record type for scraped meeting documents.
+
+Every scraper returns MeetingDocument objects. The class is slotted, so an
+instance has no per-object __dict__, and the strings that repeat across
+thousands of documents (council id and name, document and meeting type,
+date) are interned so all documents share one copy. Both matter for
+backfills that hold hundreds of thousands of documents at once.
+
+to_dict() / from_dict() convert to and from the JSON shape used in the
+results files; serialize_documents() does a whole list in one pass and
+also accepts dicts and older document-like objects.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+FIELDS = ('council_id', 'council_name', 'document_type', 'meeting_type',
+          'title', 'date', 'url', 'webpage_url')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
+class MeetingDocument:
+    """A council agenda or minutes document"""
+    council_id: str
+    council_name: str
+    document_type: str  # agenda, minutes
+    meeting_type: str   # council, delegated, special
+    title: str
+    date: str           # YYYY-MM-DD format
+    url: str
+    webpage_url: str = ''
+
+    def __post_init__(self):
+        self.council_id = _intern(self.council_id)
+        self.council_name = _intern(self.council_name)
+        self.document_type = _intern(self.document_type)
+        self.meeting_type = _intern(self.meeting_type)
+        self.date = _intern(self.date)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'council_id': self.council_id,
+            'council_name': self.council_name,
+            'document_type': self.document_type,
+            'meeting_type': self.meeting_type,
+            'title': self.title,
+            'date': self.date,
+            'url': self.url,
+            'webpage_url': self.webpage_url,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MeetingDocument':
+        get = data.get
+        return cls(get('council_id', ''), get('council_name', ''), get('document_type', ''),
+                   get('meeting_type', ''), get('title', ''), get('date', ''), get('url', ''),
+                   get('webpage_url', ''))
+
+
+def as_dict(doc) -> Dict:
+    """JSON form of a MeetingDocument, a dict (returned as is) or any document-like object."""
+    if type(doc) is MeetingDocument:
+        return doc.to_dict()
+    if isinstance(doc, dict):
+        return doc
+    return {
+        'council_id': getattr(doc, 'council_id', ''),
+        'council_name': getattr(doc, 'council_name', ''),
+        'document_type': getattr(doc, 'document_type', ''),
+        'meeting_type': getattr(doc, 'meeting_type', ''),
+        'title': getattr(doc, 'title', getattr(doc, 'name', '')),
+        'date': getattr(doc, 'date', ''),
+        'url': getattr(doc, 'url', getattr(doc, 'download_url', '')),
+        'webpage_url': getattr(doc, 'webpage_url', ''),
+    }
+
+
+def serialize_documents(documents: Iterable) -> List[Dict]:
+    """Convert documents to JSON-serializable dicts in a single pass."""
+    return [as_dict(doc) for doc in documents]
@@ -0,0 +1,276 @@
+"""
+Record and replay all scraper HTTP traffic.
+
+A Cassette sits in the requests transport adapter, below polite(),
+shared sessions and cloudscraper. It therefore sees every page fetch,
+range probe, InfoCouncil listing and PDF download, whichever scraper made
+it.
+
+- record: requests go to the network as usual; each response (status,
+  headers, body), or the timeout / connection error raised instead, is
+  stored under (method, URL, Range, request-body hash). A recording
+  starts empty and replaces the archive on save; pass append=True to add
+  to an existing one (new responses then play after the old ones).
+- replay: no network at all. Responses come from the cassette, and
+  repeated requests for one key get the recorded responses in order, the
+  last one repeating. A request that was never recorded raises
+  CassetteMiss (a requests.ConnectionError), so scrapers handle it like an
+  offline host and replays stay deterministic.
+
+The archive is one zip file: index.json plus one deflated file per
+distinct body under bodies/<sha1>. The identical 404 pages and PDFs that
+probing produces are stored once. Set-Cookie headers are not recorded.
+
+Turn it on with HTTP_CASSETTE=<path> and HTTP_CASSETTE_MODE=record|replay
+(default replay), or with --record/--replay on the scrape commands.
+
+start_cassette() also keeps the run away from state persisted by other
+runs, through the environment (the accessors read it when they first
+create their objects, and --jobs workers inherit it):
+
+- record: no persistent probe cache, so every probe goes out and lands
+  in the cassette instead of being answered from an earlier run;
+- replay: additionally no circuit or session files and no host pacing
+  (SCRAPE_HOST_RATE=0). The scheduler never reports a CassetteMiss to
+  the circuit breaker, so an unrecorded request can't open a circuit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import zipfile
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.utils.state_files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+HTTP_CASSETTE = os.environ.get('HTTP_CASSETTE', '')
+HTTP_CASSETTE_MODE = os.environ.get('HTTP_CASSETTE_MODE', 'replay')
+
+MODES = ('record', 'replay')
+_SKIP_HEADERS = {'set-cookie', 'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+Key = Tuple[str, str, str, str]
+
+# Settings start_cassette() applies, per mode
+ISOLATED_ENV = {
+    'record': {'PROBE_CACHE_FILE': ''},
+    'replay': {'PROBE_CACHE_FILE': '', 'CIRCUIT_FILE': '', 'HTTP_SESSION_FILE': '', 'SCRAPE_HOST_RATE': '0'},
+}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed request that is not in the cassette."""
+
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def request_key(request) -> Key:
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode()
+    return (request.method.upper(), request.url, request.headers.get('Range', ''),
+            _sha1(body) if body else '')
+
+
+class Cassette:
+    """Recorded responses, deduplicated by body."""
+
+    def __init__(self, path: str, mode: str = 'replay', append: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {MODES}, not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self._entries: Dict[Key, List[Dict]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._played: Counter = Counter()
+        self._lock = threading.Lock()
+        self._original = None
+        self._outer: Optional[Cassette] = None
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._statuses: Counter = Counter()
+        self._bytes = 0
+        if mode == 'replay' or (append and os.path.exists(path)):
+            self.load()
+
+    # -- storage --------------------------------------------------------
+
+    def load(self):
+        with zipfile.ZipFile(self.path) as zf:
+            index = json.loads(zf.read('index.json'))
+            for method, url, rng, body, responses in index['entries']:
+                self._entries[(method, url, rng, body)] = responses
+            for name in zf.namelist():
+                if name.startswith('bodies/'):
+                    self._bodies[name[len('bodies/'):]] = zf.read(name)
+
+    def save(self):
+        """Write the archive (write-then-rename); replay cassettes are never written."""
+        if self.mode != 'record' or not self.path:
+            return
+        with self._lock:
+            entries = [[*key, responses] for key, responses in sorted(self._entries.items())]
+            bodies = dict(self._bodies)
+        with atomic_write(self.path, 'wb') as f, zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('index.json', json.dumps({'version': 1, 'entries': entries}, separators=(',', ':')))
+            for digest, body in sorted(bodies.items()):
+                zf.writestr(f'bodies/{digest}', body)
+        logger.info(f"Cassette saved to {self.path}: {len(entries)} requests, {len(bodies)} bodies")
+
+    # -- traffic --------------------------------------------------------
+
+    def _count(self, status, nbytes: int):
+        self._statuses[str(status)] += 1
+        self._bytes += nbytes
+
+    def record(self, request, response):
+        body = response.content or b''
+        digest = _sha1(body)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS}
+        entry = {'status': response.status_code, 'reason': response.reason, 'headers': headers, 'body': digest}
+        with self._lock:
+            self._bodies.setdefault(digest, body)
+            self._entries.setdefault(request_key(request), []).append(entry)
+            self.recorded += 1
+            self._count(response.status_code, len(body))
+
+    def record_error(self, request, error: Exception):
+        kind = 'timeout' if isinstance(error, requests.Timeout) else 'connection'
+        with self._lock:
+            self._entries.setdefault(request_key(request), []).append({'error': kind, 'message': str(error)[:200]})
+            self.recorded += 1
+            self._count(kind, 0)
+
+    def play(self, request) -> requests.Response:
+        key = request_key(request)
+        with self._lock:
+            responses = self._entries.get(key)
+            if not responses:
+                self.misses += 1
+                self._count('miss', 0)
+                raise CassetteMiss(f"not in cassette: {key[0]} {key[1]}", request=request)
+            entry = responses[min(self._played[key], len(responses) - 1)]
+            self._played[key] += 1
+            self.hits += 1
+            if 'error' in entry:
+                self._count(entry['error'], 0)
+            else:
+                body = self._bodies[entry['body']]
+                self._count(entry['status'], len(body))
+        if 'error' in entry:
+            error = requests.Timeout if entry['error'] == 'timeout' else requests.ConnectionError
+            raise error(entry.get('message', ''), request=request)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body if request.method.upper() != 'HEAD' else b''
+        response.url = request.url
+        response.request = request
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'mode': self.mode, 'requests': sum(self._statuses.values()),
+                    'by_status': dict(self._statuses), 'bytes': self._bytes,
+                    'hits': self.hits, 'misses': self.misses, 'recorded': self.recorded,
+                    'entries': len(self._entries), 'bodies': len(self._bodies)}
+
+    # -- install --------------------------------------------------------
+
+    def install(self):
+        """Intercept every requests transport adapter in this process."""
+        global _installed
+        if self._original is not None:
+            return
+        self._outer, _installed = _installed, self
+        original = self._original = HTTPAdapter.send
+        cassette = self
+
+        def send(adapter, request, *args, **kwargs):
+            if cassette.mode == 'replay':
+                return cassette.play(request)
+            try:
+                response = original(adapter, request, *args, **kwargs)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                cassette.record_error(request, e)
+                raise
+            cassette.record(request, response)
+            return response
+
+        HTTPAdapter.send = send
+
+    def uninstall(self):
+        global _installed
+        if self._original is not None:
+            HTTPAdapter.send = self._original
+            self._original = None
+            _installed, self._outer = self._outer, None
+
+    def __enter__(self) -> 'Cassette':
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+        self.save()
+
+
+_active: Optional[Cassette] = None
+_active_lock = threading.Lock()
+_installed: Optional[Cassette] = None
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The cassette intercepting this process's traffic, if any (started or in a `with` block)."""
+    return _installed
+
+
+def start_cassette(path: str, mode: str = 'replay', append: bool = False) -> Cassette:
+    """Record or replay all HTTP traffic in this process until exit.
+
+    Call it before the first scrape, so the probe memo, breaker, sessions
+    and scheduler are created with ISOLATED_ENV.
+    """
+    global _active
+    with _active_lock:
+        if _active is None:
+            _active = Cassette(path, mode, append=append)
+            os.environ.update(ISOLATED_ENV[mode])
+            _active.install()
+            atexit.register(_active.save)
+            logger.info(f"HTTP cassette: {mode} {path}")
+    return _active
+
+
+def start_cassette_from_env() -> Optional[Cassette]:
+    """start_cassette() from HTTP_CASSETTE / HTTP_CASSETTE_MODE, if set (read at call time)."""
+    path = os.environ.get('HTTP_CASSETTE', HTTP_CASSETTE)
+    if not path:
+        return None
+    return start_cassette(path, os.environ.get('HTTP_CASSETTE_MODE', HTTP_CASSETTE_MODE))
+
+
+def save_cassette():
+    """Write the active recording now (it is also written at exit)."""
+    if _active is not None:
+        _active.save()
@@ -0,0 +1,310 @@
+"""
+Per-host politeness for scraper HTTP traffic.
+
+- Spaces requests to each host at a configurable rate (SCRAPE_HOST_RATE
+  requests/second, default 5) with slots reserved under a lock, so
+  concurrent callers queue in order instead of bursting. The rate caps a
+  council's probing too: at 5/s a host gets at most ~600 requests inside
+  m9's 120s per-council alarm, so a council that probes more than that is
+  cut off. Raise SCRAPE_HOST_RATE (0 = unthrottled) or pass host_rates for
+  such hosts rather than relying on the alarm.
+- Adapts per host: 429/503 double the interval (and honour Retry-After);
+  latency well above the host's baseline slows it by half again; healthy
+  responses slowly return it to the configured rate.
+- Collapses identical in-flight GET/HEAD requests: a second caller asking
+  for the same URL, params, headers and redirect policy while the first is
+  still waiting gets a copy of the same response instead of a second
+  request. Streamed requests, and requests with a body, auth, cookies or
+  other options, are never collapsed.
+- Keeps per-host counters, exposed via metrics(), and reports each request
+  and its time to the per-council instruments (src/utils/instrumentation.py).
+- With a CircuitBreaker (the process-wide scheduler uses get_breaker()),
+  refuses requests to hosts whose circuit is open and reports each
+  outcome to it (src/utils/circuit_breaker.py), except CassetteMiss from a
+  replay.
+
+Sessions opt in with polite(session), which shadows the instance's
+request() so get/head/post and cloudscraper's own retries all pass through.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpen, get_breaker
+from src.utils.http_cassette import CassetteMiss
+from src.utils.instrumentation import error_outcome, get_instruments, response_bytes
+
+
+SCRAPE_HOST_RATE = float(os.environ.get('SCRAPE_HOST_RATE', '5.0'))
+MAX_HOST_INTERVAL = float(os.environ.get('SCRAPE_MAX_HOST_INTERVAL', '30.0'))
+
+THROTTLE_STATUSES = (429, 503)
+LATENCY_FACTOR = 3.0     # slow down when latency exceeds this multiple of baseline
+LATENCY_ALPHA = 0.2      # EWMA weight of the newest sample
+RECOVERY = 0.9           # interval multiplier per healthy response
+
+
+@dataclass
+class HostState:
+    interval: float
+    next_slot: float = 0.0
+    latency: Optional[float] = None
+    baseline: Optional[float] = None
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    deduplicated: int = 0
+    waited: float = 0.0
+    slowdowns: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class _Inflight:
+    done: threading.Event = field(default_factory=threading.Event)
+    response: object = None
+    error: Optional[BaseException] = None
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or '').lower()
+
+
+# Options that don't change the response, so requests differing only in them can share one
+_DEDUPE_SAFE = frozenset(('headers', 'params', 'allow_redirects', 'timeout'))
+
+
+def _frozen(value):
+    """A hashable form of params or headers; raises TypeError if there isn't one."""
+    if value is None or isinstance(value, (str, bytes)):
+        return value
+    items = value.items() if hasattr(value, 'items') else value
+    return tuple(sorted((str(k).lower(), str(v)) for k, v in items))
+
+
+def dedupe_key(method: str, url: str, kwargs: Dict) -> Optional[Tuple]:
+    """The in-flight key for a request, or None if it must not share a response."""
+    method = method.upper()
+    if method not in ('GET', 'HEAD'):
+        return None
+    # stream=True, a body, auth, cookies, proxies...: unset (None/False) options are fine
+    if any(v is not None and v is not False for k, v in kwargs.items() if k not in _DEDUPE_SAFE):
+        return None
+    try:
+        return (method, url, _frozen(kwargs.get('params')), _frozen(kwargs.get('headers')),
+                kwargs.get('allow_redirects', method == 'GET'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(response) -> Optional[float]:
+    value = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class HostScheduler:
+    """Per-host request spacing with adaptive backoff and in-flight dedupe."""
+
+    def __init__(self,
+                 rate: float = SCRAPE_HOST_RATE,
+                 max_interval: float = MAX_HOST_INTERVAL,
+                 host_rates: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.base_interval = 1.0 / rate if rate > 0 else 0.0
+        self.max_interval = max_interval
+        self.host_rates = {h.lower(): r for h, r in (host_rates or {}).items()}
+        self.clock = clock
+        self.sleep = sleep
+        self.breaker = breaker
+        self.hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple, _Inflight] = {}
+        self._local = threading.local()
+
+    def _base(self, host: str) -> float:
+        rate = self.host_rates.get(host)
+        return (1.0 / rate if rate > 0 else 0.0) if rate is not None else self.base_interval
+
+    def _state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(interval=self._base(host))
+        return state
+
+    def acquire(self, host: str) -> float:
+        """Reserve the host's next slot and sleep until it; returns seconds waited."""
+        with self._lock:
+            state = self._state(host)
+            now = self.clock()
+            slot = max(now, state.next_slot)
+            state.next_slot = slot + state.interval
+            wait = slot - now
+            state.waited += wait
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def record(self, host: str, status: Optional[int], latency: float, response=None):
+        """Adapt the host's interval to one response (status None = connection error)."""
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            base = self._base(host)
+            if status is None or status >= 500:
+                state.errors += 1
+            if status in THROTTLE_STATUSES:
+                state.throttled += 1
+                state.interval = min(self.max_interval, max(state.interval * 2, base, 0.5))
+                pause = _retry_after(response)
+                if pause:
+                    state.next_slot = max(state.next_slot, self.clock() + min(pause, self.max_interval * 4))
+                return
+            if status is None:
+                return
+            state.latency = latency if state.latency is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * state.latency)
+            if state.baseline is None or state.latency < state.baseline:
+                state.baseline = state.latency
+            else:
+                # Let the baseline drift up slowly so one fast response is not the bar forever
+                state.baseline += (state.latency - state.baseline) * 0.01
+            if state.baseline and state.latency > LATENCY_FACTOR * state.baseline and latency > 0.5:
+                state.slowdowns += 1
+                state.interval = min(self.max_interval, max(state.interval * 1.5, base, 0.1))
+            else:
+                state.interval = max(base, state.interval * RECOVERY)
+
+    def request(self, send: Callable, method: str, url: str, **kwargs):
+        """Send one request through the scheduler. `send(method, url, **kwargs)` does the I/O."""
+        if getattr(self._local, 'active', False):
+            # Nested call (e.g. cloudscraper re-requesting after a challenge)
+            return send(method, url, **kwargs)
+        with get_instruments().phase('fetch'):
+            return self._request(send, method, url, **kwargs)
+
+    def _request(self, send: Callable, method: str, url: str, **kwargs):
+        host = host_of(url)
+        key = dedupe_key(method, url, kwargs)
+        if key is not None:
+            with self._lock:
+                entry = self._inflight.get(key)
+                owner = entry is None
+                if owner:
+                    entry = self._inflight[key] = _Inflight()
+                else:
+                    self._state(host).deduplicated += 1
+            if not owner:
+                entry.done.wait()
+                if entry.error is not None:
+                    raise entry.error
+                # Callers may set encoding etc. on their response; the body bytes are shared
+                return copy.copy(entry.response)
+
+        self._local.active = True
+        try:
+            if self.breaker is not None and not self.breaker.allow(host):
+                with self._lock:
+                    self._state(host).rejected += 1
+                get_instruments().record_request('circuit_open')
+                error = CircuitOpen(f"circuit open for {host}")
+                if key is not None:
+                    entry.error = error
+                raise error
+            self.acquire(host)
+            start = self.clock()
+            try:
+                response = send(method, url, **kwargs)
+            except Exception as e:
+                self.record(host, None, self.clock() - start)
+                get_instruments().record_request(error_outcome(e))
+                # A replayed request missing from the cassette says nothing about the host
+                if self.breaker is not None and not isinstance(e, CassetteMiss):
+                    self.breaker.record(host, False, f"{error_outcome(e)}: {e}")
+                if key is not None:
+                    entry.error = e
+                raise
+            status = getattr(response, 'status_code', None)
+            self.record(host, status, self.clock() - start, response)
+            get_instruments().record_request(status, response_bytes(response))
+            if self.breaker is not None:
+                self.breaker.record(host, status is not None and status < 500, f"HTTP {status}")
+            if key is not None:
+                entry.response = response
+            return response
+        finally:
+            self._local.active = False
+            if key is not None:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                entry.done.set()
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-host counters and current pacing, JSON-serialisable."""
+        with self._lock:
+            out = {}
+            for host, state in self.hosts.items():
+                data = asdict(state)
+                data.pop('next_slot')
+                data['rate'] = round(1.0 / state.interval, 3) if state.interval else None
+                if self.breaker is not None:
+                    data['circuit'] = self.breaker.host_state(host)
+                out[host] = data
+            return out
+
+
+_default: Optional[HostScheduler] = None
+
+
+def get_scheduler() -> HostScheduler:
+    """Process-wide scheduler shared by every polite session."""
+    global _default
+    if _default is None:
+        rate = float(os.environ.get('SCRAPE_HOST_RATE', SCRAPE_HOST_RATE))
+        _default = HostScheduler(rate=rate, breaker=get_breaker())
+    return _default
+
+
+def polite(session, scheduler: Optional[HostScheduler] = None):
+    """Route a requests/cloudscraper session's requests through the host scheduler."""
+    scheduler = scheduler or get_scheduler()
+    original = session.request
+
+    def request(method, url, *args, **kwargs):
+        if args:
+            return original(method, url, *args, **kwargs)
+        return scheduler.request(original, method, url, **kwargs)
+
+    session.request = request
+    return session
+
+
+def polite_get(url: str, **kwargs):
+    """requests.get through the shared host scheduler."""
+    import requests
+    return get_scheduler().request(requests.request, 'GET', url, **kwargs)
+
+
+def polite_head(url: str, **kwargs):
+    """requests.head through the shared host scheduler."""
+    import requests
+    kwargs.setdefault('allow_redirects', False)
+    return get_scheduler().request(requests.request, 'HEAD', url, **kwargs)
@@ -0,0 +1,226 @@
+"""
+Per-host HTTP sessions shared by every scraper, with persisted cookies.
+
+Scrapers used to build their own cloudscraper session, so each one solved
+the same anti-bot challenge again and threw the clearance cookies away at
+exit. HostSessions instead keeps one session per host for the whole run:
+
+- a plain requests.Session by default; a host that answers with a
+  challenge (403, or a Cloudflare 503) is switched to cloudscraper, the
+  request retried, and the host remembered as needing it for
+  CLOUDSCRAPER_LEARN_DAYS so later runs start with cloudscraper;
+- cookies (including Cloudflare clearance) are saved to HTTP_SESSION_FILE
+  at exit and reloaded next run; cookies without their own expiry are kept
+  for SESSION_COOKIE_TTL_HOURS. The save merges the hosts this process
+  used into the file under its lock, so concurrent shard processes keep
+  each other's hosts. The file is never committed; the scrape workflow
+  carries it between runs in the Actions cache.
+
+Scrapers take a SharedSession from shared_session(): a requests.Session
+whose requests are routed to the per-host sessions, with the scraper's own
+default headers. It still works with polite().
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+from src.utils.http_politeness import host_of
+from src.utils.state_files import atomic_write, locked, read_json
+
+logger = logging.getLogger(__name__)
+
+HTTP_SESSION_FILE = os.environ.get('HTTP_SESSION_FILE', 'session_state.json')
+CLOUDSCRAPER_LEARN_DAYS = float(os.environ.get('CLOUDSCRAPER_LEARN_DAYS', '7'))
+SESSION_COOKIE_TTL_HOURS = float(os.environ.get('SESSION_COOKIE_TTL_HOURS', '12'))
+
+_CHALLENGE_MARKERS = ('cf-chl', 'challenge-platform', 'Just a moment...', 'Attention Required!')
+
+
+def cloudscraper_session():
+    import cloudscraper
+    return cloudscraper.create_scraper()
+
+
+def is_challenge(response) -> bool:
+    """True if a response looks like an anti-bot block that cloudscraper may get past."""
+    status = getattr(response, 'status_code', None)
+    if status == 403:
+        return True
+    if status in (429, 503):
+        headers = getattr(response, 'headers', None) or {}
+        if 'cloudflare' in headers.get('Server', '').lower() or 'cf-mitigated' in headers:
+            return True
+        try:
+            head = response.text[:4000]
+        except Exception:
+            return False
+        return any(marker in head for marker in _CHALLENGE_MARKERS)
+    return False
+
+
+class HostSessions:
+    """One session per host, learning which hosts need cloudscraper."""
+
+    def __init__(self, path: Optional[str] = HTTP_SESSION_FILE,
+                 plain_factory: Callable[[], requests.Session] = requests.Session,
+                 cloud_factory: Callable[[], requests.Session] = cloudscraper_session,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.plain_factory = plain_factory
+        self.cloud_factory = cloud_factory
+        self.clock = clock
+        self._sessions: Dict[str, requests.Session] = {}
+        self._cloud: Dict[str, float] = {}     # host -> when it was learned
+        self._cookies: Dict[str, list] = {}    # host -> saved cookies not yet loaded
+        self._lock = threading.Lock()
+        self.escalations = 0
+        self.load()
+
+    def needs_cloudscraper(self, host: str) -> bool:
+        learned = self._cloud.get(host)
+        return learned is not None and self.clock() - learned < CLOUDSCRAPER_LEARN_DAYS * 86400
+
+    def _new_session(self, host: str, cloud: bool) -> requests.Session:
+        session = None
+        if cloud:
+            try:
+                session = self.cloud_factory()
+            except Exception as e:
+                logger.warning(f"cloudscraper unavailable for {host}: {e}")
+        session = session or self.plain_factory()
+        now = self.clock()
+        for c in self._cookies.pop(host, []):
+            if c.get('expires') and c['expires'] <= now:
+                continue
+            session.cookies.set(c['name'], c['value'], domain=c.get('domain', ''), path=c.get('path', '/'),
+                                expires=c.get('expires'))
+        return session
+
+    def session_for(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = self._new_session(host, self.needs_cloudscraper(host))
+            return session
+
+    def _escalate(self, host: str, old: requests.Session) -> requests.Session:
+        with self._lock:
+            if self._sessions.get(host) is not old:
+                return self._sessions[host]  # another thread already switched
+            self._cloud[host] = self.clock()
+            self._cookies[host] = self._dump_cookies(old, keep_session_cookies=True)
+            session = self._sessions[host] = self._new_session(host, cloud=True)
+            self.escalations += 1
+        logger.info(f"{host}: challenge seen, using cloudscraper")
+        return session
+
+    def request(self, method: str, url: str, **kwargs):
+        host = host_of(url)
+        session = self.session_for(host)
+        response = session.request(method, url, **kwargs)
+        if not self.needs_cloudscraper(host) and is_challenge(response):
+            response = self._escalate(host, session).request(method, url, **kwargs)
+        return response
+
+    def _dump_cookies(self, session, keep_session_cookies: bool = False) -> list:
+        default_expiry = int(self.clock() + SESSION_COOKIE_TTL_HOURS * 3600)
+        out = []
+        for c in session.cookies:
+            expires = c.expires or (None if keep_session_cookies else default_expiry)
+            out.append({'name': c.name, 'value': c.value, 'domain': c.domain,
+                        'path': c.path, 'expires': expires})
+        return out
+
+    def load(self):
+        data = read_json(self.path)
+        if data is None:
+            return
+        for host, state in data.get('hosts', {}).items():
+            if state.get('cloudscraper'):
+                self._cloud[host] = state['cloudscraper']
+            if state.get('cookies'):
+                self._cookies[host] = state['cookies']
+
+    def save(self):
+        """Merge the hosts used this run into the file (locked, write-then-rename).
+
+        Hosts this process never opened a session for keep whatever the
+        file has (another process may have updated them meanwhile), minus
+        anything that has expired.
+        """
+        if not self.path or not self._sessions:
+            return
+        now = self.clock()
+        learn_ttl = CLOUDSCRAPER_LEARN_DAYS * 86400
+        with self._lock:
+            ours = {host: {'cookies': self._dump_cookies(session), 'cloudscraper': self._cloud.get(host)}
+                    for host, session in self._sessions.items()}
+        if not any(e['cookies'] or e['cloudscraper'] for e in ours.values()) and not os.path.exists(self.path):
+            return
+        with locked(self.path):
+            data = read_json(self.path)
+            state = {**(data or {}).get('hosts', {}), **ours}
+            for host, entry in list(state.items()):
+                entry = {'cloudscraper': entry.get('cloudscraper'),
+                         'cookies': [c for c in entry.get('cookies') or []
+                                     if not c.get('expires') or c['expires'] > now]}
+                if not entry['cloudscraper'] or now - entry['cloudscraper'] >= learn_ttl:
+                    del entry['cloudscraper']
+                if not entry['cookies']:
+                    del entry['cookies']
+                if entry:
+                    state[host] = entry
+                else:
+                    del state[host]
+            if not state and data is None:
+                return
+            with atomic_write(self.path) as f:
+                json.dump({'version': 1, 'hosts': dict(sorted(state.items()))}, f, indent=1)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hosts': len(self._sessions),
+                'cloudscraper': sum(1 for h in self._sessions if self.needs_cloudscraper(h)),
+                'escalations': self.escalations}
+
+
+class SharedSession(requests.Session):
+    """A scraper's view of the shared per-host sessions: its own headers, shared cookies."""
+
+    def __init__(self, sessions: 'HostSessions'):
+        super().__init__()
+        self._host_sessions = sessions
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        merged = {**self.headers, **(headers or {})}
+        return self._host_sessions.request(method, url, params=params, data=data, headers=merged, **kwargs)
+
+
+_sessions: Optional[HostSessions] = None
+_sessions_lock = threading.Lock()
+
+
+def get_host_sessions() -> HostSessions:
+    """Process-wide per-host sessions, saved at exit."""
+    global _sessions
+    with _sessions_lock:
+        if _sessions is None:
+            _sessions = HostSessions(os.environ.get('HTTP_SESSION_FILE', HTTP_SESSION_FILE))
+            atexit.register(_sessions.save)
+    return _sessions
+
+
+def shared_session(headers: Optional[Dict] = None) -> SharedSession:
+    """A session for one scraper, backed by the shared per-host sessions."""
+    session = SharedSession(get_host_sessions())
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -7,53 +7,128 @@ Strategy:
 - Also try the RedirectToDoc.aspx with URL=Open/YYYY/MM/ as some deployments
   expose a listing via that path.
 - Parse any .PDF links found and return absolute URLs.
+
+The first variant that lists any PDFs wins; the other is not needed.
+discover_months() fans out across months and both variants concurrently,
+since most of the cost is waiting on slow or timing-out listings.
 """
 
 from __future__ import annotations
 
+import os
 import re
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
 
+from src.utils.instrumentation import timed
 
-def discover_month_files(base: str, year: int, month: int, session, headers) -> List[str]:
-    """Return a list of absolute PDF URLs under Open/YYYY/MM for an InfoCouncil host.
+DISCOVERY_WORKERS = int(os.environ.get('INFOCOUNCIL_DISCOVERY_WORKERS', '6'))
 
-    base: like https://darebin.infocouncil.biz
-    """
-    mm = f"{month:02d}"
-    y_m = f"{year}/{mm}"
-    candidates = [
+
+def _month_candidates(base: str, year: int, month: int) -> List[str]:
+    y_m = f"{year}/{month:02d}"
+    return [
         f"{base}/Open/{y_m}/",
         f"{base}/RedirectToDoc.aspx?URL=Open/{y_m}/",
     ]
+
+
+def _list_pdfs(url: str, base: str, year: int, month: int, session, headers) -> List[str]:
+    """Fetch one listing URL and return the absolute PDF links on it."""
+    y_m = f"{year}/{month:02d}"
     pdfs: List[str] = []
-    for url in candidates:
-        try:
-            r = session.get(url, headers=headers, timeout=10, allow_redirects=True)
-            if r.status_code != 200:
-                continue
-            # Find .pdf links in the body (case-insensitive)
-            for m in re.finditer(r'href=[\"\']([^\"\']+\.pdf)\b', r.text, flags=re.I):
-                href = m.group(1)
-                if href.startswith('http'):
-                    pdfs.append(href)
+    try:
+        r = session.get(url, headers=headers, timeout=10, allow_redirects=True)
+        if r.status_code != 200:
+            return []
+        # Find .pdf links in the body (case-insensitive)
+        for m in re.finditer(r'href=[\"\']([^\"\']+\.pdf)\b', r.text, flags=re.I):
+            href = m.group(1)
+            if href.startswith('http'):
+                pdfs.append(href)
+            else:
+                # Build absolute from base
+                if href.startswith('/'):
+                    pdfs.append(base + href)
                 else:
-                    # Build absolute from base
-                    if href.startswith('/'):
-                        pdfs.append(base + href)
-                    else:
-                        pdfs.append(f"{base}/Open/{y_m}/{href}")
-        except Exception:
-            continue
+                    pdfs.append(f"{base}/Open/{y_m}/{href}")
+    except Exception:
+        return []
+    return pdfs
+
+
+def _dedupe(urls) -> List[str]:
     # Dedupe, preserve order
     seen = set()
     out = []
-    for u in pdfs:
+    for u in urls:
         if u not in seen:
             seen.add(u)
             out.append(u)
     return out
 
+
+def recent_months(now: datetime, count: int) -> List[Tuple[int, int]]:
+    """(year, month) for the current and previous months, newest first, no repeats."""
+    months: List[Tuple[int, int]] = []
+    for i in range(count):
+        dt = now - timedelta(days=30 * i)
+        if (dt.year, dt.month) not in months:
+            months.append((dt.year, dt.month))
+    return months
+
+
+@timed('probe')
+def discover_month_files(base: str, year: int, month: int, session, headers) -> List[str]:
+    """Return a list of absolute PDF URLs under Open/YYYY/MM for an InfoCouncil host.
+
+    base: like https://darebin.infocouncil.biz
+    """
+    for url in _month_candidates(base, year, month):
+        pdfs = _list_pdfs(url, base, year, month, session, headers)
+        if pdfs:
+            return _dedupe(pdfs)
+    return []
+
+
+@timed('probe')
+def discover_months(base: str, months: Sequence[Tuple[int, int]], session, headers,
+                    max_workers: int = DISCOVERY_WORKERS) -> List[str]:
+    """discover_month_files for several months at once, fetched concurrently.
+
+    Both listing variants of every month are requested in parallel; once one
+    variant of a month lists PDFs, the other is cancelled if it has not
+    started (or its result is ignored). Results keep the order of `months`.
+    """
+    months = list(months)
+    if max_workers <= 1 or len(months) <= 1:
+        return _dedupe(u for y, m in months for u in discover_month_files(base, y, m, session, headers))
+
+    found: Dict[int, List[str]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        siblings: Dict[int, list] = {}
+        for idx, (year, month) in enumerate(months):
+            for rank, url in enumerate(_month_candidates(base, year, month)):
+                fut = pool.submit(_list_pdfs, url, base, year, month, session, headers)
+                futures[fut] = (idx, rank)
+                siblings.setdefault(idx, []).append(fut)
+        for fut in as_completed(futures):
+            if fut.cancelled():
+                continue
+            idx, _ = futures[fut]
+            if idx in found:
+                continue
+            pdfs = fut.result()
+            if pdfs:
+                found[idx] = pdfs
+                for other in siblings[idx]:
+                    other.cancel()
+    return _dedupe(u for idx in range(len(months)) for u in found.get(idx, []))
+
+
+@timed('dates')
 def parse_infocouncil_filename(url: str) -> Tuple[str|None, str|None]:
     """Return (doc_type, iso_date) from an InfoCouncil URL if possible.
 
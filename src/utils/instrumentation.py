@@ -0,0 +1,218 @@
+"""
+Per-council timing and request counters for scrape runs.
+
+The scrape loops wrap each council in `instruments.council(key)`, keyed
+by council id since registry rows can share a display name; while it is
+open, everything the process does is charged to that council
+(councils are scraped one at a time, but a council's probes run on worker
+threads, so the current council is process-wide rather than per thread).
+
+Time is split into phases by self time: a phase's time excludes nested
+phases, so a range probe's HTTP wait counts as `fetch`, not `probe`.
+
+- fetch: inside HostScheduler.request, including politeness waits
+- probe: ProbeEngine.run, InfoCouncil listing discovery and range_probe
+  (mostly waiting for worker threads)
+- dates: date extraction helpers (decorated with @timed('dates'))
+- serialize: turning documents into result dicts
+- parse: the rest of the scraper's own time, which is mostly HTML parsing
+
+Phases on worker threads are summed, so with concurrent probing the
+phases can add up to more than the council's wall time. Requests are
+counted by outcome (status code, 'timeout' or 'error'), with bytes
+received. summary() gives the fields merged into each council_stats entry,
+and prometheus_text() renders council_stats in Prometheus text format
+(from the results, so sharded runs export the same way), labelled with
+each council's name and id.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.utils.state_files import atomic_write
+
+PHASES = ('fetch', 'probe', 'dates', 'parse', 'serialize')
+
+
+@dataclass
+class CouncilMetrics:
+    phases: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    wall: float = 0.0
+    requests: Counter = field(default_factory=Counter)
+    bytes: int = 0
+    documents: int = 0
+
+    def summary(self) -> Dict:
+        total = sum(self.requests.values())
+        return {
+            'scrape_time': round(self.wall, 3),
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            'requests': dict(sorted(self.requests.items())),
+            'bytes': self.bytes,
+            'docs_per_request': round(self.documents / total, 3) if total else None,
+        }
+
+
+def response_bytes(response) -> int:
+    """Body size of a response, without reading a streamed body."""
+    content = getattr(response, '_content', None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    try:
+        return int((getattr(response, 'headers', None) or {}).get('Content-Length') or 0)
+    except ValueError:
+        return 0
+
+
+def error_outcome(error: BaseException) -> str:
+    try:
+        import requests
+        if isinstance(error, requests.Timeout):
+            return 'timeout'
+    except ImportError:
+        pass
+    return 'timeout' if isinstance(error, TimeoutError) else 'error'
+
+
+class Instruments:
+    """Phase timers and request counters, keyed by council."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.councils: Dict[str, CouncilMetrics] = {}
+        self._current: Optional[CouncilMetrics] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[List]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def council(self, key: str) -> Iterator[CouncilMetrics]:
+        """Charge everything until exit to council `key` (its id); the scraper's own time counts as parse."""
+        with self._lock:
+            metrics = self.councils.setdefault(key, CouncilMetrics())
+            previous, self._current = self._current, metrics
+        start = self.clock()
+        try:
+            with self.phase('parse'):
+                yield metrics
+        finally:
+            metrics.wall += self.clock() - start
+            with self._lock:
+                self._current = previous
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase (self time: nested phases are charged to themselves)."""
+        metrics = self._current
+        if metrics is None:
+            yield
+            return
+        stack = self._stack()
+        frame = [self.clock(), 0.0]  # start, time spent in nested phases
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = self.clock() - frame[0]
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                metrics.phases[name] = metrics.phases.get(name, 0.0) + elapsed - frame[1]
+
+    def reset(self):
+        """Start a new run: forget every council's metrics."""
+        with self._lock:
+            self.councils = {}
+
+    def record_request(self, outcome, nbytes: int = 0):
+        metrics = self._current
+        if metrics is None:
+            return
+        with self._lock:
+            metrics.requests[str(outcome)] += 1
+            metrics.bytes += nbytes
+
+    def summary(self, key: str, documents: int) -> Dict:
+        """Fields to merge into the council's council_stats entry, given its document count."""
+        with self._lock:
+            metrics = self.councils.setdefault(key, CouncilMetrics())
+            metrics.documents = documents
+            return metrics.summary()
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _council_labels(stat: Dict) -> str:
+    # Registry rows can share a name (BRIM and BRIM-DP), so the id keeps series distinct
+    name = stat.get('name') or stat.get('id') or ''
+    return f'council="{_label(name)}",id="{_label(stat.get("id") or name)}"'
+
+
+def prometheus_text(council_stats: List[Dict], prefix: str = 'councilbot_scrape') -> str:
+    """council_stats entries (with summary() fields) in Prometheus text exposition format."""
+    rows = [(_council_labels(s), s) for s in council_stats if 'phases' in s]
+    out = []
+
+    def family(name, kind, help_text, samples):
+        out.append(f"# HELP {prefix}_{name} {help_text}")
+        out.append(f"# TYPE {prefix}_{name} {kind}")
+        out.extend(f"{prefix}_{name}{{{labels}}} {value}" for labels, value in samples)
+
+    family('wall_seconds', 'gauge', 'Wall time spent scraping the council.',
+           [(labels, s.get('scrape_time', 0)) for labels, s in rows])
+    family('phase_seconds', 'gauge', 'Self time per phase, summed over threads.',
+           [(f'{labels},phase="{p}"', v) for labels, s in rows for p, v in sorted(s['phases'].items())])
+    family('requests_total', 'counter', 'HTTP requests by outcome.',
+           [(f'{labels},outcome="{o}"', c) for labels, s in rows for o, c in sorted(s.get('requests', {}).items())])
+    family('response_bytes_total', 'counter', 'Response body bytes received.',
+           [(labels, s.get('bytes', 0)) for labels, s in rows])
+    family('documents', 'gauge', 'Documents found.',
+           [(labels, s.get('total', 0)) for labels, s in rows])
+    family('circuit_open', 'gauge', 'Whether the council circuit breaker is open (fallbacks skipped).',
+           [(labels, int(s['circuit'].get('state') == 'open')) for labels, s in rows if 'circuit' in s])
+    return '\n'.join(out) + '\n'
+
+
+def write_prometheus(path: str, council_stats: List[Dict]):
+    """Write prometheus_text() to `path` (write-then-rename, for textfile collectors)."""
+    with atomic_write(path) as f:
+        f.write(prometheus_text(council_stats))
+
+
+_instruments: Optional[Instruments] = None
+_instruments_lock = threading.Lock()
+
+
+def get_instruments() -> Instruments:
+    """Process-wide instruments shared by the scrape loops, fetch layer and probes."""
+    global _instruments
+    with _instruments_lock:
+        if _instruments is None:
+            _instruments = Instruments()
+    return _instruments
+
+
+def timed(phase: str):
+    """Decorator charging a function's self time to `phase`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_instruments().phase(phase):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
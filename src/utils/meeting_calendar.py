@@ -0,0 +1,201 @@
+"""
+Council meeting calendar and scrape polling planner.
+
+Parses the verified meeting data (data/vic_all79_verified_2025.ics and
+data/vic_all79_verified_2025.csv) into a sorted per-council timeline, and
+plans when each council is worth scraping: agendas usually appear 5-7 days
+before a meeting and minutes 1-3 weeks after, so polling is dense in those
+windows, sparse otherwise, and a sparse wait never runs past the start of
+the next window.
+
+Calendar and registry names differ in form ("Monash City Council" vs
+"City of Monash"), so lookups go through council_key(), which drops the
+generic words.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import io
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+MEETINGS_ICS = 'data/vic_all79_verified_2025.ics'
+MEETINGS_CSV = 'data/vic_all79_verified_2025.csv'
+
+# Polling windows relative to each meeting: (start offset, end offset, interval)
+POLL_WINDOWS: List[Tuple[timedelta, timedelta, timedelta]] = [
+    (timedelta(days=-7), timedelta(days=-5), timedelta(hours=2)),   # agenda expected
+    (timedelta(days=-5), timedelta(0), timedelta(hours=6)),         # late/supplementary agenda
+    (timedelta(days=1), timedelta(days=7), timedelta(hours=12)),    # early unconfirmed minutes
+    (timedelta(days=7), timedelta(days=21), timedelta(hours=4)),    # minutes expected
+]
+INTENSIVE_INTERVAL = min(w[2] for w in POLL_WINDOWS)
+SPARSE_INTERVAL = timedelta(hours=24)
+UNKNOWN_INTERVAL = timedelta(hours=6)   # councils with no calendar entry
+
+_EARLIEST = min(w[0] for w in POLL_WINDOWS)
+_LATEST = max(w[1] for w in POLL_WINDOWS)
+
+
+_GENERIC_WORDS = {'city', 'of', 'council', 'shire', 'borough', 'rural', 'the', 'meeting'}
+
+
+def council_key(name: str) -> str:
+    """Normalise a council name: 'City of Monash' and 'Monash City Council' -> 'monash'."""
+    return ''.join(w for w in re.findall(r'[a-z0-9]+', (name or '').lower()) if w not in _GENERIC_WORDS)
+
+
+def _unfold(text: str) -> List[str]:
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    lines: List[str] = []
+    for raw in text.splitlines():
+        if raw[:1] in (' ', '\t') and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+    return lines
+
+
+def _parse_ics_datetime(value: str) -> Optional[datetime]:
+    """Parse a DTSTART value as naive local time (TZID is ignored)."""
+    value = value.rstrip('Z')
+    for fmt in ('%Y%m%dT%H%M%S', '%Y%m%dT%H%M', '%Y%m%d'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_ics(text: str) -> Dict[str, List[datetime]]:
+    """Return {council name: sorted meeting start times} from ICS text.
+
+    Names are the event SUMMARY without the trailing " Meeting".
+    """
+    meetings: Dict[str, List[datetime]] = {}
+    event: Optional[Dict[str, str]] = None
+    for line in _unfold(text):
+        if line == 'BEGIN:VEVENT':
+            event = {}
+        elif line == 'END:VEVENT':
+            if event is not None:
+                name = event.get('SUMMARY', '').strip()
+                if name.endswith(' Meeting'):
+                    name = name[:-len(' Meeting')]
+                start = _parse_ics_datetime(event.get('DTSTART', ''))
+                if name and start:
+                    meetings.setdefault(name, []).append(start)
+            event = None
+        elif event is not None and ':' in line:
+            key, value = line.split(':', 1)
+            # Drop parameters such as DTSTART;TZID=Australia/Melbourne
+            event[key.split(';', 1)[0].upper()] = value
+    for starts in meetings.values():
+        starts.sort()
+    return meetings
+
+
+def parse_csv(text: str) -> Dict[str, List[datetime]]:
+    """Return {council name: sorted meeting start times} from the verified CSV.
+
+    Expects `council`, `meeting_date` (YYYY-MM-DD) and optional `start_time`
+    (HH:MM) columns; rows that do not parse are skipped.
+    """
+    meetings: Dict[str, List[datetime]] = {}
+    for row in csv.DictReader(io.StringIO(text)):
+        name = (row.get('council') or '').strip()
+        day = (row.get('meeting_date') or '').strip()
+        start = (row.get('start_time') or '').strip() or '00:00'
+        try:
+            when = datetime.strptime(f"{day} {start}", '%Y-%m-%d %H:%M')
+        except ValueError:
+            continue
+        if name:
+            meetings.setdefault(name, []).append(when)
+    for starts in meetings.values():
+        starts.sort()
+    return meetings
+
+
+class MeetingCalendar:
+    """Per-council meeting timeline with a polling planner on top."""
+
+    def __init__(self, meetings: Optional[Dict[str, List[datetime]]] = None):
+        self.meetings: Dict[str, List[datetime]] = {}
+        self._by_key: Dict[str, List[datetime]] = {}
+        self.add(meetings or {})
+
+    def add(self, meetings: Dict[str, List[datetime]]):
+        """Merge more meetings in; duplicates across sources are dropped."""
+        for name, starts in meetings.items():
+            self.meetings[name] = sorted(set(self.meetings.get(name, [])) | set(starts))
+            key = council_key(name)
+            self._by_key[key] = sorted(set(self._by_key.get(key, [])) | set(starts))
+
+    @classmethod
+    def from_ics(cls, path: str = MEETINGS_ICS) -> 'MeetingCalendar':
+        """Load a calendar file; a missing file gives an empty calendar."""
+        return cls.from_files(ics_path=path, csv_path=None)
+
+    @classmethod
+    def from_files(cls, ics_path: Optional[str] = MEETINGS_ICS,
+                   csv_path: Optional[str] = MEETINGS_CSV) -> 'MeetingCalendar':
+        """Load and merge the ICS and CSV meeting data; missing files are skipped."""
+        calendar = cls()
+        for path, parse in ((ics_path, parse_ics), (csv_path, parse_csv)):
+            if path and os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    calendar.add(parse(f.read()))
+        return calendar
+
+    def meetings_for(self, council_name: str) -> List[datetime]:
+        return self._by_key.get(council_key(council_name), [])
+
+    def _nearby(self, council_name: str, start: datetime, end: datetime) -> List[datetime]:
+        """Meetings m with start <= m <= end (bisect on the sorted timeline)."""
+        starts = self.meetings_for(council_name)
+        return starts[bisect.bisect_left(starts, start):bisect.bisect_right(starts, end)]
+
+    def poll_interval(self, council_name: str, now: datetime) -> timedelta:
+        """Polling interval in effect at `now` (the densest matching window)."""
+        if not self.meetings_for(council_name):
+            return UNKNOWN_INTERVAL
+        interval = SPARSE_INTERVAL
+        for meeting in self._nearby(council_name, now - _LATEST, now - _EARLIEST):
+            for lo, hi, step in POLL_WINDOWS:
+                if meeting + lo <= now < meeting + hi:
+                    interval = min(interval, step)
+        return interval
+
+    def next_poll(self, council_name: str, last_polled: datetime) -> datetime:
+        """When to scrape this council next, given when it was last scraped.
+
+        Normally last_polled + the current interval, but never later than the
+        start of the next polling window, so a council idling on the sparse
+        interval is picked up as soon as its agenda window opens.
+        """
+        due = last_polled + self.poll_interval(council_name, last_polled)
+        for meeting in self._nearby(council_name, last_polled - _LATEST, due - _EARLIEST):
+            for lo, _, _ in POLL_WINDOWS:
+                if last_polled < meeting + lo < due:
+                    due = meeting + lo
+        return due
+
+    def plan(self, councils: Iterable[Dict], now: datetime,
+             last_polled: Optional[Dict[str, datetime]] = None) -> List[Tuple[datetime, Dict]]:
+        """Next poll time for each registry council, soonest first.
+
+        Councils never polled (absent from last_polled) are due now.
+        """
+        last_polled = last_polled or {}
+        planned = []
+        for council in councils:
+            last = last_polled.get(council.get('id'))
+            planned.append((self.next_poll(council.get('name', ''), last) if last else now, council))
+        planned.sort(key=lambda p: p[0])
+        return planned
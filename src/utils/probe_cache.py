@@ -0,0 +1,161 @@
+"""
+Persistent cache of probe outcomes across runs.
+
+Most guessed document URLs 404, and a URL for a meeting weeks in the past
+almost never starts working later, so re-probing yesterday's misses is
+wasted traffic. ProbeCache remembers outcomes on disk with a TTL chosen
+from the meeting date found in the URL:
+
+- miss, meeting more than PROBE_PAST_AFTER_DAYS ago: PROBE_MISS_TTL_PAST_DAYS
+- miss, meeting recent or upcoming: PROBE_MISS_TTL_NEAR_HOURS (documents
+  for these dates are still being published)
+- miss, no date in the URL: PROBE_MISS_TTL_UNKNOWN_HOURS
+- hit: PROBE_HIT_TTL_DAYS
+
+Outcomes are keyed by the probe mode as well as the URL, since a lenient
+probe (a .pdf suffix is enough) can pass where a strict one (PDF
+Content-Type required) fails. InfoCouncil's RedirectToDoc.aspx answers 200
+with an HTML page for documents that don't exist, so a redirector hit is
+only stored when the probe checked the Content-Type.
+
+Inconclusive probes (network errors, 429, 5xx) are never stored. The file
+maps a 16-hex-digit hash of mode and URL to [ok, expiry epoch seconds],
+which keeps it compact and lookups O(1); files written by an older
+CACHE_VERSION are ignored. ProbeMemo consults it behind its per-run memo.
+save() merges this run's outcomes into the file under its lock, so
+processes scraping different shards at once all keep their entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from src.utils.state_files import atomic_write, locked, read_json
+
+
+PROBE_CACHE_FILE = os.environ.get('PROBE_CACHE_FILE', 'probe_cache.json')
+PROBE_HIT_TTL_DAYS = float(os.environ.get('PROBE_HIT_TTL_DAYS', '30'))
+PROBE_MISS_TTL_PAST_DAYS = float(os.environ.get('PROBE_MISS_TTL_PAST_DAYS', '30'))
+PROBE_MISS_TTL_NEAR_HOURS = float(os.environ.get('PROBE_MISS_TTL_NEAR_HOURS', '6'))
+PROBE_MISS_TTL_UNKNOWN_HOURS = float(os.environ.get('PROBE_MISS_TTL_UNKNOWN_HOURS', '24'))
+PROBE_PAST_AFTER_DAYS = float(os.environ.get('PROBE_PAST_AFTER_DAYS', '14'))
+
+# Version 1 keyed by URL alone and could hold lenient redirector hits
+CACHE_VERSION = 2
+
+PROBE_ANY = 'any'            # any 200/206
+PROBE_PDF = 'pdf'            # 200/206 with a PDF Content-Type or a .pdf URL
+PROBE_PDF_TYPE = 'pdf-type'  # 200/206 with a PDF Content-Type
+
+_MONTHS = {m: i for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
+# (pattern, group order) for dates embedded in council document URLs
+_DATE_PATTERNS = [
+    (re.compile(r'_(\d{2})(\d{2})(\d{4})_'), ('d', 'm', 'y')),                # InfoCouncil ORD_09092025_AGN
+    (re.compile(r'(?<!\d)(\d{4})(\d{2})(\d{2})[-_]'), ('y', 'm', 'd')),       # 20250909-council-agenda
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), ('y', 'm', 'd')),                # ISO
+    (re.compile(r'(?<!\d)(\d{1,2})-([a-z]{3})[a-z]*-(\d{4})', re.I), ('d', 'm', 'y')),  # 09-september-2025
+]
+
+
+def url_date(url: str) -> Optional[datetime]:
+    """The meeting date embedded in a document URL, if one can be found."""
+    for pattern, order in _DATE_PATTERNS:
+        for match in pattern.finditer(url):
+            parts = dict(zip(order, match.groups()))
+            month = parts['m']
+            month = _MONTHS.get(month[:3].lower()) if not month.isdigit() else int(month)
+            try:
+                return datetime(int(parts['y']), month or 0, int(parts['d']))
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+def is_redirector(url: str) -> bool:
+    """True for InfoCouncil's RedirectToDoc.aspx?URL=... spelling of a document."""
+    return 'redirecttodoc.aspx' in url.lower()
+
+
+def _key(url: str, mode: str) -> str:
+    return hashlib.md5(f"{mode} {url}".encode()).hexdigest()[:16]
+
+
+class ProbeCache:
+    """On-disk probe outcomes with date-aware expiry."""
+
+    def __init__(self, path: Optional[str] = PROBE_CACHE_FILE,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._entries: Dict[str, List] = {}
+        self._changed: Dict[str, List] = {}  # put() since the last save
+        self._lock = threading.Lock()
+        self.load()
+
+    def _read(self) -> Dict[str, List]:
+        data = read_json(self.path) or {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        now = self.clock()
+        return {k: v for k, v in data.get('entries', {}).items() if v[1] > now}
+
+    def load(self):
+        if not self.path:
+            return
+        entries = self._read()
+        with self._lock:
+            self._entries = entries
+
+    def ttl(self, url: str, ok: bool) -> float:
+        """Seconds to keep this outcome."""
+        if ok:
+            return PROBE_HIT_TTL_DAYS * 86400
+        when = url_date(url)
+        if when is None:
+            return PROBE_MISS_TTL_UNKNOWN_HOURS * 3600
+        now = datetime.fromtimestamp(self.clock())
+        if when < now - timedelta(days=PROBE_PAST_AFTER_DAYS):
+            return PROBE_MISS_TTL_PAST_DAYS * 86400
+        return PROBE_MISS_TTL_NEAR_HOURS * 3600
+
+    def get(self, url: str, mode: str = PROBE_PDF) -> Optional[bool]:
+        """The stored outcome of a `mode` probe, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(_key(url, mode))
+        if entry is None or entry[1] <= self.clock():
+            return None
+        return bool(entry[0])
+
+    def put(self, url: str, ok: bool, mode: str = PROBE_PDF):
+        """Remember a `mode` probe's outcome (redirector hits only if the Content-Type was checked)."""
+        if ok and is_redirector(url) and mode != PROBE_PDF_TYPE:
+            return
+        key = _key(url, mode)
+        expires = int(self.clock() + self.ttl(url, ok))
+        with self._lock:
+            self._entries[key] = self._changed[key] = [1 if ok else 0, expires]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self):
+        """Merge this run's outcomes into the file (locked, write-then-rename) if any changed."""
+        if not self.path or not self._changed:
+            return
+        with locked(self.path):
+            entries = self._read()
+            now = self.clock()
+            with self._lock:
+                entries.update((k, v) for k, v in self._changed.items() if v[1] > now)
+                self._changed.clear()
+            with atomic_write(self.path) as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f, separators=(',', ':'))
@@ -0,0 +1,240 @@
+"""
+Declarative URL-template probing.
+
+Many councils publish PDFs at predictable URLs, so scrapers guess them:
+for each likely meeting date, fill in a few URL templates and probe each
+one. A council now declares that as a ProbeSpec:
+
+- templates: UrlTemplate(document_type, urls, grid) where `urls` are
+  alternative spellings of the same document (tried in order, first hit
+  wins) and `grid` expands placeholders such as {prefix}/{suffix} into
+  separate candidates;
+- dates: any iterable of dates, usually weekly() or nth_weekdays();
+- max_hits: stop once this many documents are found.
+
+ProbeEngine expands candidates lazily in date order (newest first), probes
+them on a thread pool with at most PROBE_PER_HOST in flight per host (the
+shared host scheduler still paces every request), memoises outcomes in the
+per-run probe memo (under the engine's `mode`, which must describe what
+its check tests; see probe_mode()) and stops submitting once max_hits is
+reached. The
+ProbeReport says how many requests were spent per document found.
+While the council being scraped has an open circuit (see
+src/utils/circuit_breaker.py), run() skips probing and returns an empty
+report.
+
+Templates are str.format strings over the spec's context (e.g. {base}) and
+the date fields from date_fields().
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.circuit_breaker import CircuitBreaker, get_breaker
+from src.utils.http_politeness import host_of
+from src.utils.instrumentation import timed
+from src.utils.probe_memo import PROBE_PDF, ProbeMemo, get_probe_memo, infocouncil_variants
+
+
+logger = logging.getLogger(__name__)
+
+PROBE_WORKERS = int(os.environ.get('PROBE_WORKERS', '8'))
+PROBE_PER_HOST = int(os.environ.get('PROBE_PER_HOST', '4'))
+
+
+def date_fields(d: date) -> Dict[str, str]:
+    """Placeholders available to every template for one candidate date."""
+    return {
+        'yyyy': d.strftime('%Y'),
+        'mm': d.strftime('%m'),
+        'dd': d.strftime('%d'),
+        'month': d.strftime('%B').lower(),
+        'mon': d.strftime('%b').lower(),
+        'ddmmyyyy': d.strftime('%d%m%Y'),
+        'yyyymmdd': d.strftime('%Y%m%d'),
+        'iso': d.strftime('%Y-%m-%d'),
+    }
+
+
+def _today(now: Optional[datetime]) -> date:
+    return (now or datetime.now()).date()
+
+
+def weekly(weekdays: Sequence[int], weeks: int, now: Optional[datetime] = None) -> Iterator[date]:
+    """The latest of each weekday (Mon=0) on or before each of the last `weeks` weeks.
+
+    Newest week first; within a week, weekdays in the order given (most
+    likely meeting day first). Never yields a date after today.
+    """
+    today = _today(now)
+    seen = set()
+    for weeks_back in range(weeks):
+        anchor = today - timedelta(weeks=weeks_back)
+        for weekday in weekdays:
+            d = anchor - timedelta(days=(anchor.weekday() - weekday) % 7)
+            if d not in seen:
+                seen.add(d)
+                yield d
+
+
+def nth_weekdays(weekday: int, nths: Sequence[int], months: int,
+                 now: Optional[datetime] = None) -> Iterator[date]:
+    """e.g. nth_weekdays(1, (2, 4), 6): the 2nd and 4th Tuesday of the last 6 months, newest first."""
+    today = _today(now)
+    year, month = today.year, today.month
+    for _ in range(months):
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        for n in sorted(nths, reverse=True):
+            d = first + timedelta(days=offset + 7 * (n - 1))
+            if d.month == month and d <= today:
+                yield d
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+
+@dataclass
+class UrlTemplate:
+    """One kind of document: alternative URL spellings, optionally expanded over a grid."""
+    document_type: str
+    urls: Sequence[str]
+    grid: Dict[str, Sequence[str]] = field(default_factory=dict)
+
+    def expand(self, fields: Dict[str, str]) -> Iterator[List[str]]:
+        """Alternative URL lists, one per grid combination."""
+        keys = list(self.grid)
+        for values in itertools.product(*(self.grid[k] for k in keys)):
+            combo = {**fields, **dict(zip(keys, values))}
+            yield [url.format(**combo) for url in self.urls]
+
+
+def infocouncil_template(document_type: str, filename: str, **grid: Sequence[str]) -> UrlTemplate:
+    """An InfoCouncil document under Open/YYYY/MM/, direct link first, then the redirector."""
+    return UrlTemplate(document_type, infocouncil_variants('{base}', 'Open/{yyyy}/{mm}/' + filename), grid)
+
+
+@dataclass
+class ProbeSpec:
+    templates: List[UrlTemplate]
+    dates: Iterable[date]
+    max_hits: Optional[int] = None
+    context: Dict[str, str] = field(default_factory=dict)
+    name: str = ''
+
+
+@dataclass
+class ProbeHit:
+    url: str
+    date: date
+    document_type: str
+
+    @property
+    def iso(self) -> str:
+        return self.date.strftime('%Y-%m-%d')
+
+
+@dataclass
+class ProbeReport:
+    hits: List[ProbeHit] = field(default_factory=list)
+    candidates: int = 0
+    requests: int = 0
+    stopped_early: bool = False
+    skipped: bool = False
+
+    @property
+    def requests_per_document(self) -> Optional[float]:
+        return round(self.requests / len(self.hits), 1) if self.hits else None
+
+    def summary(self) -> Dict:
+        return {'candidates': self.candidates, 'requests': self.requests, 'found': len(self.hits),
+                'requests_per_document': self.requests_per_document,
+                'stopped_early': self.stopped_early, 'skipped': self.skipped}
+
+
+class ProbeEngine:
+    """Runs ProbeSpecs concurrently with a URL check such as range_probe."""
+
+    def __init__(self, check: Callable[[str], bool],
+                 max_workers: int = PROBE_WORKERS,
+                 per_host: int = PROBE_PER_HOST,
+                 memo: Optional[ProbeMemo] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 mode: str = PROBE_PDF):
+        self.check = check
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.memo = memo or get_probe_memo()
+        self.breaker = breaker or get_breaker()
+        self._hosts: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def expand(self, spec: ProbeSpec) -> Iterator[Tuple[date, str, List[str]]]:
+        """(date, document type, alternative URLs) for every candidate, lazily."""
+        for d in spec.dates:
+            fields = {**spec.context, **date_fields(d)}
+            for template in spec.templates:
+                for urls in template.expand(fields):
+                    yield d, template.document_type, urls
+
+    def _checked(self, url: str) -> bool:
+        host = host_of(url)
+        with self._lock:
+            slots = self._hosts.setdefault(host, threading.Semaphore(self.per_host))
+            self._requests += 1
+        with slots:
+            return self.check(url)
+
+    def _probe(self, candidate: Tuple[date, str, List[str]]) -> Optional[ProbeHit]:
+        d, document_type, urls = candidate
+        url = self.memo.resolve(urls, self._checked, self.mode)
+        return ProbeHit(url, d, document_type) if url else None
+
+    @timed('probe')
+    def run(self, spec: ProbeSpec) -> ProbeReport:
+        """Probe the spec's candidates; hits come back newest first."""
+        report = ProbeReport()
+        if not self.breaker.fallbacks_allowed():
+            report.skipped = True
+            logger.info(f"Probe {spec.name or 'spec'}: skipped, council circuit open")
+            return report
+        candidates = self.expand(spec)
+        start = self._requests
+
+        def enough() -> bool:
+            return bool(spec.max_hits) and len(report.hits) >= spec.max_hits
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = set()
+
+            def fill():
+                # Keep the pool busy without expanding far ahead of the hits
+                while len(pending) < self.max_workers * 2 and not enough():
+                    candidate = next(candidates, None)
+                    if candidate is None:
+                        return
+                    report.candidates += 1
+                    pending.add(pool.submit(self._probe, candidate))
+
+            fill()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                report.hits.extend(hit for hit in (f.result() for f in done if not f.cancelled()) if hit)
+                if enough():
+                    report.stopped_early = True
+                    for f in pending:
+                        f.cancel()
+                fill()
+
+        report.requests = self._requests - start
+        report.hits.sort(key=lambda h: (h.date, h.url), reverse=True)
+        logger.info(f"Probe {spec.name or 'spec'}: {report.summary()}")
+        return report
@@ -0,0 +1,180 @@
+"""
+Per-run memo of document probe results.
+
+Scrapers probe candidate PDF URLs with a one-byte range GET, often for
+several spellings of the same document (InfoCouncil's /Open/... path and
+its RedirectToDoc.aspx?URL=Open/... redirector). This memo is shared by
+all scrapers in a process and remembers:
+
+- probe(url, check):       the result for an exact URL, and
+- resolve(variants, check): the first working variant for a document,
+  keyed by canonicalize_doc_url(), so callers get the final URL in one call
+  and never re-probe to pick between variants.
+
+Both are also keyed by the probe's mode (probe_mode(): whether a PDF is
+expected and whether only a PDF Content-Type counts), so a strict and a
+lenient answer for the same URL never overwrite each other. The
+RedirectToDoc.aspx redirector answers 200 with an HTML page for documents
+that don't exist, so redirector URLs are always probed strictly.
+
+Call reset_probe_memo() at the start of each scrape run so documents that
+appear later are not hidden by an earlier miss. Behind the per-run memo,
+the shared memo also consults the persistent ProbeCache (see
+src/utils/probe_cache.py), which expires entries by the document's date;
+call save_probe_memo() at the end of a run to write it.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.instrumentation import timed
+from src.utils.probe_cache import (PROBE_ANY, PROBE_CACHE_FILE, PROBE_PDF, PROBE_PDF_TYPE,
+                                   ProbeCache, is_redirector)
+from src.utils.url_canonicalize import canonicalize_doc_url
+
+
+def probe_mode(expect_pdf: bool = True, strict_type: bool = False) -> str:
+    """The memo mode for range_probe's expect_pdf/strict_type arguments."""
+    if not expect_pdf:
+        return PROBE_ANY
+    return PROBE_PDF_TYPE if strict_type else PROBE_PDF
+
+
+def effective_mode(url: str, mode: str) -> str:
+    """The mode a URL is really probed with: redirectors are always strict."""
+    return PROBE_PDF_TYPE if mode == PROBE_PDF and is_redirector(url) else mode
+
+
+@timed('probe')
+def range_probe(session, url: str, headers: Optional[Dict] = None,
+                expect_pdf: bool = True, strict_type: bool = False, timeout: float = 8) -> Optional[bool]:
+    """One-byte range GET; True if the URL answers 200/206 (and looks like a PDF).
+
+    With strict_type, only a PDF Content-Type counts, not a .pdf URL suffix;
+    redirector URLs are always checked that way. Returns None (falsy, but
+    not cached across runs) when the answer is inconclusive: a network
+    error, 429 or 5xx.
+    """
+    try:
+        resp = session.get(url, headers={**(headers or {}), 'Range': 'bytes=0-0'},
+                           timeout=timeout, allow_redirects=True)
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return None
+        ok = resp.status_code in (200, 206)
+        if expect_pdf:
+            ctype = resp.headers.get('Content-Type', '').lower()
+            if strict_type or is_redirector(url):
+                return ok and 'pdf' in ctype
+            return ok and ('pdf' in ctype or url.lower().endswith('.pdf'))
+        return ok
+    except Exception:
+        return None
+
+
+def infocouncil_variants(base: str, path: str) -> List[str]:
+    """Direct and redirector URLs for an InfoCouncil path like 'Open/2025/09/ORD_..PDF'."""
+    path = path.lstrip('/')
+    return [f"{base}/{path}", f"{base}/RedirectToDoc.aspx?URL={path}"]
+
+
+class ProbeMemo:
+    """Thread-safe memo of probe outcomes for one scrape run.
+
+    With a ProbeCache as `store`, outcomes from earlier runs with the same
+    mode are reused until they expire, and conclusive new outcomes
+    (check() returning True/False, not None) are added to it.
+    """
+
+    def __init__(self, store: Optional[ProbeCache] = None):
+        self.store = store
+        self._urls: Dict[Tuple[str, str], bool] = {}
+        self._resolved: Dict[Tuple[str, str], Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.probes = 0
+        self.cached = 0
+
+    def probe(self, url: str, check: Callable[[str], Optional[bool]], mode: str = PROBE_PDF) -> bool:
+        """Return check(url), calling it at most once per URL and mode per run.
+
+        `mode` says what check() tests (see probe_mode()); use the same mode
+        for every check with the same semantics.
+        """
+        mode = effective_mode(url, mode)
+        key = (mode, url)
+        with self._lock:
+            if key in self._urls:
+                self.hits += 1
+                return self._urls[key]
+        stored = self.store.get(url, mode) if self.store is not None else None
+        if stored is not None:
+            with self._lock:
+                self.cached += 1
+                self._urls[key] = stored
+            return stored
+        result = check(url)
+        if result is not None and self.store is not None:
+            self.store.put(url, bool(result), mode)
+        ok = bool(result)
+        with self._lock:
+            self.probes += 1
+            self._urls[key] = ok
+        return ok
+
+    def resolve(self, variants: Sequence[str], check: Callable[[str], bool],
+                mode: str = PROBE_PDF) -> Optional[str]:
+        """Return the first variant that passes check, or None; memoised by canonical URL and mode."""
+        if not variants:
+            return None
+        key = (mode, canonicalize_doc_url(variants[0]))
+        with self._lock:
+            if key in self._resolved:
+                self.hits += 1
+                return self._resolved[key]
+        resolved = next((url for url in variants if self.probe(url, check, mode)), None)
+        with self._lock:
+            self._resolved[key] = resolved
+        return resolved
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'probes': self.probes, 'hits': self.hits, 'cached': self.cached,
+                    'urls': len(self._urls), 'documents': len(self._resolved)}
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+            self._resolved.clear()
+            self.hits = 0
+            self.probes = 0
+            self.cached = 0
+
+    def save(self):
+        """Persist the store, if any."""
+        if self.store is not None:
+            self.store.save()
+
+
+_memo: Optional[ProbeMemo] = None
+
+
+def get_probe_memo() -> ProbeMemo:
+    """The process-wide memo shared by every scraper (persistent unless PROBE_CACHE_FILE is empty)."""
+    global _memo
+    if _memo is None:
+        path = os.environ.get('PROBE_CACHE_FILE', PROBE_CACHE_FILE)
+        _memo = ProbeMemo(ProbeCache(path) if path else None)
+    return _memo
+
+
+def reset_probe_memo():
+    """Start a new run: forget this run's probe results (the persistent cache is kept)."""
+    get_probe_memo().clear()
+
+
+def save_probe_memo():
+    """End of a run: write the persistent probe cache."""
+    get_probe_memo().save()
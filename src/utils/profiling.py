@@ -0,0 +1,216 @@
+"""
+Opt-in profiling of scrape and post runs.
+
+With --profile on the scrape and scheduler entry points, each council
+scrape and each post preparation runs under cProfile. Every unit writes a
+profile file to the profile directory, and at the end of the run a merged
+summary.txt lists units by wall time and the hottest functions across
+them:
+
+  profiles/scrape-maribyrnong.prof
+  profiles/post-yarra-2.prof
+  profiles/summary.txt
+
+Open one unit with `python -m pstats profiles/scrape-yarra.prof`, or with
+snakeviz. --profile-council ID (repeatable) profiles only the councils
+whose id or name matches; matching ignores case and punctuation, so
+"moonee-valley" finds "Moonee Valley". With --profile-memory, tracemalloc
+snapshots are taken around each unit, and the summary shows each unit's
+net memory growth and the lines that allocated it.
+
+cProfile only follows the thread that runs the unit. A council's range
+probes run on worker threads, so from its own thread they look like lock
+waits; the fetch and probe phases in council_stats cover that time.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.utils.state_files import atomic_write
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = 'profiles'
+PROFILE_TOP = 30
+
+
+def _norm(value) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(value or '').lower())
+
+
+def _slug(value) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', str(value or '').lower()).strip('-') or 'unit'
+
+
+class Profiler:
+    """Per-unit cProfile runs with a merged summary; disabled without out_dir."""
+
+    def __init__(self, out_dir: Optional[str] = None, councils: Iterable[str] = (),
+                 memory: bool = False, top: int = PROFILE_TOP):
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.councils = {_norm(c) for c in councils if _norm(c)}
+        self.memory = memory
+        self.top = top
+        self.units: List[Dict] = []
+        self._active = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.out_dir is not None
+
+    def wants(self, *keys) -> bool:
+        """Whether a unit identified by any of `keys` (id, name, ...) is profiled."""
+        if not self.enabled:
+            return False
+        return not self.councils or any(_norm(k) in self.councils for k in keys)
+
+    def _path(self, stage: str, name: str) -> Path:
+        base = f"{stage}-{_slug(name)}"
+        path = self.out_dir / f"{base}.prof"
+        n = 1
+        while path.exists() or any(u['file'] == str(path) for u in self.units):
+            n += 1
+            path = self.out_dir / f"{base}-{n}.prof"
+        return path
+
+    @contextmanager
+    def unit(self, stage: str, name: str, *keys) -> Iterator[None]:
+        """Profile the block as one unit of `stage` ('scrape' or 'post') named `name`."""
+        with self._lock:
+            run = self.wants(name, *keys) and not self._active
+            if run:
+                self._active = True
+        if not run:
+            yield
+            return
+        profile = cProfile.Profile()
+        before = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError as e:  # another profiler is already running
+            logger.warning(f"Not profiling {name}: {e}")
+            profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - start
+            try:
+                self._finish(stage, name, profile, wall, before)
+            finally:
+                with self._lock:
+                    self._active = False
+
+    def _finish(self, stage, name, profile, wall, before):
+        unit = {'stage': stage, 'name': name, 'wall': wall, 'file': ''}
+        # Snapshot before dumping, so the profile's own data isn't counted
+        if before is not None:
+            after = tracemalloc.take_snapshot()
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+            unit['memory_growth'] = sum(d.size_diff for d in diffs)
+            unit['memory_peak'] = tracemalloc.get_traced_memory()[1]
+            unit['memory_top'] = [(str(d.traceback[0]), d.size_diff) for d in diffs[:5] if d.size_diff]
+        if profile is not None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(stage, name)
+            profile.dump_stats(str(path))
+            unit['file'] = str(path)
+        self.units.append(unit)
+
+    def summary_text(self) -> str:
+        """Units by wall time, then the merged hot functions."""
+        out = io.StringIO()
+        out.write(f"{'stage':8} {'unit':32} {'wall s':>8}")
+        out.write(f" {'mem +KB':>9} {'peak MB':>8}\n" if self.memory else '\n')
+        for unit in sorted(self.units, key=lambda u: u['wall'], reverse=True):
+            out.write(f"{unit['stage']:8} {unit['name'][:32]:32} {unit['wall']:8.2f}")
+            if 'memory_growth' in unit:
+                out.write(f" {unit['memory_growth'] / 1024:9.1f} {unit['memory_peak'] / 1e6:8.1f}")
+            out.write('\n')
+        for stage in sorted({u['stage'] for u in self.units}):
+            units = [u for u in self.units if u['stage'] == stage]
+            out.write(f"{stage}: {len(units)} units, {sum(u['wall'] for u in units):.2f}s")
+            if self.memory:
+                out.write(f", {sum(u.get('memory_growth', 0) for u in units) / 1024:.1f} KB retained")
+            out.write('\n')
+
+        if self.memory:
+            out.write('\nMemory growth by unit (top allocating lines)\n')
+            for unit in self.units:
+                if unit.get('memory_top'):
+                    out.write(f"  {unit['stage']} {unit['name']}\n")
+                    for where, size in unit['memory_top']:
+                        out.write(f"    {size / 1024:+9.1f} KB  {where}\n")
+
+        files = [u['file'] for u in self.units if u['file']]
+        if files:
+            stats = pstats.Stats(*files, stream=out)
+            stats.strip_dirs()
+            stats.files = []  # one header line per unit file otherwise
+            for key, title in (('tottime', 'self time'), ('cumulative', 'cumulative time')):
+                out.write(f"\nHot functions across {len(files)} units, by {title}\n")
+                stats.sort_stats(key).print_stats(self.top)
+        return out.getvalue()
+
+    def write_summary(self) -> Optional[Path]:
+        """Write summary.txt to the profile directory; returns its path."""
+        if not self.enabled or not self.units:
+            return None
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / 'summary.txt'
+        with atomic_write(path) as f:
+            f.write(self.summary_text())
+        logger.info(f"Profiled {len(self.units)} units; summary in {path}")
+        return path
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """The process-wide profiler (disabled unless start_profiler() was called)."""
+    return _profiler
+
+
+def start_profiler(out_dir: str = PROFILE_DIR, councils: Iterable[str] = (), memory: bool = False) -> Profiler:
+    """Profile every following unit in this process into `out_dir`."""
+    global _profiler
+    _profiler = Profiler(out_dir, councils, memory)
+    return _profiler
+
+
+def add_profile_args(parser):
+    """The --profile options shared by the scrape and scheduler entry points."""
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR',
+                        help=f'Profile each council scrape / post into DIR (default: {PROFILE_DIR})')
+    parser.add_argument('--profile-council', action='append', default=[], metavar='ID',
+                        help='Only profile this council id or name (repeatable; implies --profile)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Also take tracemalloc snapshots around each profiled unit')
+
+
+def start_profiler_from_args(args) -> Optional[Profiler]:
+    """start_profiler() if any --profile option was given."""
+    if not (args.profile or args.profile_council or args.profile_memory):
+        return None
+    return start_profiler(args.profile or PROFILE_DIR, args.profile_council, args.profile_memory)
@@ -0,0 +1,118 @@
+"""
+Registry sharding and results merging.
+
+A full scrape can be split across cron runners or processes with
+--shard i/N (1 <= i <= N). Councils are assigned to shards by a CRC32 of
+their id, so the split is the same on every machine and Python version and
+does not change when councils are added or reordered. Each shard writes its
+own partial results file (see shard_path()) and merge_results() combines
+them into the usual results format, keeping one copy of each document
+(see src.utils.dedup).
+"""
+
+from __future__ import annotations
+
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from src.utils.dedup import DocumentIndex
+
+T = TypeVar('T')
+
+# host_metrics fields that are counts and add up across shards
+_SUMMED_METRICS = ('requests', 'errors', 'throttled', 'deduplicated', 'waited', 'slowdowns')
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse 'i/N' into (i, N); raises ValueError unless 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Shard must look like i/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and N, got {value!r}")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """1-based shard for a council id."""
+    return zlib.crc32(str(key).encode('utf-8')) % count + 1
+
+
+def select_shard(items: Iterable[T], index: int, count: int, key: Callable[[T], str]) -> List[T]:
+    """The items belonging to shard index/count, in their original order."""
+    return [item for item in items if shard_of(key(item), count) == index]
+
+
+def shard_path(path: str, index: int, count: int) -> str:
+    """'results.json' -> 'results.shard-2-of-4.json'."""
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.shard-{index}-of-{count}{p.suffix}"))
+
+
+def _uncount(stat: Optional[Dict], doc: Dict):
+    """Move a document an earlier shard already had from a council's counts to `collapsed`."""
+    if stat is None:
+        return
+    field = {'agenda': 'agendas', 'minutes': 'minutes'}.get(doc.get('document_type'))
+    for name in ('total', field):
+        if name and stat.get(name):
+            stat[name] -= 1
+    stat['collapsed'] = stat.get('collapsed', 0) + 1
+
+
+def merge_results(parts: List[Dict]) -> Dict:
+    """Combine partial results files into one.
+
+    Council stats are keyed by id (or name); documents are deduplicated by
+    canonical URL and fingerprint, first shard wins, and a council's counts
+    lose the documents it loses. Per-host counters are summed.
+    """
+    stats: Dict[str, Dict] = {}
+    documents = DocumentIndex()
+    hosts: Dict[str, Dict] = {}
+    scrape_dates: List[str] = []
+    scrape_times: List[float] = []
+
+    for part in parts:
+        if part.get('scrape_date'):
+            scrape_dates.append(part['scrape_date'])
+        if part.get('total_scrape_time') is not None:
+            scrape_times.append(part['total_scrape_time'])
+        by_council: Dict[str, Dict] = {}
+        for stat in part.get('council_stats', []):
+            stat = dict(stat)
+            stats[stat.get('id') or stat.get('name')] = stat
+            by_council.update((k, stat) for k in (stat.get('id'), stat.get('name')) if k)
+        docs = part.get('documents', [])
+        kept = {id(doc) for doc in documents.keep(docs)}
+        for doc in docs:
+            if doc.get('url') and id(doc) not in kept:
+                _uncount(by_council.get(doc.get('council_id')) or by_council.get(doc.get('council_name')), doc)
+        for host, metrics in (part.get('host_metrics') or {}).items():
+            merged = hosts.get(host)
+            if merged is None:
+                hosts[host] = dict(metrics)
+                continue
+            for field in _SUMMED_METRICS:
+                if field in metrics:
+                    merged[field] = merged.get(field, 0) + metrics[field]
+
+    merged_stats = list(stats.values())
+    results = {
+        'scrape_date': max(scrape_dates) if scrape_dates else datetime.now().isoformat(),
+        'total_councils': len(merged_stats),
+        'working_councils': sum(1 for s in merged_stats if s.get('working')),
+        'total_documents': len(documents),
+        'shards': len(parts),
+        'council_stats': merged_stats,
+        'host_metrics': hosts,
+        'dedup': documents.stats(),
+        'documents': documents.documents,
+    }
+    if scrape_times:
+        # Shards run side by side, so the slowest one is the wall time
+        results['total_scrape_time'] = max(scrape_times)
+    return results
@@ -0,0 +1,367 @@
+"""
+Local stand-in for council websites, for offline benchmarks and tests.
+
+StandinServer is a threaded HTTP server on 127.0.0.1 that answers for
+every council host at once. Inside `with routed_to(server.base_url):`,
+all requests/cloudscraper traffic for https://<host>/<path> is sent to
+the server as /<host>/<path>. The swap happens in the transport adapter,
+so per-host politeness, sessions and probe memos see the real URLs.
+
+Responses come from a deterministic SiteModel:
+
+- each host meets on the 2nd and 4th of one weekday (fixed per host) from
+  `months_back` months ago to `months_ahead` ahead; every meeting has an
+  agenda, and meetings over a week old also have minutes;
+- a PDF URL exists if the meeting date in it (see probe_cache.url_date) is
+  one of the host's meetings and, for minutes, the minutes are out; on
+  InfoCouncil hosts the file name must also be the listed
+  ORD_DDMMYYYY_AGN/MIN.PDF. The body is a small fixed PDF, and Range
+  requests get a 206. The same goes
+  for RedirectToDoc.aspx?URL=<path>.pdf, which serves the PDF or a 404;
+- InfoCouncil month listings (/Open/YYYY/MM/ and RedirectToDoc.aspx)
+  list that month's ORD_DDMMYYYY_AGN/MIN.PDF files;
+- any other page is a listing table linking the host's documents;
+- files under `fixtures/<host>/<path>` (recorded pages, `index.html` for a
+  trailing slash) take precedence over all of the above.
+
+Latency (`latency` plus up to `jitter` seconds), error statuses
+(`error_rate`) and dropped connections (`drop_rate`) can be injected with
+a seeded RNG. `stats()` counts requests by status and host, plus bytes.
+"""
+
+from __future__ import annotations
+
+import calendar
+import mimetypes
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.utils.probe_cache import url_date
+
+MINUTES_AFTER_DAYS = 7
+
+
+def sample_pdf(lines: List[str]) -> bytes:
+    """A small valid one-page PDF with `lines` of text."""
+    def esc(s):
+        return s.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    text = 'BT /F1 11 Tf 14 TL 50 780 Td ' + ' '.join(f'({esc(line)}) \'' for line in lines) + ' ET'
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(text), text.encode('latin-1')),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (i, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % o for o in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+AGENDA_PDF = sample_pdf([
+    'ORDINARY COUNCIL MEETING AGENDA',
+    'TABLE OF CONTENTS',
+    '1. Apologies and leave of absence',
+    '2. Declarations of conflict of interest',
+    '3. Confirmation of minutes',
+    '8.1 Planning permit application - 12 Smith Street',
+    '8.2 Draft budget and rates strategy',
+    '8.3 Climate emergency action plan update',
+    '9. Notices of motion',
+    '10. Urgent business',
+])
+
+_INFOCOUNCIL_MONTH = re.compile(r'Open/(\d{4})/(\d{2})/?$')
+
+
+class SiteModel:
+    """Deterministic meetings and documents for any council host."""
+
+    def __init__(self, today: Optional[date] = None, months_back: int = 6, months_ahead: int = 1,
+                 fixtures: Optional[str] = None, page_kb: int = 40):
+        self.today = today or date.today()
+        self.months_back = months_back
+        self.months_ahead = months_ahead
+        self.fixtures = fixtures
+        self.page_kb = page_kb
+        self._meetings: Dict[str, List[date]] = {}
+        self._lock = threading.Lock()
+
+    def meetings(self, host: str) -> List[date]:
+        """The host's meeting dates, oldest first."""
+        with self._lock:
+            cached = self._meetings.get(host)
+            if cached is not None:
+                return cached
+        weekday = zlib.crc32(host.encode()) % 4  # Monday to Thursday
+        year, month = self.today.year, self.today.month - self.months_back
+        out = []
+        for _ in range(self.months_back + self.months_ahead + 1):
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+            days = [d for d in calendar.Calendar().itermonthdates(year, month)
+                    if d.month == month and d.weekday() == weekday]
+            out += [days[1], days[3]]
+            month += 1
+        with self._lock:
+            self._meetings[host] = out
+        return out
+
+    def has_minutes(self, when: date) -> bool:
+        return when <= self.today - timedelta(days=MINUTES_AFTER_DAYS)
+
+    def documents(self, host: str) -> List[Tuple[date, str]]:
+        """(meeting date, 'agenda' | 'minutes') for every published document."""
+        out = []
+        for when in self.meetings(host):
+            out.append((when, 'agenda'))
+            if self.has_minutes(when):
+                out.append((when, 'minutes'))
+        return out
+
+    def pdf_exists(self, host: str, path: str) -> bool:
+        when = url_date(path)
+        if when is None or when.date() not in self.meetings(host):
+            return False
+        minutes = 'min' in path.lower()
+        if minutes and not self.has_minutes(when.date()):
+            return False
+        if host.endswith('infocouncil.biz'):
+            # Only the file names the month listing links, not other guesses for the date
+            name = self.infocouncil_name(when.date(), 'minutes' if minutes else 'agenda')
+            return path.rsplit('/', 1)[-1].upper() == name
+        return True
+
+    @staticmethod
+    def infocouncil_name(when: date, kind: str) -> str:
+        return f"ORD_{when:%d%m%Y}_{'AGN' if kind == 'agenda' else 'MIN'}.PDF"
+
+    @staticmethod
+    def site_path(when: date, kind: str) -> str:
+        return f"/files/{when:%Y-%m}/{when:%Y%m%d}-council-meeting-{kind}.pdf"
+
+    def _page(self, title: str, body: str) -> str:
+        filler = ''.join(f"<p class='filler'>Council news item {i}: community services, "
+                         f"roads, parks and libraries information.</p>"
+                         for i in range(self.page_kb * 1024 // 100))
+        return (f"<html><head><title>{title}</title></head><body><nav><a href='/'>Home</a></nav>"
+                f"<h1>{title}</h1>{body}<footer>{filler}</footer></body></html>")
+
+    def infocouncil_listing(self, host: str, year: int, month: int) -> str:
+        links = ''.join(f"<a href=\"{self.infocouncil_name(when, kind)}\">{self.infocouncil_name(when, kind)}</a><br>"
+                        for when, kind in self.documents(host) if (when.year, when.month) == (year, month))
+        return f"<html><body><pre>{links}</pre></body></html>"
+
+    def listing(self, host: str) -> str:
+        rows = []
+        infocouncil = host.endswith('infocouncil.biz')
+        for when in sorted(self.meetings(host), reverse=True):
+            if when > self.today + timedelta(days=14):
+                continue
+            cells = []
+            for kind in ('agenda', 'minutes'):
+                if kind == 'minutes' and not self.has_minutes(when):
+                    continue
+                href = (f"/Open/{when:%Y/%m}/{self.infocouncil_name(when, kind)}" if infocouncil
+                        else self.site_path(when, kind))
+                cells.append(f"<td><a href=\"{href}\">Council Meeting {kind.title()} - "
+                             f"{when.day} {when:%B %Y}</a></td>")
+            rows.append(f"<tr><td>{when:%A} {when.day} {when:%B %Y} 6.30pm</td>{''.join(cells)}</tr>")
+        table = f"<table class='meetings'><tbody>{''.join(rows)}</tbody></table>"
+        return self._page('Council meeting agendas and minutes', table)
+
+    def fixture(self, host: str, path: str) -> Optional[str]:
+        if not self.fixtures:
+            return None
+        rel = path.lstrip('/')
+        if not rel or rel.endswith('/'):
+            rel += 'index.html'
+        full = os.path.normpath(os.path.join(self.fixtures, host, rel))
+        if not full.startswith(os.path.normpath(self.fixtures) + os.sep) or not os.path.isfile(full):
+            return None
+        return full
+
+    def respond(self, host: str, path: str, query: str) -> Tuple[int, str, bytes]:
+        """(status, content type, body) for one request."""
+        fixture = self.fixture(host, path)
+        if fixture:
+            with open(fixture, 'rb') as f:
+                body = f.read()
+            return 200, mimetypes.guess_type(fixture)[0] or 'text/html', body
+        if path.lower().endswith('/redirecttodoc.aspx'):
+            target = next((v for k, v in parse_qsl(query) if k.lower() == 'url'), '')
+            if target.lower().endswith('.pdf'):
+                path = '/' + target.lstrip('/')
+        if path.lower().endswith('.pdf'):
+            if self.pdf_exists(host, path):
+                return 200, 'application/pdf', AGENDA_PDF
+            return 404, 'text/html', self._page('Page not found', '').encode()
+        listing = _INFOCOUNCIL_MONTH.search(path) or _INFOCOUNCIL_MONTH.search(query.replace('URL=', ''))
+        if listing:
+            html = self.infocouncil_listing(host, int(listing.group(1)), int(listing.group(2)))
+            return 200, 'text/html', html.encode()
+        return 200, 'text/html', self.listing(host).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: '_Server'
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def _serve(self, head: bool):
+        standin = self.server.standin
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        standin.pause()
+        fault = standin.fault()
+        if fault == 'drop':
+            standin.count(host, 'dropped', 0)
+            self.close_connection = True
+            return
+        if fault:
+            status, ctype, body = fault, 'text/html', b'<html><body>Service unavailable</body></html>'
+        else:
+            status, ctype, body = standin.model.respond(host, '/' + path, parts.query)
+        headers = {'Content-Type': ctype, 'Accept-Ranges': 'bytes'}
+        match = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+        if status == 200 and match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(body) - 1), len(body) - 1)
+            headers['Content-Range'] = f"bytes {start}-{end}/{len(body)}"
+            status, body = 206, body[start:end + 1]
+        headers['Content-Length'] = str(len(body))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+        standin.count(host, status, 0 if head else len(body))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    standin: 'StandinServer'
+
+
+class StandinServer:
+    """The stand-in HTTP server; use as a context manager or start()/stop()."""
+
+    def __init__(self, model: Optional[SiteModel] = None, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, drop_rate: float = 0.0, seed: int = 0):
+        self.model = model or SiteModel()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._statuses: Counter = Counter()
+        self._hosts: Counter = Counter()
+        self._bytes = 0
+        self._server: Optional[_Server] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StandinServer':
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.standin = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'StandinServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def pause(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                extra = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+            time.sleep(self.latency + extra)
+
+    def fault(self):
+        """'drop', an error status, or None for a normal response."""
+        if not (self.error_rate or self.drop_rate):
+            return None
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.drop_rate:
+            return 'drop'
+        if roll < self.drop_rate + self.error_rate:
+            return self.error_status
+        return None
+
+    def count(self, host: str, status, nbytes: int):
+        with self._lock:
+            self._statuses[str(status)] += 1
+            self._hosts[host] += 1
+            self._bytes += nbytes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'requests': sum(self._statuses.values()), 'by_status': dict(self._statuses),
+                    'hosts': len(self._hosts), 'bytes': self._bytes}
+
+
+@contextmanager
+def routed_to(base_url: str) -> Iterator[None]:
+    """Send all requests-library traffic to the stand-in server at base_url."""
+    from requests.adapters import HTTPAdapter
+    target = urlsplit(base_url)
+    original = HTTPAdapter.send
+
+    def send(self, request, *args, **kwargs):
+        url = urlsplit(request.url)
+        if url.netloc == target.netloc or url.scheme not in ('http', 'https'):
+            return original(self, request, *args, **kwargs)
+        real = request.url
+        request.url = f"{base_url}/{url.hostname}{url.path or '/'}" + (f"?{url.query}" if url.query else '')
+        try:
+            response = original(self, request, *args, **kwargs)
+        finally:
+            request.url = real
+        response.url = real
+        return response
+
+    HTTPAdapter.send = send
+    try:
+        yield
+    finally:
+        HTTPAdapter.send = original
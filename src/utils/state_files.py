@@ -0,0 +1,79 @@
+"""
+Safe writes for the JSON state and results files.
+
+- atomic_write(path) writes to a unique temp file next to `path` and
+  renames it over `path` when the block finishes, so readers never see a
+  half-written file and concurrent writers never share a temp file.
+- locked(path) holds an exclusive lock on `<path>.lock` for a
+  load-merge-write cycle. State that every process saves at the end of a
+  run (probe cache, circuit breakers, HTTP sessions) is merged with what
+  is on disk under this lock, so --jobs workers and parallel --shard runs
+  keep each other's entries instead of the last writer winning.
+
+Without fcntl (Windows) writes stay atomic but the merge is unlocked.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX
+    fcntl = None
+
+# Files get the permissions open() would have given them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path, mode: str = 'w', fsync: bool = False) -> Iterator[IO]:
+    """Yield a file to write `path`'s new contents to; it replaces `path` on success."""
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def locked(path) -> Iterator[None]:
+    """Hold an exclusive lock on `<path>.lock` (blocks until other holders finish)."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{os.fspath(path)}.lock", 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path) -> Optional[dict]:
+    """The file's JSON object, or None if it is missing or unreadable."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
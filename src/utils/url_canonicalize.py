@@ -4,11 +4,30 @@ URL canonicalization helpers for CouncilBot.
 Currently normalizes InfoCouncil redirect links so that
 "/RedirectToDoc.aspx?URL=Open/....PDF" hashes the same as
 "/Open/....PDF" on the same host.
+
+Canonical URLs are memoised (the same URLs are canonicalised several times
+per document per run), and document_hashes()/hash_documents() compute the
+url-only and legacy dedupe hashes for a document in one pass.
 """
 
+import hashlib
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
 from urllib.parse import urlparse, parse_qs, urlunparse
 
 
+CANONICAL_CACHE_SIZE = int(os.environ.get('CANONICAL_CACHE_SIZE', '65536'))
+
+
+class DocHashes(NamedTuple):
+    """Dedupe hashes for one document (md5 hex digests)."""
+    url_only: str       # council|canonical url
+    legacy_canon: str   # council|title|canonical url
+    legacy_raw: str     # council|title|url as scraped
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
 def canonicalize_doc_url(url: str) -> str:
     """Return a canonical URL for hashing/deduplication.
 
@@ -46,3 +65,27 @@ def canonicalize_doc_url(url: str) -> str:
     except Exception:
         return url
 
+
+def _md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def url_only_hash(council_name: str, url: str) -> str:
+    """Title-agnostic hash of council + canonical URL."""
+    return _md5(f"{council_name}|{canonicalize_doc_url(url)}")
+
+
+def document_hashes(council_name: str, title: str, url: str) -> DocHashes:
+    """All dedupe hashes for one document, canonicalising the URL once."""
+    canon = canonicalize_doc_url(url)
+    return DocHashes(
+        url_only=_md5(f"{council_name}|{canon}"),
+        legacy_canon=_md5(f"{council_name}|{title}|{canon}"),
+        legacy_raw=_md5(f"{council_name}|{title}|{url}"),
+    )
+
+
+def hash_documents(documents: Iterable[Dict]) -> List[DocHashes]:
+    """document_hashes() for each results-file document, in order."""
+    return [document_hashes(d.get('council_name', ''), d.get('title', ''), d.get('url', ''))
+            for d in documents]
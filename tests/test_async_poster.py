@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the async threaded posting pipeline
+"""
+
+import sys
+import json
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bluesky_integration import BlueSkyPoster, chunk_bullets
+from src.posting.async_poster import AsyncThreadPoster, ThreadJob
+from src.posting.rate_limit import RateLimiter
+from src.posting.journal import PostJournal
+
+
+class ServerError(Exception):
+    """An error response from the server, like atproto's RequestException."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(status_code=status)
+
+
+class FakeClient:
+    """Records sends; fails the first attempt of the given reply texts."""
+
+    def __init__(self, flaky=(), error=None):
+        self.sent = []
+        self.flaky = set(flaky)
+        self.error = error or ServerError(503)
+        self.attempts = 0
+        self.logins = 0
+
+    async def login(self, handle, password):
+        self.logins += 1
+        await asyncio.sleep(0)  # let the other jobs run while logging in
+
+    async def send_post(self, text, facets=None, reply_to=None):
+        self.attempts += 1
+        if text in self.flaky:
+            self.flaky.discard(text)
+            raise self.error
+        n = len(self.sent)
+        self.sent.append((text, reply_to))
+        return SimpleNamespace(uri=f"at://post/{n}", cid=f"cid{n}")
+
+
+class TestAsyncThreadPoster(unittest.TestCase):
+    """Test cases for AsyncThreadPoster"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        posted = Path(self.tmp.name) / 'posted.json'
+        posted.write_text(json.dumps({'posted': [], 'posts': {}}))
+        self.poster = BlueSkyPoster(handle='h', password='p', posted_file=str(posted),
+                                    rate_limiter=RateLimiter(state_file=None),
+                                    journal=PostJournal(str(Path(self.tmp.name) / 'journal.jsonl')))
+        self.cwd = Path.cwd()
+        # _record_post appends to posts.md in the working directory
+        import os
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        import os
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _job(self, n, bullets):
+        return ThreadJob.from_bullets(bullets, council_name='X Council', doc_type='agenda',
+                                      doc_title=f"Agenda {n}", doc_url=f"https://x/{n}.pdf")
+
+    def test_threads_retry_replies_and_dedupe(self):
+        """Test replies chain in order, a flaky reply is retried, duplicates are skipped"""
+        bullets = [f"Item {i} " + 'x' * 80 for i in range(6)]
+        replies = chunk_bullets(bullets)
+        self.assertGreater(len(replies), 1)
+
+        client = FakeClient(flaky=[replies[1]])
+        pipeline = AsyncThreadPoster(self.poster, concurrency=2, min_interval=0, retry_backoff=0)
+        pipeline._client = client
+        jobs = [self._job(1, bullets), self._job(2, []), self._job(1, bullets)]
+
+        results = asyncio.run(pipeline.post_many(jobs))
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(len(client.sent), 2 + len(replies))
+        self.assertTrue(self.poster.is_posted('X Council', 'Agenda 1', 'https://x/1.pdf'))
+        # Each reply's parent is the previous post in the same thread
+        thread = [(t, r) for t, r in client.sent if r is not None]
+        self.assertEqual([t for t, _ in thread], replies)
+        self.assertEqual(thread[1][1].parent.uri, 'at://post/' + str([t for t, _ in client.sent].index(replies[0])))
+
+    def test_ambiguous_errors_are_not_resent(self):
+        """Test that a timed-out root is left for reconciliation instead of being sent again"""
+        job = self._job(1, [])
+        text, _ = self.poster._compose_post(job.council_name, job.doc_type, job.doc_title, job.doc_url)
+        client = FakeClient(flaky=[text], error=TimeoutError('read timed out'))
+        pipeline = AsyncThreadPoster(self.poster, min_interval=0, retry_backoff=0)
+        pipeline._client = client
+
+        self.assertEqual(asyncio.run(pipeline.post_many([job])), [False])
+        self.assertEqual((client.attempts, client.sent), (1, []))
+        self.assertTrue(self.poster._needs_reconcile)
+        self.assertEqual(len(self.poster.journal.pending()), 1)
+
+    def test_concurrent_jobs_share_one_login(self):
+        """Test that jobs started before any client exists log in once between them"""
+        client = FakeClient()
+        pipeline = AsyncThreadPoster(self.poster, concurrency=4, min_interval=0, retry_backoff=0)
+        self.assertIsNone(pipeline._client)
+        with patch('src.posting.async_poster.AsyncClient', return_value=client):
+            results = asyncio.run(pipeline.post_many([self._job(n, []) for n in range(4)]))
+        self.assertEqual(results, [True] * 4)
+        self.assertEqual(client.logins, 1)
+        self.assertIs(pipeline._client, client)
+
+
+if __name__ == '__main__':
+    unittest.main()
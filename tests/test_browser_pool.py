@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared browser pool and HTTP-first page fetching,
+against a local static HTML server
+"""
+
+import functools
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'src' / 'scrapers'))
+
+from src.utils.browser_pool import BrowserPool, fetch_rendered
+from src.utils.http_cassette import Cassette
+from moonee_valley_fixed import MooneeValleyFixedScraper
+
+TABLE = """<html><body><table><tbody>
+<tr><td>Monday 8 September 2025 6.30pm</td><td><a href="/agenda-0809.pdf">Agenda</a></td>
+<td><a href="/minutes-0809.pdf">Minutes</a></td></tr>
+<tr><td>Monday 25 August 2025 6.30pm</td><td><a href="/agenda-2508.pdf">Agenda</a></td></tr>
+</tbody></table></body></html>"""
+SHELL = "<html><body><div id='app'>Loading...</div></body></html>"
+
+
+class FakeDriver:
+    """Renders TABLE after a couple of page_source polls, like a JS page."""
+
+    def __init__(self, base):
+        self.base = base
+        self.polls = 0
+        self.loaded = []
+        self.quit_called = False
+
+    def get(self, url):
+        self.loaded.append(url)
+        self.polls = 0
+
+    @property
+    def page_source(self):
+        self.polls += 1
+        return TABLE if self.polls > 2 else SHELL
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _Quiet(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Test cases for BrowserPool and fetch_rendered"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.TemporaryDirectory()
+        for name, body in (('static.html', TABLE), ('shell.html', SHELL)):
+            with open(os.path.join(cls.root.name, name), 'w') as f:
+                f.write(body)
+        handler = functools.partial(_Quiet, directory=cls.root.name)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.root.cleanup()
+
+    def setUp(self):
+        self.drivers = []
+
+        def factory():
+            self.drivers.append(FakeDriver(self.base))
+            return self.drivers[-1]
+
+        self.pool = BrowserPool(size=1, factory=factory)
+
+    def test_static_page_never_starts_a_browser(self):
+        """Test that a page with its content in plain HTML never starts a browser"""
+        html = fetch_rendered(f"{self.base}/static.html", MooneeValleyFixedScraper._has_meeting_table,
+                              session=requests.Session(), pool=self.pool)
+        self.assertIn('agenda-0809.pdf', html)
+        self.assertEqual(self.drivers, [])
+
+    def test_escalates_to_one_warm_browser(self):
+        """Test that JavaScript pages are rendered by one reused browser"""
+        for _ in range(2):
+            html = fetch_rendered(f"{self.base}/shell.html", MooneeValleyFixedScraper._has_meeting_table,
+                                  session=requests.Session(), pool=self.pool, timeout=5)
+            self.assertIn('agenda-0809.pdf', html)
+        self.assertEqual(len(self.drivers), 1)
+        self.assertEqual(self.pool.stats()['reused'], 1)
+        self.pool.close()
+        self.assertTrue(self.drivers[0].quit_called)
+
+    def test_replay_skips_the_browser(self):
+        """Test that a cassette replay returns no page rather than going online through a browser"""
+        path = os.path.join(self.root.name, 'cassette.zip')
+        url = f"{self.base}/shell.html"
+        with Cassette(path, 'record'):
+            fetch_rendered(url, MooneeValleyFixedScraper._has_meeting_table,
+                           session=requests.Session(), pool=self.pool, timeout=5)
+        self.assertEqual(len(self.drivers), 1)
+        with Cassette(path, 'replay') as replay:
+            html = fetch_rendered(url, MooneeValleyFixedScraper._has_meeting_table,
+                                  session=requests.Session(), pool=self.pool, timeout=5)
+        self.assertEqual(html, '')
+        self.assertEqual(replay.hits, 1)
+        self.assertEqual(self.drivers[0].loaded, [url])
+
+    def test_failed_driver_is_replaced(self):
+        """Test that a driver that raised is quit and replaced"""
+        with self.assertRaises(RuntimeError):
+            with self.pool.driver():
+                raise RuntimeError('crashed')
+        self.assertTrue(self.drivers[0].quit_called)
+        with self.pool.driver() as driver:
+            self.assertIsNot(driver, self.drivers[0])
+
+    def test_parse_meeting_table(self):
+        """Test that the Moonee Valley meeting table parses into dated agendas and minutes"""
+        docs = MooneeValleyFixedScraper().parse(TABLE)
+        self.assertEqual([(d.document_type, d.date) for d in docs],
+                         [('agenda', '2025-09-08'), ('minutes', '2025-09-08'), ('agenda', '2025-08-25')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-host and per-council circuit breaker
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, council_key
+from src.utils.http_politeness import HostScheduler
+from src.utils.probe_engine import ProbeEngine, ProbeSpec, UrlTemplate
+from src.utils.probe_memo import ProbeMemo
+
+HOST = 'darebin.infocouncil.biz'
+URL = f'https://{HOST}/Open/2025/09/ORD_09092025_AGN.PDF'
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+        self._content = b''
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for host and council circuit breakers"""
+
+    def setUp(self):
+        self.now = 1_000_000.0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'circuit_state.json')
+        self.breaker = self.make()
+        self.sent = []
+        self.status = None  # None = time out
+        self.sched = HostScheduler(rate=0, breaker=self.breaker)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make(self):
+        return CircuitBreaker(self.path, host_failures=3, host_backoff=60, host_max_backoff=200,
+                              council_failures=2, council_backoff=3600, council_max_backoff=7200,
+                              clock=lambda: self.now)
+
+    def send(self, method, url, **kwargs):
+        self.sent.append(url)
+        if self.status is None:
+            raise requests.Timeout('read timed out')
+        return FakeResponse(self.status)
+
+    def get(self):
+        return self.sched.request(self.send, 'GET', URL)
+
+    def fail(self, times):
+        for _ in range(times):
+            with self.assertRaises(requests.RequestException):
+                self.get()
+
+    def test_host_opens_after_consecutive_failures(self):
+        """Test that a host circuit opens after consecutive failures and rejects requests"""
+        self.fail(3)
+        self.assertEqual(self.breaker.host_state(HOST), OPEN)
+        with self.assertRaises(CircuitOpen):
+            self.get()
+        self.assertEqual(len(self.sent), 3)
+        self.assertEqual(self.sched.metrics()[HOST]['rejected'], 1)
+        self.assertEqual(self.sched.metrics()[HOST]['circuit'], OPEN)
+
+    def test_responses_reset_the_count(self):
+        """Test that any response, even a 404, resets the host failure count"""
+        self.fail(2)
+        self.status = 404  # the host is up, the document just isn't there
+        self.get()
+        self.status = None
+        self.fail(2)
+        self.assertEqual(self.breaker.host_state(HOST), CLOSED)
+
+    def test_half_open_trial_then_backoff_doubles(self):
+        """Test that one trial is let through after backoff, and a failed trial doubles it"""
+        self.fail(3)
+        self.now += 61
+        self.assertTrue(self.breaker.allow(HOST))    # the trial
+        self.assertFalse(self.breaker.allow(HOST))   # only one at a time
+        self.breaker.record(HOST, False, 'timeout')
+        self.assertEqual(self.breaker.host_state(HOST), OPEN)
+        self.assertEqual(self.breaker.hosts[HOST].retry_at, self.now + 120)
+
+        self.now += 121
+        self.status = 200
+        self.get()
+        self.assertEqual(self.breaker.host_state(HOST), CLOSED)
+        self.assertEqual(self.breaker.hosts[HOST].trips, 0)
+
+    def test_backoff_is_capped(self):
+        """Test that host backoff stops growing at its maximum"""
+        self.fail(3)
+        for _ in range(4):
+            self.now = self.breaker.hosts[HOST].retry_at
+            self.assertTrue(self.breaker.allow(HOST))
+            self.breaker.record(HOST, False, 'timeout')
+        self.assertEqual(self.breaker.hosts[HOST].retry_at - self.now, 200)
+
+    def probe_spec(self):
+        return ProbeSpec(templates=[UrlTemplate('agenda', ['https://x.example/{iso}.pdf'])],
+                         dates=[date(2025, 9, d) for d in (2, 9, 16)], name='Yarra')
+
+    def test_open_council_skips_probing(self):
+        """Test that an open council circuit skips that council's URL probing only"""
+        for _ in range(2):
+            with self.breaker.council('Yarra'):
+                pass
+            self.breaker.record_council('Yarra', False)
+        checked = []
+        engine = ProbeEngine(lambda u: checked.append(u) or False, memo=ProbeMemo(), breaker=self.breaker)
+        with self.breaker.council('Yarra'):
+            report = engine.run(self.probe_spec())
+        self.assertTrue(report.skipped)
+        self.assertEqual(checked, [])
+        circuit = self.breaker.summary('Yarra')['circuit']
+        self.assertEqual((circuit['state'], circuit['failures'], circuit['fallbacks_skipped']), (OPEN, 2, 1))
+        self.assertEqual(circuit['error'], 'no documents')
+
+        # Other councils and code outside a council still probe
+        with self.breaker.council('Darebin'):
+            engine.run(self.probe_spec())
+        self.assertEqual(len(checked), 3)
+
+    def test_council_half_open_run_closes_on_success(self):
+        """Test that a successful half-open council run closes the circuit"""
+        for _ in range(2):
+            self.breaker.record_council('Yarra', False, 'timeout after 120s')
+        self.now += 3601
+        with self.breaker.council('Yarra') as circuit:
+            self.assertEqual(circuit.state, HALF_OPEN)
+            self.assertTrue(self.breaker.fallbacks_allowed())
+        self.breaker.record_council('Yarra', True)
+        self.assertEqual(self.breaker.summary('Yarra'), {'circuit': {'state': CLOSED, 'failures': 0}})
+
+    def test_state_persists_across_runs(self):
+        """Test that host and council circuits are saved and reloaded"""
+        self.fail(3)
+        self.breaker.record_council('Yarra', False)
+        self.now += 61
+        self.breaker.allow(HOST)  # half-open trial that never finishes
+        self.breaker.save()
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['hosts'][HOST]['state'], OPEN)
+        self.assertEqual(saved['councils']['Yarra']['failures'], 1)
+
+        later = self.make()
+        self.assertTrue(later.allow(HOST))  # backoff already passed: trial again
+        self.assertEqual(later.councils['Yarra'].failures, 1)
+
+    def test_concurrent_savers_merge(self):
+        """Test that processes saving the same file keep each other's circuits"""
+        # Two shard processes, each scraping different councils
+        other = self.make()
+        self.breaker.record_council('Yarra', False)
+        other.record_council('Darebin', False)
+        self.breaker.save()
+        other.save()
+        self.assertEqual(set(self.make().councils), {'Yarra', 'Darebin'})
+
+        # A circuit that closed is dropped; the other process's is kept
+        self.breaker.record_council('Yarra', True)
+        self.breaker.save()
+        self.assertEqual(set(self.make().councils), {'Darebin'})
+
+    def test_council_circuits_are_per_id_and_entry_point(self):
+        """Test that council circuits are kept per council id and entry point"""
+        # BRIM and BRIM-DP are both "Brimbank City Council"; m9 scrapes BRIM with other code
+        for _ in range(2):
+            self.breaker.record_council(council_key('universal', 'BRIM-DP'), False)
+        self.assertEqual(self.breaker.summary(council_key('universal', 'BRIM-DP'))['circuit']['state'], OPEN)
+        self.assertEqual(self.breaker.summary(council_key('universal', 'BRIM'))['circuit']['state'], CLOSED)
+        self.assertEqual(self.breaker.summary(council_key('m9', 'BRIM-DP'))['circuit']['state'], CLOSED)
+
+    def test_name_keyed_council_circuits_are_dropped(self):
+        """Test that name-keyed council circuits from older files are dropped, keeping host circuits"""
+        with open(self.path, 'w') as f:
+            json.dump({'version': 1, 'hosts': {HOST: {'state': OPEN, 'failures': 3, 'retry_at': self.now + 60}},
+                       'councils': {'Brimbank City Council': {'state': OPEN, 'failures': 2}}}, f)
+        breaker = self.make()
+        self.assertEqual((breaker.host_state(HOST), breaker.councils), (OPEN, {}))
+        breaker.record_council(council_key('universal', 'BRIM'), False)
+        breaker.save()
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['version'], 2)
+        self.assertEqual(list(saved['councils']), ['universal:BRIM'])
+        self.assertIn(HOST, saved['hosts'])
+
+    def test_nothing_to_save_writes_no_file(self):
+        """Test that saving with no open circuits writes no file"""
+        self.breaker.record(HOST, True)
+        self.breaker.save()
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
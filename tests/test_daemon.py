@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the meeting calendar and the scrape-and-post daemon
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src' / 'scrapers'))
+
+from src.utils.meeting_calendar import (
+    MeetingCalendar, council_key, parse_csv, parse_ics, SPARSE_INTERVAL, UNKNOWN_INTERVAL,
+)
+from src.daemon import CouncilDaemon
+
+
+ICS = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+UID:A@vic_councils
+DTSTART;TZID=Australia/Melbourne:20251014T190000
+SUMMARY:Alpha City Council
+  Meeting
+END:VEVENT
+BEGIN:VEVENT
+UID:B@vic_councils
+DTSTART:20250101T180000
+SUMMARY:Beta Shire Council Meeting
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class TestMeetingCalendar(unittest.TestCase):
+    """Test cases for MeetingCalendar"""
+
+    def test_parse_ics(self):
+        """Test that ICS events parse to council names and local start times"""
+        meetings = parse_ics(ICS)
+        self.assertEqual(meetings['Alpha City Council'], [datetime(2025, 10, 14, 19, 0)])
+        self.assertIn('Beta Shire Council', meetings)
+
+    def test_parse_csv_merges_with_ics(self):
+        """Test that CSV meetings merge with ICS ones under the same council"""
+        csv_text = ("council,meeting_date,start_time,venue\n"
+                    "City of Alpha,2025-10-14,19:00,Town Hall\n"
+                    "City of Alpha,2025-11-11,19:00,Town Hall\n"
+                    "Broken,not-a-date,,\n")
+        self.assertEqual(list(parse_csv(csv_text)), ['City of Alpha'])
+        cal = MeetingCalendar(parse_ics(ICS))
+        cal.add(parse_csv(csv_text))
+        self.assertEqual(cal.meetings_for('Alpha City Council'),
+                         [datetime(2025, 10, 14, 19, 0), datetime(2025, 11, 11, 19, 0)])
+
+    def test_poll_interval(self):
+        """Test that councils are polled more often around their meetings"""
+        cal = MeetingCalendar(parse_ics(ICS))
+        alpha = 'Alpha City Council'
+        self.assertEqual(cal.poll_interval(alpha, datetime(2025, 10, 8)), timedelta(hours=2))
+        self.assertEqual(cal.poll_interval(alpha, datetime(2025, 10, 12)), timedelta(hours=6))
+        self.assertEqual(cal.poll_interval(alpha, datetime(2025, 10, 25)), timedelta(hours=4))
+        self.assertEqual(cal.poll_interval(alpha, datetime(2025, 12, 1)), SPARSE_INTERVAL)
+        self.assertEqual(cal.poll_interval('Beta Shire Council', datetime(2025, 10, 10)), SPARSE_INTERVAL)
+        self.assertEqual(cal.poll_interval('Gamma Council', datetime(2025, 10, 10)), UNKNOWN_INTERVAL)
+
+    def test_next_poll_stops_at_window_start(self):
+        """Test that a sparse wait is cut short when a meeting window opens"""
+        cal = MeetingCalendar(parse_ics(ICS))
+        alpha = 'Alpha City Council'
+        # Sparse wait would run to 10-08 00:00; the agenda window opens 10-07 19:00
+        self.assertEqual(cal.next_poll(alpha, datetime(2025, 10, 7)), datetime(2025, 10, 7, 19, 0))
+        self.assertEqual(cal.next_poll(alpha, datetime(2025, 10, 8)), datetime(2025, 10, 8, 2, 0))
+
+    def test_plan_orders_councils(self):
+        """Test that never-polled councils come first, then those nearest a meeting"""
+        cal = MeetingCalendar(parse_ics(ICS))
+        councils = [{'id': 'b', 'name': 'Beta Shire Council'}, {'id': 'a', 'name': 'Alpha City Council'},
+                    {'id': 'n', 'name': 'New Council'}]
+        now = datetime(2025, 10, 8)
+        plan = cal.plan(councils, now, last_polled={'a': now, 'b': now})
+        self.assertEqual([c['id'] for _, c in plan], ['n', 'a', 'b'])
+
+    def test_bundled_calendar_matches_registry_names(self):
+        """Test that every council in the bundled calendar matches a registry name"""
+        cal = MeetingCalendar.from_ics(str(ROOT / 'data' / 'vic_all79_verified_2025.ics'))
+        registry = json.loads((ROOT / 'src' / 'registry' / 'all_councils.json').read_text())
+        self.assertEqual(council_key('Monash City Council'), council_key('City of Monash'))
+        matched = [c['name'] for c in registry['councils'] if cal.meetings_for(c['name'])]
+        self.assertEqual(len(matched), len(cal.meetings))
+
+
+class TestCouncilDaemon(unittest.TestCase):
+    """Test cases for CouncilDaemon"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmp.name)
+        (tmp / 'registry.json').write_text(json.dumps({'councils': [
+            {'id': 'alpha', 'name': 'Alpha City Council', 'type': 'generic'},
+            {'id': 'beta', 'name': 'Beta Shire Council', 'type': 'generic'},
+        ]}))
+        (tmp / 'meetings.ics').write_text(ICS)
+        self.now = datetime.now().replace(microsecond=0)
+        os.environ['FAST_PREVIEW'] = '1'
+        self.daemon = CouncilDaemon(
+            registry_path=str(tmp / 'registry.json'),
+            calendar_path=str(tmp / 'meetings.ics'),
+            results_path=str(tmp / 'results.json'),
+            posted_file=str(tmp / 'posted.json'),
+            batch=1,
+            clock=lambda: self.now,
+        )
+        self.scrapes = []
+        today = self.now.strftime('%Y-%m-%d')
+
+        def fake_scrape(council):
+            self.scrapes.append(council['id'])
+            return [{
+                'council_name': council['name'], 'document_type': 'agenda', 'meeting_type': 'council',
+                'title': f"{council['name']} Agenda", 'date': today,
+                'url': f"https://{council['id']}.example/agenda.pdf", 'webpage_url': '',
+            }]
+
+        self.daemon.scraper.scrape_council = fake_scrape
+
+    def tearDown(self):
+        os.environ.pop('FAST_PREVIEW', None)
+        self.tmp.cleanup()
+
+    def test_scrapes_when_due_and_posts_each_document_once(self):
+        """Test that due councils are scraped and each document is posted once"""
+        new, actions = self.daemon.run_once()
+        self.assertEqual(new, 2)
+        self.assertEqual(sorted(self.scrapes), ['alpha', 'beta'])
+        self.assertEqual(len(actions), 1)
+        self.assertTrue(Path(self.daemon.results_path).exists())
+
+        # Nothing is due again yet
+        self.assertEqual(self.daemon.run_once(), (0, []))
+
+        # After the post interval the second document is posted, the first is not repeated
+        self.now += self.daemon.post_interval
+        _, actions2 = self.daemon.run_once()
+        self.assertEqual(len(actions2), 1)
+        self.assertNotEqual(actions2[0]['url'], actions[0]['url'])
+
+    def test_rescrapes_on_council_cadence(self):
+        """Test that councils are scraped again only on their calendar cadence"""
+        self.daemon.run_once()
+        self.scrapes.clear()
+        self.now += UNKNOWN_INTERVAL
+        self.daemon.scrape_due()
+        # Both test meetings are long past, so both councils are on the sparse cadence
+        self.assertEqual(self.scrapes, [])
+        self.now += SPARSE_INTERVAL
+        self.daemon.scrape_due()
+        self.assertEqual(sorted(self.scrapes), ['alpha', 'beta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for cross-council document deduplication
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.dedup import DocumentIndex, council_counts, dedup_key, dedupe_documents
+
+DIRECT = 'https://darebin.infocouncil.biz/Open/2025/09/ORD_09092025_AGN.PDF'
+
+
+def doc(url, council='Darebin', **extra):
+    return {'council_name': council, 'title': 'Agenda', 'url': url, **extra}
+
+
+class TestDocumentIndex(unittest.TestCase):
+    """Test cases for DocumentIndex"""
+
+    def test_url_spellings_share_a_key(self):
+        """Test that scheme, host case, redirector and fragment variants share a dedup key"""
+        for url in ('http://darebin.infocouncil.biz/Open/2025/09/ORD_09092025_AGN.PDF',
+                    'https://Darebin.InfoCouncil.biz/RedirectToDoc.aspx?URL=Open/2025/09/ORD_09092025_AGN.PDF',
+                    DIRECT + '#page=2'):
+            self.assertEqual(dedup_key(url), dedup_key(DIRECT))
+        self.assertNotEqual(dedup_key(DIRECT), dedup_key(DIRECT.replace('AGN', 'MIN')))
+
+    def test_first_occurrence_kept_across_councils(self):
+        """Test that the first copy of a document is kept, whichever council found it"""
+        first = doc(DIRECT)
+        index = dedupe_documents([
+            first,
+            doc(DIRECT.replace('https://', 'http://'), council='Darebin City Council'),
+            doc('https://darebin.infocouncil.biz/RedirectToDoc.aspx?URL=Open/2025/09/ORD_09092025_AGN.PDF'),
+            doc(DIRECT.replace('AGN', 'MIN')),
+        ])
+        self.assertEqual(len(index), 2)
+        self.assertIs(index.documents[0], first)
+        stats = index.stats()
+        self.assertEqual((stats['input'], stats['kept'], stats['collapsed']), (4, 2, 2))
+        self.assertEqual(stats['by_council'], {'Darebin City Council': 1, 'Darebin': 1})
+
+    def test_fingerprint_matches_other_urls(self):
+        """Test that a matching fingerprint marks a document at another URL as a duplicate"""
+        index = DocumentIndex()
+        self.assertTrue(index.add(doc(DIRECT, fingerprint='abc')))
+        mirror = doc('https://www.darebin.vic.gov.au/files/agenda.pdf', fingerprint='abc')
+        self.assertFalse(index.add(mirror))
+        self.assertIn(doc('https://www.darebin.vic.gov.au/files/agenda.pdf'), index)
+        self.assertEqual(index.stats()['by_reason'], {'fingerprint': 1})
+
+    def test_documents_without_url_are_dropped_not_collapsed(self):
+        """Test that documents without a URL are dropped and counted as no_url"""
+        index = dedupe_documents([doc(''), doc(''), doc(DIRECT), {'title': 'no url'}])
+        self.assertEqual(len(index), 1)
+        stats = index.stats()
+        self.assertEqual((stats['input'], stats['kept'], stats['collapsed'], stats['no_url']), (4, 1, 0, 3))
+
+    def test_council_counts_add_up_after_dedup(self):
+        """Test that council counts cover only kept documents and report those collapsed"""
+        index = DocumentIndex()
+        index.keep([doc(DIRECT, document_type='agenda')])
+        docs = [doc(DIRECT.replace('https://', 'http://'), document_type='agenda'),
+                doc(DIRECT.replace('AGN', 'MIN'), document_type='minutes')]
+        counts = council_counts(index.keep(docs), len(docs))
+        self.assertEqual(counts, {'total': 1, 'agendas': 0, 'minutes': 1, 'collapsed': 1})
+        self.assertNotIn('collapsed', council_counts(docs, len(docs)))
+
+
+if __name__ == '__main__':
+    unittest.main()
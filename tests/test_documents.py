@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared MeetingDocument record
+"""
+
+import pickle
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'src' / 'scrapers'))
+
+from src.utils.documents import FIELDS, MeetingDocument, serialize_documents
+
+ROW = {
+    'council_id': 'DARE', 'council_name': 'Darebin City Council', 'document_type': 'agenda',
+    'meeting_type': 'council', 'title': 'Council Meeting Agenda - 2025-09-22', 'date': '2025-09-22',
+    'url': 'https://darebin.infocouncil.biz/Open/2025/09/CO_22092025_AGN.PDF',
+    'webpage_url': 'https://darebin.infocouncil.biz/',
+}
+
+
+class LegacyDoc:
+    """A document-like object from outside the shared type."""
+
+    def __init__(self):
+        self.council_id = 'X'
+        self.name = 'Budget papers'
+        self.download_url = 'https://x/budget.pdf'
+
+
+class TestMeetingDocument(unittest.TestCase):
+    """Test cases for MeetingDocument"""
+
+    def test_slotted_and_round_trips(self):
+        """Test that documents are slotted and round-trip through dicts and pickle"""
+        doc = MeetingDocument.from_dict(ROW)
+        self.assertFalse(hasattr(doc, '__dict__'))
+        self.assertEqual(doc.to_dict(), ROW)
+        self.assertEqual(tuple(doc.to_dict()), FIELDS)
+        self.assertEqual(pickle.loads(pickle.dumps(doc)), doc)
+
+    def test_repeated_strings_are_shared(self):
+        """Test that repeated field values are interned"""
+        a = MeetingDocument.from_dict(ROW)
+        b = MeetingDocument(''.join(['DA', 'RE']), 'Darebin City ' + 'Council', 'age' + 'nda',
+                            'coun' + 'cil', 't', '2025-' + '09-22', 'u')
+        for field in ('council_id', 'council_name', 'document_type', 'meeting_type', 'date'):
+            self.assertIs(getattr(a, field), getattr(b, field))
+        self.assertEqual(b.webpage_url, '')
+
+    def test_scrapers_share_the_type(self):
+        """Test that the scrapers use the shared MeetingDocument class"""
+        import darebin_m9
+        import generic_web
+        import m9_adapted
+        self.assertIs(darebin_m9.MeetingDocument, MeetingDocument)
+        self.assertIs(m9_adapted.MeetingDocument, MeetingDocument)
+        self.assertIs(generic_web.MeetingDocument, MeetingDocument)
+
+    def test_serialize_mixed_inputs(self):
+        """Test that serialize_documents accepts documents, dicts and legacy objects"""
+        out = serialize_documents([MeetingDocument.from_dict(ROW), ROW, LegacyDoc()])
+        self.assertEqual(out[:2], [ROW, ROW])
+        self.assertEqual((out[2]['title'], out[2]['url']), ('Budget papers', 'https://x/budget.pdf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for CouncilBotScheduler candidate filtering
+"""
+
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from enhanced_scheduler import CouncilBotScheduler
+from src.posting.rate_limit import RateLimiter
+
+
+class TestFilterUnposted(unittest.TestCase):
+    """Test cases for the pre-posting filter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.posted_file = Path(self.tmp.name) / 'posted.json'
+        self.posted_file.write_text(json.dumps({'posted': [], 'posts': {}}))
+        self.scheduler = CouncilBotScheduler(
+            results_file=str(Path(self.tmp.name) / 'results.json'),
+            posted_file=str(self.posted_file),
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_skips_posted_duplicates_and_missing_urls(self):
+        """Test that each skip reason is counted"""
+        base = 'https://x.infocouncil.biz'
+        posted_url = f"{base}/Open/2025/09/ORD_09092025_AGN.PDF"
+        self.scheduler.bluesky.posted_docs.add(
+            self.scheduler.bluesky._hash_url_only('X Council', posted_url)
+        )
+        docs = [
+            {'council_name': 'X Council', 'title': 'Agenda', 'url': f"{base}/RedirectToDoc.aspx?URL=Open/2025/09/ORD_09092025_AGN.PDF"},
+            {'council_name': 'X Council', 'title': 'Minutes', 'url': f"{base}/Open/2025/09/ORD_09092025_MIN.PDF"},
+            {'council_name': 'X Council', 'title': 'Minutes copy', 'url': f"{base}/Open/2025/09/ORD_09092025_MIN.PDF#page=2"},
+            {'council_name': 'X Council', 'title': 'No link', 'url': ''},
+        ]
+
+        candidates, skipped = self.scheduler.filter_unposted(docs)
+
+        self.assertEqual([d['title'] for d in candidates], ['Minutes'])
+        self.assertEqual(skipped, {'already_posted': 1, 'duplicate': 1, 'no_url': 1})
+
+
+class Stop(Exception):
+    pass
+
+
+class TestRunContinuous(unittest.TestCase):
+    """Test cases for the continuous posting loop"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        results = Path(self.tmp.name) / 'results.json'
+        results.write_text(json.dumps({'documents': [
+            {'council_name': 'X Council', 'title': 'Agenda', 'document_type': 'agenda',
+             'url': 'https://x.example/agenda.pdf', 'date': '2025-10-07'},
+        ]}))
+        posted_file = Path(self.tmp.name) / 'posted.json'
+        posted_file.write_text(json.dumps({'posted': [], 'posts': {}}))
+        self.scheduler = CouncilBotScheduler(results_file=str(results), posted_file=str(posted_file))
+        self.scheduler.bluesky.rate_limiter = RateLimiter(state_file=None)
+        self.sleeps = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if len(self.sleeps) == 4:
+            raise Stop()
+
+    def test_failed_posts_retry_with_backoff(self):
+        """Test that failed posts back off instead of waiting for a new scrape"""
+        with mock.patch.object(self.scheduler.bluesky, 'post_document', return_value=False), \
+                mock.patch.object(self.scheduler, '_wait_for_new_results') as wait, \
+                mock.patch('enhanced_scheduler.time.sleep', self.sleep):
+            with self.assertRaises(Stop):
+                self.scheduler.run_continuous(posts_per_hour=3600, batch_size=1,
+                                              retry_seconds=10, max_retry_seconds=30)
+        self.assertEqual(self.sleeps, [10, 20, 30, 30])
+        wait.assert_not_called()
+
+    def test_no_candidates_waits_for_next_scrape(self):
+        """Test that an empty batch waits for the results file to change"""
+        self.scheduler.results_file.write_text(json.dumps({'documents': []}))
+        with mock.patch.object(self.scheduler, '_wait_for_new_results', side_effect=Stop) as wait:
+            with self.assertRaises(Stop):
+                self.scheduler.run_continuous(posts_per_hour=3600, batch_size=1)
+        wait.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
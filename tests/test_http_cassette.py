@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for HTTP cassette record and replay, against the stand-in server
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.http_cassette import Cassette, CassetteMiss
+from src.utils.http_politeness import HostScheduler
+from src.utils.standin_server import SiteModel, StandinServer, routed_to
+
+HOST = 'brimbank.infocouncil.biz'
+MODEL = SiteModel(today=date(2025, 9, 19), months_back=1)
+MEETING = MODEL.meetings(HOST)[0]
+LISTING = f"https://{HOST}/Open/{MEETING:%Y/%m}/"
+PDF = LISTING + SiteModel.infocouncil_name(MEETING, 'agenda')
+MISSING = [f"https://{HOST}/Open/2025/08/ORD_0{d}082025_AGN.PDF" for d in (1, 2, 3)]
+
+
+class TestHttpCassette(unittest.TestCase):
+    """Test cases for HTTP cassette record and replay"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cassette.zip')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, **server_kwargs):
+        with StandinServer(MODEL, **server_kwargs) as server, routed_to(server.base_url):
+            with Cassette(self.path, 'record') as cassette:
+                session = requests.Session()
+                listing = session.get(LISTING, timeout=5).text
+                pdf = session.get(PDF, headers={'Range': 'bytes=0-3'}, timeout=5).content
+                for url in MISSING:
+                    session.get(url, timeout=5)
+        return cassette, listing, pdf
+
+    def test_replay_matches_recording_without_network(self):
+        """Test that replay returns the recorded responses and misses unrecorded requests"""
+        cassette, listing, pdf = self.record()
+        self.assertEqual(cassette.stats()['recorded'], 5)
+        with Cassette(self.path, 'replay') as replay:
+            session = requests.Session()
+            self.assertEqual(session.get(LISTING).text, listing)
+            part = session.get(PDF, headers={'Range': 'bytes=0-3'})
+            self.assertEqual((part.status_code, part.content, part.url), (206, pdf, PDF))
+            self.assertEqual(session.get(MISSING[0]).status_code, 404)
+            with self.assertRaises(CassetteMiss):
+                session.get(PDF)  # recorded only with a Range header
+        self.assertEqual((replay.hits, replay.misses), (3, 1))
+
+    def test_identical_bodies_stored_once(self):
+        """Test that identical response bodies are stored once in the archive"""
+        self.record()
+        with zipfile.ZipFile(self.path) as zf:
+            bodies = [n for n in zf.namelist() if n.startswith('bodies/')]
+        self.assertEqual(len(bodies), 3)  # listing, PDF bytes, one shared 404 page
+
+    def test_connection_errors_replay_as_errors(self):
+        """Test that recorded connection errors are raised again on replay"""
+        with StandinServer(MODEL, drop_rate=1.0) as server, routed_to(server.base_url):
+            with Cassette(self.path, 'record'):
+                with self.assertRaises(requests.ConnectionError):
+                    requests.get(LISTING, timeout=5)
+        with Cassette(self.path, 'replay') as replay:
+            with self.assertRaises(requests.ConnectionError):
+                requests.get(LISTING)
+        self.assertEqual(replay.stats()['by_status'], {'connection': 1})
+
+    def record_listing(self, append=False, **server_kwargs):
+        with StandinServer(MODEL, **server_kwargs) as server, routed_to(server.base_url):
+            with Cassette(self.path, 'record', append=append):
+                return requests.get(LISTING, timeout=5).status_code
+
+    def test_rerecording_replaces_old_responses(self):
+        """Test that recording again replaces the archive, so replay serves the newest response"""
+        self.assertEqual(self.record_listing(error_rate=1.0, error_status=500), 500)
+        self.assertEqual(self.record_listing(), 200)
+        with Cassette(self.path, 'replay'):
+            self.assertEqual(requests.get(LISTING).status_code, 200)
+            self.assertEqual(requests.get(LISTING).status_code, 200)
+
+    def test_append_plays_new_responses_after_old(self):
+        """Test that append=True adds to an existing recording instead of replacing it"""
+        self.record_listing(error_rate=1.0, error_status=500)
+        self.record_listing(append=True)
+        with Cassette(self.path, 'replay'):
+            self.assertEqual(requests.get(LISTING).status_code, 500)
+            self.assertEqual(requests.get(LISTING).status_code, 200)
+
+    def test_cassette_misses_do_not_open_circuits(self):
+        """Test that unrecorded requests in a replay do not open host circuits"""
+        self.record()
+        breaker = CircuitBreaker(None, host_failures=1)
+        scheduler = HostScheduler(rate=0, breaker=breaker)
+        with Cassette(self.path, 'replay'):
+            for _ in range(3):
+                with self.assertRaises(CassetteMiss):
+                    scheduler.request(requests.request, 'GET', PDF)
+        self.assertEqual(breaker.host_state(HOST), 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-host politeness scheduler
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.http_politeness import HostScheduler, dedupe_key, polite
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class TestHostScheduler(unittest.TestCase):
+    """Test cases for HostScheduler and polite sessions"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sched = HostScheduler(rate=2.0, max_interval=30.0, clock=self.clock, sleep=self.clock.sleep)
+        self.sent = []
+
+    def send(self, status=200, headers=None):
+        def _send(method, url, **kwargs):
+            self.sent.append((method, url, self.clock.now))
+            return FakeResponse(status, headers)
+        return _send
+
+    def test_spaces_requests_per_host(self):
+        """Test that requests to one host are spaced out without delaying other hosts"""
+        for _ in range(3):
+            self.sched.request(self.send(), 'GET', 'https://a.example/x')
+        self.sched.request(self.send(), 'GET', 'https://b.example/x')
+        times = [t for _, url, t in self.sent if 'a.example' in url]
+        self.assertEqual(times, [1000.0, 1000.5, 1001.0])
+        # Another host is not held back by the first
+        self.assertEqual(self.sent[-1][2], 1001.0)
+        self.assertEqual(self.sched.metrics()['a.example']['requests'], 3)
+
+    def test_throttle_backs_off_and_honours_retry_after(self):
+        """Test that a 429 slows the host down and its Retry-After is waited out"""
+        self.sched.request(self.send(429, {'Retry-After': '10'}), 'GET', 'https://a.example/x')
+        self.assertEqual(self.sched.hosts['a.example'].interval, 1.0)
+        self.sched.request(self.send(), 'GET', 'https://a.example/y')
+        self.assertGreaterEqual(self.sent[-1][2], 1010.0)
+        metrics = self.sched.metrics()['a.example']
+        self.assertEqual(metrics['throttled'], 1)
+
+    def test_recovers_towards_base_rate(self):
+        """Test that a slowed host returns to the base rate after successful requests"""
+        self.sched.request(self.send(503), 'GET', 'https://a.example/x')
+        slowed = self.sched.hosts['a.example'].interval
+        for i in range(30):
+            self.sched.request(self.send(), 'GET', f'https://a.example/{i}')
+        self.assertLess(self.sched.hosts['a.example'].interval, slowed)
+        self.assertAlmostEqual(self.sched.hosts['a.example'].interval, 0.5)
+
+    def test_deduplicates_inflight_requests(self):
+        """Test that identical concurrent requests share one network call but get their own responses"""
+        sched = HostScheduler(rate=0)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_send(method, url, **kwargs):
+            calls.append(url)
+            started.set()
+            release.wait(5)
+            return FakeResponse()
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(sched.request(slow_send, 'GET', 'https://a.example/x')))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(sched.request(slow_send, 'GET', 'https://a.example/x')))
+        second.start()
+        while sched.metrics()['a.example']['deduplicated'] == 0:
+            pass
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(calls, ['https://a.example/x'])
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(results[0].status_code, results[1].status_code)
+
+    def test_dedupe_key_covers_request_options(self):
+        """Test that requests differing in any sent option are not deduplicated"""
+        base = dedupe_key('GET', 'https://a.example/x', {'headers': {'Range': 'bytes=0-0'}, 'timeout': 8})
+        self.assertEqual(base, dedupe_key('get', 'https://a.example/x', {'headers': {'range': 'bytes=0-0'},
+                                                                          'data': None, 'stream': False}))
+        for kwargs in ({'headers': {'Range': 'bytes=0-0'}, 'params': {'page': 2}},
+                       {'headers': {'Range': 'bytes=0-0', 'Accept': 'application/pdf'}},
+                       {'headers': {'Range': 'bytes=0-0'}, 'allow_redirects': False}):
+            self.assertNotEqual(base, dedupe_key('GET', 'https://a.example/x', kwargs))
+        self.assertIsNone(dedupe_key('GET', 'https://a.example/x', {'stream': True}))
+        self.assertIsNone(dedupe_key('GET', 'https://a.example/x', {'cookies': {'a': '1'}}))
+        self.assertIsNone(dedupe_key('POST', 'https://a.example/x', {}))
+
+    def test_polite_wraps_session_request(self):
+        """Test that polite() routes a session's requests through the scheduler"""
+        class Session:
+            def request(self, method, url, **kwargs):
+                return FakeResponse()
+
+            def get(self, url, **kwargs):
+                return self.request('GET', url, **kwargs)
+
+        session = polite(Session(), self.sched)
+        session.get('https://a.example/x')
+        session.get('https://a.example/y')
+        self.assertEqual(self.sched.metrics()['a.example']['requests'], 2)
+        self.assertEqual(self.clock.now, 1000.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
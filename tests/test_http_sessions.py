@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared per-host sessions and persisted cookies
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.http_sessions import HostSessions, SharedSession, is_challenge
+
+NOW = 1_760_000_000
+
+
+class FakeResponse:
+    def __init__(self, status, text='', headers=None):
+        self.status_code = status
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession(requests.Session):
+    """Answers every request with a fixed status, recording what it was asked."""
+
+    def __init__(self, kind, status):
+        super().__init__()
+        self.kind = kind
+        self.status = status
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if self.kind == 'cloud':
+            self.cookies.set('cf_clearance', 'token', domain='council.example', expires=NOW + 3600)
+        return FakeResponse(self.status)
+
+
+class TestHostSessions(unittest.TestCase):
+    """Test cases for HostSessions and SharedSession"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'session_state.json')
+        self.created = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sessions(self, plain_status=403):
+        def plain():
+            self.created.append(FakeSession('plain', plain_status))
+            return self.created[-1]
+
+        def cloud():
+            self.created.append(FakeSession('cloud', 200))
+            return self.created[-1]
+
+        return HostSessions(self.path, plain_factory=plain, cloud_factory=cloud, clock=lambda: NOW)
+
+    def test_challenge_detection(self):
+        """Test that bot challenges are told apart from ordinary errors"""
+        self.assertTrue(is_challenge(FakeResponse(403)))
+        self.assertTrue(is_challenge(FakeResponse(503, headers={'Server': 'cloudflare'})))
+        self.assertTrue(is_challenge(FakeResponse(429, text='<title>Just a moment...</title>')))
+        self.assertFalse(is_challenge(FakeResponse(503)))
+        self.assertFalse(is_challenge(FakeResponse(404)))
+
+    def test_challenge_escalates_once_per_host(self):
+        """Test that a challenged host moves to cloudscraper once and stays there"""
+        hosts = self.sessions()
+        self.assertEqual(hosts.request('GET', 'https://council.example/a').status_code, 200)
+        self.assertEqual(hosts.request('GET', 'https://council.example/b').status_code, 200)
+        self.assertEqual([s.kind for s in self.created], ['plain', 'cloud'])
+        self.assertEqual(len(self.created[1].calls), 2)
+        self.assertEqual(hosts.stats(), {'hosts': 1, 'cloudscraper': 1, 'escalations': 1})
+
+    def test_learned_host_and_cookies_survive_restart(self):
+        """Test that learned cloudscraper hosts and their cookies are saved and reloaded"""
+        hosts = self.sessions()
+        hosts.request('GET', 'https://council.example/a')
+        hosts.save()
+        with open(self.path) as f:
+            saved = json.load(f)['hosts']['council.example']
+        self.assertEqual(saved['cloudscraper'], NOW)
+        self.assertEqual(saved['cookies'][0]['name'], 'cf_clearance')
+
+        self.created.clear()
+        restarted = self.sessions()
+        session = restarted.session_for('council.example')
+        self.assertEqual(session.kind, 'cloud')
+        self.assertEqual(session.cookies.get('cf_clearance'), 'token')
+
+    def test_nothing_written_without_traffic(self):
+        """Test that saving without any requests writes no file"""
+        self.sessions().save()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_shared_session_sends_its_own_headers(self):
+        """Test that scrapers sharing a host session each send their own headers"""
+        hosts = self.sessions(plain_status=200)
+        a, b = SharedSession(hosts), SharedSession(hosts)
+        a.headers['User-Agent'] = 'scraper-a'
+        b.headers['User-Agent'] = 'scraper-b'
+        a.get('https://council.example/x')
+        b.get('https://council.example/y', headers={'Accept': 'text/html'})
+        calls = self.created[0].calls
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(calls[0][2]['headers']['User-Agent'], 'scraper-a')
+        self.assertEqual(calls[1][2]['headers']['User-Agent'], 'scraper-b')
+        self.assertEqual(calls[1][2]['headers']['Accept'], 'text/html')
+
+
+if __name__ == '__main__':
+    unittest.main()
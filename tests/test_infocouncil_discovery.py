@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for InfoCouncil month-directory discovery
+"""
+
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.infocouncil import discover_month_files, discover_months, recent_months
+
+
+BASE = 'https://x.infocouncil.biz'
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Serves directory listings from {url: [pdf names]} after an optional delay."""
+
+    def __init__(self, listings, delay=0.0):
+        self.listings = listings
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, **kwargs):
+        with self._lock:
+            self.calls.append(url)
+        time.sleep(self.delay)
+        if url not in self.listings:
+            return FakeResponse(404)
+        body = ''.join(f'<a href="{name}">{name}</a>' for name in self.listings[url])
+        return FakeResponse(200, body)
+
+
+def direct(y_m):
+    return f"{BASE}/Open/{y_m}/"
+
+
+def redirector(y_m):
+    return f"{BASE}/RedirectToDoc.aspx?URL=Open/{y_m}/"
+
+
+class TestMonthDiscovery(unittest.TestCase):
+    """Test cases for InfoCouncil month discovery"""
+
+    def test_recent_months_skips_repeats(self):
+        """Test that recent_months lists each month once"""
+        # 30-day steps from 31 March land in March twice
+        self.assertEqual(recent_months(datetime(2025, 3, 31), 4),
+                         [(2025, 3), (2025, 1), (2024, 12)])
+
+    def test_single_month_stops_at_first_listing(self):
+        """Test that a month stops at the first listing that answers"""
+        session = FakeSession({direct('2025/09'): ['ORD_09092025_AGN.PDF'],
+                               redirector('2025/09'): ['ORD_09092025_MIN.PDF']})
+        files = discover_month_files(BASE, 2025, 9, session, {})
+        self.assertEqual(files, [f"{BASE}/Open/2025/09/ORD_09092025_AGN.PDF"])
+        self.assertEqual(session.calls, [direct('2025/09')])
+
+    def test_months_merge_in_requested_order(self):
+        """Test that concurrent month results merge in month order, without duplicates"""
+        session = FakeSession({
+            direct('2025/09'): ['ORD_09092025_AGN.PDF', 'ORD_09092025_AGN.PDF'],
+            redirector('2025/08'): ['/Open/2025/08/ORD_12082025_MIN.PDF'],
+        }, delay=0.01)
+        months = [(2025, 9), (2025, 8), (2025, 7)]
+        files = discover_months(BASE, months, session, {}, max_workers=6)
+        self.assertEqual(files, [
+            f"{BASE}/Open/2025/09/ORD_09092025_AGN.PDF",
+            f"{BASE}/Open/2025/08/ORD_12082025_MIN.PDF",
+        ])
+        self.assertEqual(files, discover_months(BASE, months, FakeSession(session.listings), {}, max_workers=1))
+
+    def test_months_are_fetched_concurrently(self):
+        """Test that month listings are fetched in parallel"""
+        session = FakeSession({}, delay=0.1)
+        months = [(2025, m) for m in range(1, 7)]
+        start = time.monotonic()
+        self.assertEqual(discover_months(BASE, months, session, {}, max_workers=12), [])
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(session.calls), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for per-council phase timing and request counters
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.http_politeness import HostScheduler
+from src.utils.instrumentation import Instruments, get_instruments, prometheus_text, timed
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status, body=b''):
+        self.status_code = status
+        self._content = body
+        self.headers = {}
+
+
+class TestInstruments(unittest.TestCase):
+    """Test cases for per-council Instruments"""
+
+    def test_phases_use_self_time(self):
+        """Test that nested phases are charged only their own time"""
+        clock = Clock()
+        inst = Instruments(clock)
+        with inst.council('Yarra'):
+            clock.now += 1            # scraper's own work
+            with inst.phase('probe'):
+                clock.now += 2
+                with inst.phase('fetch'):
+                    clock.now += 5
+            with inst.phase('dates'):
+                clock.now += 0.5
+        phases = inst.summary('Yarra', 0)['phases']
+        self.assertEqual((phases['parse'], phases['probe'], phases['fetch'], phases['dates']), (1, 2, 5, 0.5))
+        self.assertEqual(inst.summary('Yarra', 0)['scrape_time'], 8.5)
+
+    def test_nothing_recorded_outside_a_council(self):
+        """Test that requests made outside a council are not recorded"""
+        inst = Instruments()
+        with inst.phase('fetch'):
+            inst.record_request(200, 10)
+        self.assertEqual(inst.councils, {})
+
+    def test_worker_threads_charge_the_current_council(self):
+        """Test that requests from worker threads count towards the council that started them"""
+        inst = Instruments()
+        with inst.council('Darebin'):
+            worker = threading.Thread(target=lambda: inst.record_request('timeout'))
+            worker.start()
+            worker.join()
+            inst.record_request(206, 1)
+        summary = inst.summary('Darebin', 1)
+        self.assertEqual(summary['requests'], {'206': 1, 'timeout': 1})
+        self.assertEqual(summary['docs_per_request'], 0.5)
+
+    def test_scheduler_reports_requests(self):
+        """Test that HostScheduler reports each request outcome and its bytes"""
+        inst = get_instruments()
+        inst.reset()
+        sched = HostScheduler(rate=0)
+
+        def send(method, url, **kwargs):
+            if 'slow' in url:
+                raise TimeoutError('timed out')
+            return FakeResponse(404 if 'missing' in url else 200, b'abc')
+
+        with inst.council('Moonee Valley'):
+            sched.request(send, 'GET', 'https://mvcc.vic.gov.au/a')
+            sched.request(send, 'GET', 'https://mvcc.vic.gov.au/missing')
+            with self.assertRaises(TimeoutError):
+                sched.request(send, 'GET', 'https://mvcc.vic.gov.au/slow')
+        summary = inst.summary('Moonee Valley', 1)
+        self.assertEqual(summary['requests'], {'200': 1, '404': 1, 'timeout': 1})
+        self.assertEqual(summary['bytes'], 6)
+        inst.reset()
+
+    def test_timed_decorator(self):
+        """Test that @timed charges the wrapped function to its phase"""
+        inst = get_instruments()
+        inst.reset()
+
+        @timed('dates')
+        def extract(text):
+            return text.upper()
+
+        with inst.council('Melbourne'):
+            self.assertEqual(extract('x'), 'X')
+        self.assertGreater(inst.councils['Melbourne'].phases['dates'], 0)
+        inst.reset()
+
+    def test_prometheus_text(self):
+        """Test that council stats render as escaped Prometheus series"""
+        stats = [
+            {'name': 'City of "Port" Phillip', 'total': 3, 'scrape_time': 1.5,
+             'phases': {'fetch': 1.0, 'parse': 0.5}, 'requests': {'200': 2, '404': 1}, 'bytes': 100},
+            {'name': 'Old format, no instrumentation', 'total': 1},
+        ]
+        text = prometheus_text(stats)
+        self.assertIn('councilbot_scrape_requests_total{council="City of \\"Port\\" Phillip",'
+                      'id="City of \\"Port\\" Phillip",outcome="404"} 1', text)
+        self.assertIn('councilbot_scrape_phase_seconds{council="City of \\"Port\\" Phillip",'
+                      'id="City of \\"Port\\" Phillip",phase="fetch"} 1.0', text)
+        self.assertIn('# TYPE councilbot_scrape_requests_total counter', text)
+        self.assertNotIn('Old format', text)
+
+    def test_councils_sharing_a_name_are_kept_apart(self):
+        """Test that councils with the same name get separate instruments and series"""
+        inst = Instruments()
+        stats = []
+        for council_id in ('BRIM', 'BRIM-DP'):
+            with inst.council(council_id):
+                inst.record_request(200, 10)
+            stats.append({'id': council_id, 'name': 'Brimbank City Council', **inst.summary(council_id, 1)})
+        self.assertEqual([s['requests'] for s in stats], [{'200': 1}, {'200': 1}])
+        series = [line.rsplit(' ', 1)[0] for line in prometheus_text(stats).splitlines() if not line.startswith('#')]
+        self.assertEqual(len(series), len(set(series)))
+        self.assertIn('councilbot_scrape_documents{council="Brimbank City Council",id="BRIM-DP"}', series)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-ahead post journal and crash recovery
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bluesky_integration import BlueSkyPoster
+from src.posting.journal import PostJournal
+from src.posting.rate_limit import RateLimiter
+
+
+class FakeClient:
+    """Minimal sync client: a feed of earlier posts plus recorded sends."""
+
+    def __init__(self, feed=()):
+        self.feed = list(feed)
+        self.sent = []
+        self.me = SimpleNamespace(did='did:plc:test')
+
+    def get_author_feed(self, actor, limit=100):
+        items = [SimpleNamespace(post=SimpleNamespace(record=SimpleNamespace(text=t), uri=u, cid=c))
+                 for t, u, c in self.feed]
+        return SimpleNamespace(feed=items)
+
+    def send_post(self, text, facets=None, reply_to=None):
+        n = len(self.sent) + len(self.feed)
+        self.sent.append(text)
+        self.feed.append((text, f"at://post/{n}", f"cid{n}"))
+        return SimpleNamespace(uri=f"at://post/{n}", cid=f"cid{n}")
+
+
+class TestPostJournal(unittest.TestCase):
+    """Test cases for PostJournal recovery"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        Path('posted.json').write_text(json.dumps({'posted': [], 'posts': {}}))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _poster(self, client):
+        poster = BlueSkyPoster(handle='h', password='p', posted_file='posted.json',
+                               rate_limiter=RateLimiter(state_file=None),
+                               journal=PostJournal('journal.jsonl'))
+        poster._client = client
+        return poster
+
+    def _thread(self, poster):
+        return poster.post_document_with_reply_text(
+            council_name='X Council', doc_type='agenda', doc_title='Agenda',
+            doc_url='https://x/a.pdf', date_str='2025-10-07',
+            text='First sentence here. ' * 20,
+        )
+
+    def test_crash_after_send_is_not_reposted(self):
+        """Test that a post sent but never recorded is recovered from the feed"""
+        client = FakeClient()
+        poster = self._poster(client)
+        # Simulate a crash between send_post and the done record / posted store
+        text, _ = poster._compose_post('X Council', 'agenda', 'Agenda', 'https://x/a.pdf', date_str='2025-10-07')
+        key = poster._hash_url_only('X Council', 'https://x/a.pdf')
+        poster.journal.plan(key, 2)
+        poster.journal.begin(key, 0, text, doc={'council_name': 'X Council', 'doc_type': 'agenda',
+                                                'doc_title': 'Agenda', 'doc_url': 'https://x/a.pdf',
+                                                'date_str': '2025-10-07'})
+        client.send_post(text)
+        poster.journal.close()
+
+        restarted = self._poster(client)
+        self.assertFalse(self._thread(restarted))
+        self.assertTrue(restarted.is_posted('X Council', 'Agenda', 'https://x/a.pdf'))
+        # Root not duplicated; the missing replies were resumed under it
+        self.assertEqual(client.sent.count(text), 1)
+        self.assertEqual(len(client.sent), 1 + 2)
+        self.assertFalse(restarted.journal.incomplete(key))
+
+    def test_compaction_drops_finished_entries(self):
+        """Test that completed threads are compacted away on restart"""
+        client = FakeClient()
+        poster = self._poster(client)
+        self.assertTrue(self._thread(poster))
+        poster.journal.close()
+        self._poster(client)
+        self.assertEqual(Path('journal.jsonl').read_text(), '')
+
+    def test_done_root_missing_from_store_survives_restart(self):
+        """Test that a root journaled as done but not yet stored is recovered, not compacted away"""
+        client = FakeClient()
+        poster = self._poster(client)
+        key = poster._hash_url_only('X Council', 'https://x/a.pdf')
+        # Crash after the done record but before posted.json was written
+        poster.journal.begin(key, 0, 'text', doc={'council_name': 'X Council', 'doc_type': 'agenda',
+                                                  'doc_title': 'Agenda', 'doc_url': 'https://x/a.pdf',
+                                                  'date_str': '2025-10-07'})
+        poster.journal.complete(key, 0, 'at://post/0', 'cid0')
+        poster.journal.close()
+
+        restarted = self._poster(client)
+        self.assertTrue(restarted.is_posted('X Council', 'Agenda', 'https://x/a.pdf'))
+        self.assertIn(key, json.loads(Path('posted.json').read_text())['posted'])
+        self.assertEqual(client.sent, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent probe-result cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.probe_cache import PROBE_PDF, PROBE_PDF_TYPE, ProbeCache, url_date
+from src.utils.probe_memo import ProbeMemo
+
+NOW = datetime(2025, 9, 19, 12, 0).timestamp()
+OLD = 'https://x.infocouncil.biz/Open/2025/06/ORD_10062025_AGN.PDF'
+NEAR = 'https://x.infocouncil.biz/Open/2025/09/ORD_23092025_AGN.PDF'
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestProbeCache(unittest.TestCase):
+    """Test cases for the persistent ProbeCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'probe_cache.json')
+        self.clock = Clock(NOW)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_url_dates(self):
+        """Test that meeting dates are read from the common URL layouts"""
+        self.assertEqual(url_date(OLD), datetime(2025, 6, 10))
+        self.assertEqual(url_date('https://y/sites/default/files/2025-09/20250909-council-agenda.pdf'),
+                         datetime(2025, 9, 9))
+        self.assertEqual(url_date('https://s/council-meetings/2025/09-september-2025/agenda.pdf'),
+                         datetime(2025, 9, 9))
+        self.assertIsNone(url_date('https://x/agenda.pdf'))
+
+    def test_old_misses_outlive_recent_ones(self):
+        """Test that misses for old meetings are kept longer than recent ones"""
+        cache = ProbeCache(self.path, clock=self.clock)
+        cache.put(OLD, False)
+        cache.put(NEAR, False)
+        self.clock.now += 2 * 86400
+        self.assertIs(cache.get(OLD), False)
+        self.assertIsNone(cache.get(NEAR))
+
+    def test_round_trip_is_compact(self):
+        """Test that saved entries are short hashed keys and reload unchanged"""
+        cache = ProbeCache(self.path, clock=self.clock)
+        cache.put(OLD, False)
+        cache.put(NEAR, True)
+        cache.save()
+        with open(self.path) as f:
+            entries = json.load(f)['entries']
+        self.assertTrue(all(len(k) == 16 and len(v) == 2 for k, v in entries.items()))
+        reloaded = ProbeCache(self.path, clock=self.clock)
+        self.assertEqual((reloaded.get(OLD), reloaded.get(NEAR)), (False, True))
+
+    def test_concurrent_savers_merge(self):
+        """Test that two processes saving the same file keep each other's entries"""
+        # Two shard processes that loaded the same (empty) file
+        a = ProbeCache(self.path, clock=self.clock)
+        b = ProbeCache(self.path, clock=self.clock)
+        a.put(OLD, False)
+        b.put(NEAR, True)
+        a.save()
+        b.save()
+        reloaded = ProbeCache(self.path, clock=self.clock)
+        self.assertEqual((reloaded.get(OLD), reloaded.get(NEAR)), (False, True))
+        self.assertEqual([n for n in os.listdir(self.tmp.name) if n.endswith('.tmp')], [])
+
+    def test_memo_uses_store_and_skips_inconclusive(self):
+        """Test that ProbeMemo answers from the cache but does not store inconclusive probes"""
+        calls = []
+        memo = ProbeMemo(ProbeCache(self.path, clock=self.clock))
+        memo.probe(OLD, lambda u: calls.append(u) or False)
+        memo.probe(NEAR, lambda u: calls.append(u) or None)  # e.g. a timeout
+        memo.clear()  # next run
+        self.assertFalse(memo.probe(OLD, lambda u: calls.append(u) or True))
+        memo.probe(NEAR, lambda u: calls.append(u) or True)
+        self.assertEqual(calls, [OLD, NEAR, NEAR])
+        self.assertEqual(memo.stats()['cached'], 1)
+
+    def test_outcomes_are_kept_per_mode(self):
+        """Test that an outcome is stored only for the mode it was probed in"""
+        cache = ProbeCache(self.path, clock=self.clock)
+        cache.put(OLD, True, PROBE_PDF)
+        self.assertIs(cache.get(OLD, PROBE_PDF), True)
+        self.assertIsNone(cache.get(OLD, PROBE_PDF_TYPE))
+
+    def test_lenient_redirector_hits_are_not_stored(self):
+        """Test that redirector hits are stored only from strict type checks"""
+        redir = 'https://x.infocouncil.biz/RedirectToDoc.aspx?URL=Open/2025/06/ORD_10062025_AGN.PDF'
+        cache = ProbeCache(self.path, clock=self.clock)
+        cache.put(redir, True, PROBE_PDF)
+        self.assertIsNone(cache.get(redir, PROBE_PDF))
+        cache.put(redir, True, PROBE_PDF_TYPE)
+        self.assertIs(cache.get(redir, PROBE_PDF_TYPE), True)
+
+    def test_old_version_files_are_dropped(self):
+        """Test that entries from an older cache version are discarded"""
+        # Version 1 entries were keyed by URL alone
+        with open(self.path, 'w') as f:
+            json.dump({'version': 1, 'entries': {'0123456789abcdef': [1, NOW + 86400]}}, f)
+        cache = ProbeCache(self.path, clock=self.clock)
+        self.assertEqual(len(cache), 0)
+        cache.put(NEAR, True)
+        cache.save()
+        with open(self.path) as f:
+            data = json.load(f)
+        self.assertEqual((data['version'], len(data['entries'])), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the declarative URL-template probe engine
+"""
+
+import sys
+import threading
+import time
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.probe_engine import (
+    ProbeEngine, ProbeSpec, UrlTemplate, infocouncil_template, nth_weekdays, weekly,
+)
+from src.utils.probe_memo import ProbeMemo
+
+NOW = datetime(2025, 9, 19, 12, 0)  # a Friday
+
+
+class TestDateGenerators(unittest.TestCase):
+    """Test cases for the meeting date generators"""
+
+    def test_weekly_newest_first_never_future(self):
+        """Test that weekly dates come newest first and never after today"""
+        self.assertEqual(list(weekly([1, 4], weeks=2, now=NOW)),
+                         [date(2025, 9, 16), date(2025, 9, 19), date(2025, 9, 9), date(2025, 9, 12)])
+
+    def test_second_and_fourth_tuesday(self):
+        """Test that nth_weekdays yields the 2nd and 4th Tuesdays, newest first"""
+        self.assertEqual(list(nth_weekdays(1, (2, 4), months=2, now=NOW)),
+                         [date(2025, 9, 9), date(2025, 8, 26), date(2025, 8, 12)])
+
+
+class TestProbeEngine(unittest.TestCase):
+    """Test cases for ProbeEngine"""
+
+    def _engine(self, live, **kwargs):
+        calls = []
+        lock = threading.Lock()
+
+        def check(url):
+            with lock:
+                calls.append(url)
+            return url in live
+
+        return ProbeEngine(check, memo=ProbeMemo(), **kwargs), calls
+
+    def test_alternatives_and_grid(self):
+        """Test that every template alternative is tried for each date and hits are reported"""
+        live = {'https://x.infocouncil.biz/RedirectToDoc.aspx?URL=Open/2025/09/OCM_16092025_AGN.PDF'}
+        engine, calls = self._engine(live)
+        spec = ProbeSpec(
+            templates=[infocouncil_template('agenda', '{prefix}_{ddmmyyyy}_AGN.PDF', prefix=['ORD', 'OCM'])],
+            dates=weekly([1], weeks=1, now=NOW),
+            context={'base': 'https://x.infocouncil.biz'},
+        )
+        report = engine.run(spec)
+        self.assertEqual([(h.url, h.iso, h.document_type) for h in report.hits],
+                         [(list(live)[0], '2025-09-16', 'agenda')])
+        self.assertEqual((report.candidates, report.requests), (2, 4))
+        self.assertEqual(report.requests_per_document, 4.0)
+
+    def test_stops_once_enough_hits(self):
+        """Test that probing stops once max_hits documents are found"""
+        engine, calls = self._engine(set(), max_workers=1)
+        engine.check = lambda url: True
+        spec = ProbeSpec(
+            templates=[UrlTemplate('agenda', ['https://x/{iso}.pdf'])],
+            dates=weekly([1], weeks=52, now=NOW),
+            max_hits=3,
+        )
+        report = engine.run(spec)
+        self.assertTrue(report.stopped_early)
+        self.assertLess(report.candidates, 10)
+        self.assertEqual(report.hits[0].iso, '2025-09-16')
+
+    def test_probes_concurrently_within_host_limit(self):
+        """Test that probes run concurrently but never more than per_host at once"""
+        active = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def check(url):
+            with lock:
+                active['now'] += 1
+                active['max'] = max(active['max'], active['now'])
+            time.sleep(0.02)
+            with lock:
+                active['now'] -= 1
+            return False
+
+        engine = ProbeEngine(check, max_workers=8, per_host=3, memo=ProbeMemo())
+        spec = ProbeSpec(templates=[UrlTemplate('agenda', ['https://x/{iso}.pdf'])],
+                         dates=weekly([0, 1, 2, 3, 4], weeks=4, now=NOW))
+        report = engine.run(spec)
+        self.assertEqual(report.requests, 20)
+        self.assertEqual(active['max'], 3)
+        self.assertIsNone(report.requests_per_document)
+
+
+if __name__ == '__main__':
+    unittest.main()
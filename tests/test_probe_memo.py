@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-run probe memo
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.probe_memo import PROBE_PDF, PROBE_PDF_TYPE, ProbeMemo, infocouncil_variants, range_probe
+
+
+class FakeResponse:
+    def __init__(self, status_code, ctype):
+        self.status_code = status_code
+        self.headers = {'Content-Type': ctype}
+
+
+class FakeSession:
+    def __init__(self, live, html=()):
+        self.live = live
+        self.html = set(html)
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append((url, headers.get('Range')))
+        if url in self.live:
+            return FakeResponse(206, 'application/pdf')
+        if url in self.html:
+            return FakeResponse(200, 'text/html')
+        return FakeResponse(404, 'text/html')
+
+
+BASE = 'https://x.infocouncil.biz'
+PATH = 'Open/2025/09/ORD_09092025_AGN.PDF'
+
+
+class TestProbeMemo(unittest.TestCase):
+    """Test cases for ProbeMemo and range probes"""
+
+    def test_resolve_returns_first_working_variant_once(self):
+        """Test that resolve finds the first working variant and probes it only once"""
+        direct, redir = infocouncil_variants(BASE, PATH)
+        session = FakeSession({redir})
+        memo = ProbeMemo()
+        check = lambda u: range_probe(session, u, strict_type=True)
+
+        self.assertEqual(memo.resolve([direct, redir], check), redir)
+        self.assertEqual(memo.resolve([direct, redir], check), redir)
+        # The redirector spelling of the same document is a memo hit too
+        self.assertEqual(memo.resolve([redir, direct], check), redir)
+        self.assertEqual(session.calls, [(direct, 'bytes=0-0'), (redir, 'bytes=0-0')])
+        self.assertEqual(memo.stats()['probes'], 2)
+
+    def test_direct_hit_needs_one_request(self):
+        """Test that a working direct URL is resolved with a single request"""
+        direct, redir = infocouncil_variants(BASE, PATH)
+        session = FakeSession({direct})
+        memo = ProbeMemo()
+        self.assertEqual(memo.resolve([direct, redir], lambda u: range_probe(session, u)), direct)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_misses_are_memoised_and_clear_resets(self):
+        """Test that failed probes are memoised until clear() is called"""
+        session = FakeSession(set())
+        memo = ProbeMemo()
+        check = lambda u: range_probe(session, u)
+        self.assertIsNone(memo.resolve(infocouncil_variants(BASE, PATH), check))
+        self.assertFalse(memo.probe(f"{BASE}/{PATH}", check))
+        self.assertEqual(len(session.calls), 2)
+        memo.clear()
+        memo.probe(f"{BASE}/{PATH}", check)
+        self.assertEqual(len(session.calls), 3)
+
+    def test_redirector_html_page_is_not_a_document(self):
+        """Test that a redirector answering with an HTML page is not counted as a document"""
+        # RedirectToDoc.aspx answers 200 text/html for documents that don't exist
+        direct, redir = infocouncil_variants(BASE, PATH)
+        session = FakeSession(set(), html={redir})
+        self.assertFalse(range_probe(session, redir))
+        self.assertIsNone(ProbeMemo().resolve([direct, redir], lambda u: range_probe(session, u)))
+
+    def test_modes_are_memoised_separately(self):
+        """Test that a URL probed in different modes is memoised per mode"""
+        url = 'https://x.example/agenda.pdf'
+        session = FakeSession(set(), html={url})
+        memo = ProbeMemo()
+        self.assertTrue(memo.probe(url, lambda u: range_probe(session, u), PROBE_PDF))
+        self.assertFalse(memo.probe(url, lambda u: range_probe(session, u, strict_type=True), PROBE_PDF_TYPE))
+        self.assertTrue(memo.probe(url, lambda u: range_probe(session, u), PROBE_PDF))
+        self.assertEqual(len(session.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for per-council and per-post profiling
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.posting.scheduler import Scheduler
+from src.utils.profiling import Profiler, get_profiler, start_profiler
+
+
+def busy_parse(n):
+    return sum(len(str(i)) for i in range(n))
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for the opt-in Profiler"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / 'profiles'
+
+    def tearDown(self):
+        tracemalloc.stop()
+        self.tmp.cleanup()
+
+    def test_units_write_profiles_and_merged_summary(self):
+        """Test that each unit writes its own profile and the summary merges them"""
+        profiler = Profiler(str(self.dir))
+        for name in ('Moonee Valley', 'Moonee Valley', 'Yarra'):
+            with profiler.unit('scrape', name):
+                busy_parse(20000)
+        files = sorted(p.name for p in self.dir.glob('*.prof'))
+        self.assertEqual(files, ['scrape-moonee-valley-2.prof', 'scrape-moonee-valley.prof', 'scrape-yarra.prof'])
+        summary = profiler.write_summary().read_text()
+        self.assertIn('busy_parse', summary)
+        self.assertIn('Hot functions across 3 units', summary)
+        self.assertIn('scrape: 3 units', summary)
+
+    def test_council_filter_ignores_case_and_punctuation(self):
+        """Test that the council filter matches names and ids loosely and skips the rest"""
+        profiler = Profiler(str(self.dir), councils=['moonee-valley', 'BRIM'])
+        self.assertTrue(profiler.wants('Moonee Valley'))
+        self.assertTrue(profiler.wants('Brimbank City Council', 'brim'))
+        self.assertFalse(profiler.wants('Yarra', 'YarraFixedScraper'))
+        with profiler.unit('scrape', 'Yarra'):
+            pass
+        self.assertEqual(profiler.units, [])
+
+    def test_nested_units_profile_once(self):
+        """Test that a unit inside another is not profiled separately"""
+        profiler = Profiler(str(self.dir))
+        with profiler.unit('scrape', 'Darebin'):
+            with profiler.unit('post', 'Darebin'):
+                busy_parse(100)
+        self.assertEqual([u['stage'] for u in profiler.units], ['scrape'])
+
+    def test_memory_growth(self):
+        """Test that memory mode reports growth per unit and where it was allocated"""
+        profiler = Profiler(str(self.dir), memory=True)
+        kept = []
+        with profiler.unit('scrape', 'Melbourne'):
+            kept.append([str(i) * 10 for i in range(20000)])
+        unit = profiler.units[0]
+        self.assertGreater(unit['memory_growth'], 500_000)
+        self.assertTrue(any('test_profiling.py' in where for where, _ in unit['memory_top']))
+        self.assertIn('Memory growth by unit', profiler.summary_text())
+
+    def test_disabled_profiler_writes_nothing(self):
+        """Test that a profiler without an output directory records nothing"""
+        profiler = Profiler()
+        with profiler.unit('scrape', 'Melbourne'):
+            busy_parse(10)
+        self.assertIsNone(profiler.write_summary())
+        self.assertEqual(profiler.units, [])
+
+    def test_scheduler_profiles_each_prepared_post(self):
+        """Test that the posting scheduler profiles each selected council's post"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        docs = [{'council_id': cid, 'council_name': name, 'document_type': 'agenda', 'meeting_type': 'council',
+                 'title': f"{name} Agenda", 'date': today, 'url': f"https://{cid}.example/agenda.pdf"}
+                for cid, name in (('alpha', 'Alpha City Council'), ('beta', 'Beta Shire Council'))]
+        os.environ['FAST_PREVIEW'] = '1'
+        start_profiler(str(self.dir), councils=['alpha'])
+        try:
+            sched = Scheduler(results={'documents': docs}, posted_file=os.path.join(self.tmp.name, 'posted.json'),
+                              dry_run=True, seed=1)
+            self.assertEqual(len(sched.run()), 2)
+            units = get_profiler().units
+        finally:
+            start_profiler(None)
+            os.environ.pop('FAST_PREVIEW', None)
+        self.assertEqual([(u['stage'], u['name']) for u in units], [('post', 'Alpha City Council')])
+        self.assertTrue((self.dir / 'post-alpha-city-council.prof').exists())
+        self.assertFalse(get_profiler().enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
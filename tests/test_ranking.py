@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared document ranking engine
+"""
+
+import random
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.posting.ranking import RankingEngine, parse_doc_date
+
+
+def _doc(council, url, doc_type='agenda', date_str='2025-10-07', meeting_type='council'):
+    return {
+        'council_name': council,
+        'url': url,
+        'document_type': doc_type,
+        'date': date_str,
+        'meeting_type': meeting_type,
+        'title': f"{council} {doc_type}",
+    }
+
+
+class TestRankingEngine(unittest.TestCase):
+    """Test cases for RankingEngine"""
+
+    def setUp(self):
+        self.today = date(2025, 10, 3)
+        self.docs = [
+            _doc('A', 'https://a/1.pdf', 'minutes', '2025-06-01'),
+            _doc('B', 'https://b/1.pdf', 'agenda', '2025-10-07'),
+            _doc('C', 'https://c/1.pdf', 'agenda', '07/10/2025', 'Special Meeting'),
+            _doc('D', 'https://d/1.pdf', 'minutes', 'not a date'),
+        ]
+
+    def test_parse_doc_date_formats(self):
+        """Test that all scraped date formats parse to the same day"""
+        for s in ('2025-10-07', '07/10/2025', '7 October 2025', 'October 7, 2025'):
+            self.assertEqual(parse_doc_date(s).date(), date(2025, 10, 7))
+        self.assertIsNone(parse_doc_date(''))
+        self.assertIsNone(parse_doc_date('TBC'))
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed gives the same order"""
+        a = RankingEngine(seed=42, today=self.today).rank(self.docs)
+        b = RankingEngine(seed=42, today=self.today).rank(list(reversed(self.docs)))
+        self.assertEqual([d['url'] for d in a], [d['url'] for d in b])
+
+    def test_top_k_matches_full_rank(self):
+        """Test that top-k and lazy iteration agree with a full sort"""
+        engine = RankingEngine(seed=7, today=self.today)
+        full = engine.rank(self.docs)
+        self.assertEqual(engine.top_k(self.docs, 2), full[:2])
+        self.assertEqual(list(engine.iter_ranked(self.docs, k=1)), full)
+        # Upcoming special agenda should beat an old minutes document
+        self.assertEqual(full[0]['council_name'], 'C')
+
+    def test_unseeded_jitter_is_drawn_per_pass(self):
+        """Test that unseeded jitter changes between passes but not within one"""
+        engine = RankingEngine(today=self.today)
+        engine._rng = random.Random(3)
+        doc = self.docs[1]
+        draws = set()
+        for _ in range(20):
+            engine.rank(self.docs)
+            first = engine.score(doc)
+            self.assertEqual(engine.score(doc), first)
+            draws.add(first)
+        self.assertGreater(len(draws), 1)
+
+    def test_newest_first_uses_score_only_for_ties(self):
+        """Test that newest_first orders by date before score"""
+        engine = RankingEngine(seed=5, today=self.today)
+        docs = [_doc('A', 'https://a/old.pdf', 'agenda', '2025-10-07', 'Special Meeting'),
+                _doc('A', 'https://a/new.pdf', 'minutes', '2025-10-20'),
+                _doc('A', 'https://a/same.pdf', 'agenda', '2025-10-20')]
+        top = engine.top_k(docs, 3, newest_first=True)
+        self.assertEqual([d['url'] for d in top],
+                         ['https://a/same.pdf', 'https://a/new.pdf', 'https://a/old.pdf'])
+
+    def test_newest_first_ties_are_stable_without_seed(self):
+        """Test that same-date, same-score documents keep one order across unseeded passes"""
+        engine = RankingEngine(today=self.today)
+        docs = [_doc('A', f"https://a/{n}.pdf", 'agenda', '2025-10-07') for n in 'qxbm']
+        orders = {tuple(d['url'] for d in engine.top_k(docs, 4, newest_first=True)) for _ in range(20)}
+        self.assertEqual(orders, {('https://a/x.pdf', 'https://a/q.pdf', 'https://a/m.pdf', 'https://a/b.pdf')})
+
+    def test_documents_not_mutated(self):
+        """Test that ranking does not add private keys to documents"""
+        RankingEngine(seed=1, today=self.today).rank(self.docs)
+        self.assertTrue(all('_score' not in d for d in self.docs))
+
+
+if __name__ == '__main__':
+    unittest.main()
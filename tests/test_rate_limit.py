@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the persisted token-bucket rate limiter
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.posting.rate_limit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = str(Path(self.tmp.name) / 'limits.json')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _limiter(self):
+        return RateLimiter(state_file=self.state, limits={'createRecord': [(2, 60)]}, clock=self.clock)
+
+    def test_sleeps_only_when_empty(self):
+        """Test that a full bucket never sleeps and an empty one waits for one token"""
+        limiter = self._limiter()
+        sleeps = []
+
+        def sleep(s):
+            sleeps.append(s)
+            self.clock.t += s
+
+        limiter.acquire('createRecord', sleep=sleep)
+        limiter.acquire('createRecord', sleep=sleep)
+        self.assertEqual(sleeps, [])
+        limiter.acquire('createRecord', sleep=sleep)
+        self.assertEqual(sleeps, [30.0])
+
+    def test_state_survives_restart(self):
+        """Test that tokens spent before a restart stay spent"""
+        limiter = self._limiter()
+        limiter.consume('createRecord', 2)
+        restarted = self._limiter()
+        self.assertAlmostEqual(restarted.wait_time('createRecord'), 30.0)
+        self.clock.t += 60
+        self.assertEqual(restarted.wait_time('createRecord'), 0.0)
+
+    def test_headers_block_until_reset(self):
+        """Test that a 429 with ratelimit-reset blocks the action"""
+        limiter = self._limiter()
+        limiter.update_from_headers('createRecord', {
+            'ratelimit-limit': '5000',
+            'ratelimit-remaining': '0',
+            'ratelimit-reset': str(int(self.clock.t + 600)),
+            'ratelimit-policy': '5000;w=3600',
+        }, status=429)
+        self.assertAlmostEqual(limiter.wait_time('createRecord'), 600.0)
+        self.assertAlmostEqual(self._limiter().wait_time('createRecord'), 600.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for in-process command dispatch in run.py
+"""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+class TestRunDispatch(unittest.TestCase):
+    """Test cases for run.py command dispatch"""
+
+    def _run(self, code):
+        return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    def test_status_runs_in_process_without_heavy_imports(self):
+        """Test that status runs in-process without importing atproto or the scrapers"""
+        out = self._run(
+            "import sys, run; code = run.main(['status']); "
+            "print('RESULT', code, any(m in sys.modules for m in ('atproto', 'cloudscraper', 'universal_scraper')))"
+        )
+        self.assertIn('RESULT 0 False', out.stdout)
+
+    def test_run_script_returns_exit_code(self):
+        """Test that run_script returns the script's exit code"""
+        out = self._run(
+            "import run, tempfile, os\n"
+            "f = tempfile.NamedTemporaryFile('w', suffix='.py', delete=False)\n"
+            "f.write('import sys; sys.exit(3)'); f.close()\n"
+            "print('RESULT', run.run_script(f.name)); os.unlink(f.name)"
+        )
+        self.assertIn('RESULT 3', out.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
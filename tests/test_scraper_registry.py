@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy scraper registry
+"""
+
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src' / 'scrapers'))
+
+import scraper_registry as registry
+
+
+class TestScraperRegistry(unittest.TestCase):
+    """Test cases for the lazy scraper registry"""
+
+    def test_all_paths_resolve(self):
+        """Test that every registered scraper and council type imports"""
+        for name, path in registry.SCRAPER_PATHS.items():
+            self.assertEqual(registry.get_scraper_class(name).__name__, path.split(':')[1])
+        for council_type in registry.TYPE_PATHS:
+            scraper_class, _ = registry.get_type_classes(council_type)
+            self.assertTrue(hasattr(scraper_class, 'scrape'))
+
+    def test_m9_scrapers_are_registered(self):
+        """Test that every M9 scraper name has an import path"""
+        for _, name, _ in registry.M9_SCRAPERS:
+            self.assertIn(name, registry.SCRAPER_PATHS)
+
+    def test_m9_ids_match_document_ids(self):
+        """Test that each M9 row id is the council_id its scraper puts on documents"""
+        for _, name, council_id in registry.M9_SCRAPERS:
+            self.assertEqual(registry.get_scraper_class(name)().council_id, council_id)
+
+    def test_unknown_names(self):
+        """Test that unknown scraper names raise and unknown types fall back to the generic scraper"""
+        with self.assertRaises(KeyError):
+            registry.get_scraper_class('NoSuchScraper')
+        scraper_class, config_class = registry.get_type_classes('something_new')
+        self.assertEqual(scraper_class.__name__, 'SmartCouncilScraper')
+        self.assertIsNone(config_class)
+
+    def test_universal_scraper_import_is_lazy(self):
+        """Test that importing universal_scraper loads no scraper modules"""
+        code = ("import sys, universal_scraper; "
+                "print(any(m in sys.modules for m in ('cloudscraper', 'bs4', 'melbourne_m9_v2')))")
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for registry sharding and shard results merging
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'src' / 'scrapers'))
+
+from scraper_registry import M9_SCRAPERS
+from src.utils.sharding import merge_results, parse_shard, select_shard, shard_of, shard_path
+
+REGISTRY = Path(__file__).parent.parent / 'src' / 'registry' / 'all_councils.json'
+
+
+class TestSharding(unittest.TestCase):
+    """Test cases for sharding and merge_results"""
+
+    def test_parse_shard(self):
+        """Test that shard specs parse as i/N and bad ones raise ValueError"""
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        for bad in ('0/4', '5/4', '1/0', 'x', '1/2/3'):
+            with self.assertRaises(ValueError):
+                parse_shard(bad)
+
+    def test_shards_partition_registry(self):
+        """Test that the shards cover every registry council exactly once"""
+        councils = json.loads(REGISTRY.read_text())['councils']
+        shards = [select_shard(councils, i, 4, key=lambda c: c['id']) for i in range(1, 5)]
+        ids = [c['id'] for shard in shards for c in shard]
+        self.assertEqual(sorted(ids), sorted(c['id'] for c in councils))
+        self.assertTrue(all(shards))
+
+    def test_assignment_is_stable(self):
+        """Test that shard assignment is deterministic"""
+        # CRC32-based, so the same across processes and Python versions
+        self.assertEqual(shard_of('melbourne', 4), shard_of('melbourne', 4))
+        self.assertEqual([shard_of(k, 3) for k in ('a', 'b', 'c')], [1, 3, 1])
+
+    def test_shard_path(self):
+        """Test that shard results files are named after the output path"""
+        self.assertEqual(shard_path('out/results.json', 2, 4), 'out/results.shard-2-of-4.json')
+
+    def test_merge_dedupes_by_canonical_url(self):
+        """Test that merging dedupes documents by canonical URL and combines run metadata"""
+        doc = {'council_name': 'Darebin', 'url': 'https://d.infocouncil.biz/Open/2025/09/ORD_AGN.PDF'}
+        redirected = dict(doc, url='https://d.infocouncil.biz/RedirectToDoc.aspx?URL=Open/2025/09/ORD_AGN.PDF')
+        other = {'council_name': 'Yarra', 'url': 'https://y.example/minutes.pdf'}
+        parts = [
+            {'scrape_date': '2025-09-01T10:00:00', 'total_scrape_time': 40.0,
+             'council_stats': [{'id': 'darebin', 'working': True}],
+             'host_metrics': {'d.infocouncil.biz': {'requests': 3, 'rate': 2.0}},
+             'documents': [doc]},
+            {'scrape_date': '2025-09-01T10:05:00', 'total_scrape_time': 55.0,
+             'council_stats': [{'id': 'yarra', 'working': False}],
+             'host_metrics': {'d.infocouncil.biz': {'requests': 2, 'rate': 1.0}},
+             'documents': [redirected, other]},
+        ]
+        merged = merge_results(parts)
+        self.assertEqual(merged['documents'], [doc, other])
+        self.assertEqual(merged['total_documents'], 2)
+        self.assertEqual((merged['total_councils'], merged['working_councils']), (2, 1))
+        self.assertEqual(merged['scrape_date'], '2025-09-01T10:05:00')
+        self.assertEqual(merged['total_scrape_time'], 55.0)
+        self.assertEqual(merged['host_metrics']['d.infocouncil.biz']['requests'], 5)
+
+    def test_merge_moves_cross_shard_duplicates_out_of_council_counts(self):
+        """Test that documents lost as cross-shard duplicates come off their council's counts"""
+        url = 'https://d.infocouncil.biz/Open/2025/09/ORD_AGN.PDF'
+        agenda = {'council_id': 'darebin', 'document_type': 'agenda', 'url': url}
+        parts = [
+            {'council_stats': [{'id': 'darebin', 'total': 1, 'agendas': 1, 'minutes': 0}],
+             'documents': [agenda]},
+            {'council_stats': [{'id': 'darebin-m9', 'name': 'Darebin', 'total': 2, 'agendas': 1, 'minutes': 1}],
+             'documents': [dict(agenda, council_id='darebin-m9'),
+                           {'council_name': 'Darebin', 'document_type': 'minutes', 'url': url.replace('AGN', 'MIN')},
+                           {'council_name': 'Darebin', 'url': ''}]},
+        ]
+        merged = merge_results(parts)
+        self.assertEqual(merged['total_documents'], 2)
+        self.assertEqual(sum(s['total'] for s in merged['council_stats']), merged['total_documents'])
+        self.assertEqual(merged['council_stats'][1],
+                         {'id': 'darebin-m9', 'name': 'Darebin', 'total': 1, 'agendas': 0, 'minutes': 1,
+                          'collapsed': 1})
+        self.assertEqual(parts[1]['council_stats'][0]['total'], 2)
+
+    def test_merge_uncounts_m9_duplicates_by_document_council_id(self):
+        """Test that a duplicate M9 document comes off the M9 row, whose id matches the document's"""
+        name, _, council_id = next(row for row in M9_SCRAPERS if row[0] == 'Darebin')
+        url = 'https://www.darebin.vic.gov.au/files/agenda-2025-09-08.pdf'
+        agenda = {'council_id': 'darebin', 'council_name': 'Darebin City Council',
+                  'document_type': 'agenda', 'url': url}
+        parts = [
+            {'council_stats': [{'id': 'darebin', 'total': 1, 'agendas': 1, 'minutes': 0}],
+             'documents': [agenda]},
+            {'council_stats': [{'id': council_id, 'name': name, 'total': 1, 'agendas': 1, 'minutes': 0}],
+             'documents': [dict(agenda, council_id=council_id)]},
+        ]
+        merged = merge_results(parts)
+        self.assertEqual(merged['council_stats'][1],
+                         {'id': council_id, 'name': name, 'total': 0, 'agendas': 0, 'minutes': 0,
+                          'collapsed': 1})
+
+    def test_merge_script_globs_shard_files(self):
+        """Test that the merge script finds and merges the shard files for an output path"""
+        from scripts import merge_results as script
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'results.json')
+            for i in (1, 2):
+                with open(shard_path(output, i, 2), 'w') as f:
+                    json.dump({'council_stats': [{'id': f'c{i}', 'working': True}],
+                               'documents': [{'url': f'https://x/{i}.pdf'}]}, f)
+            self.assertEqual(script.main(['--output', output]), 0)
+            with open(output) as f:
+                merged = json.load(f)
+        self.assertEqual(merged['shards'], 2)
+        self.assertEqual(merged['total_documents'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
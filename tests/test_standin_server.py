@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline council-site stand-in server
+"""
+
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / 'src' / 'scrapers'))
+
+from src.utils.standin_server import SiteModel, StandinServer, routed_to
+
+TODAY = date(2025, 9, 19)
+HOST = 'brimbank.infocouncil.biz'
+
+
+class TestStandinServer(unittest.TestCase):
+    """Test cases for the stand-in council server"""
+
+    def setUp(self):
+        self.model = SiteModel(today=TODAY, months_back=2)
+
+    def test_meetings_are_second_and_fourth_weekday(self):
+        """Test that meetings fall on one weekday in the 2nd and 4th weeks, with no future minutes"""
+        meetings = self.model.meetings(HOST)
+        self.assertEqual(len({d.weekday() for d in meetings}), 1)
+        self.assertTrue(all(8 <= d.day <= 14 or 22 <= d.day <= 28 for d in meetings))
+        kinds = dict(((d, k), True) for d, k in self.model.documents(HOST))
+        future = [d for d in meetings if d > TODAY]
+        self.assertFalse(any((d, 'minutes') in kinds for d in future))
+
+    def test_listing_range_and_missing_pdf(self):
+        """Test that listings, range requests and missing PDFs are served like the real sites"""
+        when = self.model.meetings(HOST)[0]
+        with StandinServer(self.model) as server, routed_to(server.base_url):
+            listing = requests.get(f"https://{HOST}/Open/{when:%Y/%m}/", timeout=5)
+            self.assertIn(SiteModel.infocouncil_name(when, 'agenda'), listing.text)
+            self.assertEqual(listing.url, f"https://{HOST}/Open/{when:%Y/%m}/")
+
+            pdf = f"https://{HOST}/Open/{when:%Y/%m}/{SiteModel.infocouncil_name(when, 'minutes')}"
+            part = requests.get(pdf, headers={'Range': 'bytes=0-3'}, timeout=5)
+            self.assertEqual((part.status_code, part.content), (206, b'%PDF'))
+            missing = pdf.replace(f"{when:%d}", f"{when.day + 1:02d}", 1)
+            self.assertEqual(requests.get(missing, timeout=5).status_code, 404)
+            self.assertEqual(server.stats()['by_status'], {'200': 1, '206': 1, '404': 1})
+
+    def test_redirector_serves_existing_pdfs_only(self):
+        """Test that the redirector serves only PDFs that exist under their exact name"""
+        when = self.model.meetings(HOST)[0]
+        name = SiteModel.infocouncil_name(when, 'agenda')
+        redirector = f"https://{HOST}/RedirectToDoc.aspx?URL=Open/{when:%Y/%m}/"
+        with StandinServer(self.model) as server, routed_to(server.base_url):
+            found = requests.get(redirector + name, timeout=5)
+            self.assertEqual((found.status_code, found.headers['Content-Type']), (200, 'application/pdf'))
+            missing = redirector + name.replace(f"{when:%d}", f"{when.day + 1:02d}", 1)
+            self.assertEqual(requests.get(missing, timeout=5).status_code, 404)
+            guessed = redirector + name.replace('ORD_', 'OCM_')
+            self.assertEqual(requests.get(guessed, timeout=5).status_code, 404)
+
+    def test_error_injection(self):
+        """Test that injected errors and dropped connections reach the client"""
+        with StandinServer(self.model, error_rate=1.0, error_status=429) as server, routed_to(server.base_url):
+            self.assertEqual(requests.get('https://www.hume.vic.gov.au/', timeout=5).status_code, 429)
+        with StandinServer(self.model, drop_rate=1.0) as server, routed_to(server.base_url):
+            with self.assertRaises(requests.ConnectionError):
+                requests.get('https://www.hume.vic.gov.au/', timeout=5)
+            self.assertEqual(server.stats()['by_status'], {'dropped': 1})
+
+    def test_infocouncil_scraper_end_to_end(self):
+        """Test that the InfoCouncil scraper finds the modelled documents through the stand-in"""
+        from infocouncil_generic import InfoCouncilConfig, InfoCouncilScraper
+        model = SiteModel(months_back=2)
+        config = InfoCouncilConfig('BRIM', 'Brimbank City Council', f"https://{HOST}", months_back=2)
+        with StandinServer(model) as server, routed_to(server.base_url):
+            docs = InfoCouncilScraper(config).scrape()
+        listed = {(d.isoformat(), k) for d, k in model.documents(HOST) if d <= date.today()}
+        found = {(d.date, d.document_type) for d in docs}
+        self.assertTrue(found)
+        self.assertLessEqual(found, {(d.isoformat(), k) for d, k in model.documents(HOST)})
+        self.assertTrue(found & listed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for URL canonicalisation and document dedupe hashes
+"""
+
+import hashlib
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.url_canonicalize import (
+    canonicalize_doc_url, document_hashes, hash_documents, url_only_hash,
+)
+
+DIRECT = 'https://d.infocouncil.biz/Open/2025/09/ORD_09092025_AGN.PDF'
+REDIRECT = 'https://d.infocouncil.biz/RedirectToDoc.aspx?URL=Open/2025/09/ORD_09092025_AGN.PDF'
+
+
+def md5(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+class TestCanonicalize(unittest.TestCase):
+    """Test cases for document URL canonicalisation and hashes"""
+
+    def test_redirector_matches_direct(self):
+        """Test that redirector and fragment spellings canonicalise to the direct URL"""
+        self.assertEqual(canonicalize_doc_url(REDIRECT), DIRECT)
+        self.assertEqual(canonicalize_doc_url(DIRECT + '?x=1#p2'), DIRECT)
+        self.assertEqual(canonicalize_doc_url('https://x.example/a.pdf?v=2#top'), 'https://x.example/a.pdf?v=2')
+
+    def test_results_are_memoised(self):
+        """Test that canonicalize_doc_url caches its results"""
+        canonicalize_doc_url.cache_clear()
+        canonicalize_doc_url(REDIRECT)
+        canonicalize_doc_url(REDIRECT)
+        self.assertEqual(canonicalize_doc_url.cache_info().hits, 1)
+
+    def test_hashes_match_stored_formats(self):
+        """Test that document hashes match the formats stored in posted_bluesky.json"""
+        # posted_bluesky.json holds hashes in these exact formats
+        hashes = document_hashes('Darebin', 'Agenda', REDIRECT)
+        self.assertEqual(hashes.url_only, md5(f"Darebin|{DIRECT}"))
+        self.assertEqual(hashes.legacy_canon, md5(f"Darebin|Agenda|{DIRECT}"))
+        self.assertEqual(hashes.legacy_raw, md5(f"Darebin|Agenda|{REDIRECT}"))
+        self.assertEqual(url_only_hash('Darebin', DIRECT), hashes.url_only)
+
+    def test_batch_keeps_order(self):
+        """Test that hash_documents returns hashes in document order"""
+        docs = [{'council_name': 'A', 'title': 't', 'url': DIRECT},
+                {'council_name': 'B', 'title': 't', 'url': REDIRECT}]
+        self.assertEqual(hash_documents(docs), [document_hashes('A', 't', DIRECT), document_hashes('B', 't', REDIRECT)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 Universal Victorian Council Scraper - Supports all 79 councils
 """
 
+import os
 import sys
 import json
 import logging
@@ -13,20 +14,17 @@ from typing import List, Dict, Optional
 # Add scrapers to path
 sys.path.append('src/scrapers')
 
-# Import existing M9 scrapers
-from melbourne_m9_v2 import MelbourneScraper
-from darebin_m9 import DarebinScraper
-from hobsonsbay_m9_fixed import HobsonsBayScraper
-from m9_adapted import MaribyrnongScraper, MerribekScraper
-from moonee_valley_fixed import MooneeValleyFixedScraper
-from yarra_stonnington_fixed import YarraFixedScraper, StonningtonFixedScraper
-from m9_final_three_complete import PortPhillipFinalScraper
-
-# Import generic scrapers
-from infocouncil_generic import InfoCouncilScraper, InfoCouncilConfig
-from generic_direct import DirectPageScraper, DirectPageConfig
-from generic_json import JsonListScraper, JsonListConfig
-from generic_web import GenericCouncilScraper, SmartCouncilScraper
+# Scraper modules are imported lazily, per council, via the registry
+from scraper_registry import get_scraper_class, get_type_classes
+from src.utils.circuit_breaker import council_key, get_breaker, save_breaker
+from src.utils.http_politeness import get_scheduler
+from src.utils.instrumentation import get_instruments, write_prometheus
+from src.utils.profiling import add_profile_args, get_profiler, start_profiler_from_args
+from src.utils.dedup import DocumentIndex, council_counts
+from src.utils.http_cassette import start_cassette_from_env
+from src.utils.documents import serialize_documents
+from src.utils.probe_memo import get_probe_memo, reset_probe_memo, save_probe_memo
+from src.utils.sharding import merge_results, parse_shard, select_shard, shard_path
 
 # Setup logging
 logging.basicConfig(
@@ -38,12 +36,18 @@ logger = logging.getLogger(__name__)
 class VictorianCouncilScraper:
     """Universal scraper for all 79 Victorian councils"""
     
-    def __init__(self, registry_path='src/registry/all_councils.json'):
-        """Initialize with council registry"""
+    def __init__(self, registry_path='src/registry/all_councils.json', reuse_scrapers: bool = False):
+        """Initialize with council registry
+        
+        With reuse_scrapers, each council's scraper (and its HTTP session) is
+        kept and reused across scrapes, for long-running processes.
+        """
         self.registry_path = Path(registry_path)
         self.councils = self._load_registry()
         self.results = []
         self.stats = []
+        self.reuse_scrapers = reuse_scrapers
+        self._instances: Dict[str, object] = {}
         
     def _load_registry(self) -> List[Dict]:
         """Load council registry"""
@@ -56,89 +60,101 @@ class VictorianCouncilScraper:
             return data.get('councils', [])
     
     def scrape_council(self, council: Dict) -> List:
-        """Scrape a single council based on its configuration"""
-        council_id = council.get('id')
+        """Scrape a single council based on its configuration
+        
+        The outcome feeds the council's circuit breaker; while it is open the
+        scraper's probing fallbacks are skipped.
+        """
         council_name = council.get('name')
         council_type = council.get('type', 'generic')
+        circuit = self.circuit_key(council)
         
         logger.info(f"Scraping {council_name} ({council_type})...")
         
-        try:
-            # M9 councils with custom scrapers
-            if council_type == 'm9':
-                scraper_name = council.get('scraper')
-                if scraper_name == 'MelbourneScraper':
-                    scraper = MelbourneScraper()
-                elif scraper_name == 'DarebinScraper':
-                    scraper = DarebinScraper()
-                elif scraper_name == 'HobsonsBayScraper':
-                    scraper = HobsonsBayScraper()
-                elif scraper_name == 'MaribyrnongScraper':
-                    scraper = MaribyrnongScraper()
-                elif scraper_name == 'MerribekScraper':
-                    scraper = MerribekScraper()
-                elif scraper_name == 'MooneeValleyFixedScraper':
-                    scraper = MooneeValleyFixedScraper()
-                elif scraper_name == 'YarraFixedScraper':
-                    scraper = YarraFixedScraper()
-                elif scraper_name == 'StonningtonFixedScraper':
-                    scraper = StonningtonFixedScraper()
-                elif scraper_name == 'PortPhillipFinalScraper':
-                    scraper = PortPhillipFinalScraper()
-                else:
-                    logger.warning(f"Unknown M9 scraper: {scraper_name}")
-                    return []
+        breaker = get_breaker()
+        with breaker.council(circuit):
+            try:
+                scraper = self._instances.get(council.get('id')) if self.reuse_scrapers else None
+                if scraper is None:
+                    scraper = self._build_scraper(council)
+                    if scraper is None:
+                        return []
+                    if self.reuse_scrapers:
+                        self._instances[council.get('id')] = scraper
+                docs = scraper.scrape()
                 
-                return scraper.scrape()
-            
-            # InfoCouncil-based councils
-            elif council_type == 'infocouncil':
-                base_url = council.get('base_url', '')
-                config = InfoCouncilConfig(
-                    council_id=council_id,
-                    council_name=council_name,
-                    base_url=base_url,
-                    months_back=6
-                )
-                scraper = InfoCouncilScraper(config)
-                return scraper.scrape()
-            
-            # Direct page scrapers
-            elif council_type == 'direct_page':
-                config = DirectPageConfig(
-                    council_id=council_id,
-                    council_name=council_name,
-                    page_url=council.get('meeting_url'),
-                    base_url=council.get('base_url')
-                )
-                scraper = DirectPageScraper(config)
-                return scraper.scrape()
-            
-            # JSON API scrapers
-            elif council_type == 'json_list':
-                config = JsonListConfig(
-                    council_id=council_id,
-                    council_name=council_name,
-                    endpoint=council.get('endpoint'),
-                    item_path=council.get('item_path', []),
-                    title_field=council.get('title_field'),
-                    url_field=council.get('url_field'),
-                    date_field=council.get('date_field')
-                )
-                scraper = JsonListScraper(config)
-                return scraper.scrape()
-            
-            # Generic scrapers - try to auto-detect
-            else:
-                # Try generic scraping based on URL patterns
-                return self._generic_scrape(council)
+            except Exception as e:
+                logger.error(f"Error scraping {council_name}: {e}")
+                breaker.record_council(circuit, False, str(e))
+                return []
+        breaker.record_council(circuit, bool(docs))
+        return docs
+    
+    @staticmethod
+    def circuit_key(council: Dict) -> str:
+        """The council's circuit breaker key (by id; m9_unified_scraper keeps its own circuits)"""
+        return council_key('universal', _council_id(council))
+    
+    def _build_scraper(self, council: Dict):
+        """Instantiate the scraper for a council, or None if it cannot be scraped"""
+        council_id = council.get('id')
+        council_name = council.get('name')
+        council_type = council.get('type', 'generic')
+        
+        # M9 councils with custom scrapers
+        if council_type == 'm9':
+            scraper_name = council.get('scraper')
+            try:
+                scraper_class = get_scraper_class(scraper_name)
+            except KeyError:
+                logger.warning(f"Unknown M9 scraper: {scraper_name}")
+                return None
             
-        except Exception as e:
-            logger.error(f"Error scraping {council_name}: {e}")
-            return []
+            return scraper_class()
+        
+        # InfoCouncil-based councils
+        elif council_type == 'infocouncil':
+            InfoCouncilScraper, InfoCouncilConfig = get_type_classes(council_type)
+            base_url = council.get('base_url', '')
+            config = InfoCouncilConfig(
+                council_id=council_id,
+                council_name=council_name,
+                base_url=base_url,
+                months_back=6
+            )
+            return InfoCouncilScraper(config)
+        
+        # Direct page scrapers
+        elif council_type == 'direct_page':
+            DirectPageScraper, DirectPageConfig = get_type_classes(council_type)
+            config = DirectPageConfig(
+                council_id=council_id,
+                council_name=council_name,
+                page_url=council.get('meeting_url'),
+                base_url=council.get('base_url')
+            )
+            return DirectPageScraper(config)
+        
+        # JSON API scrapers
+        elif council_type == 'json_list':
+            JsonListScraper, JsonListConfig = get_type_classes(council_type)
+            config = JsonListConfig(
+                council_id=council_id,
+                council_name=council_name,
+                endpoint=council.get('endpoint'),
+                item_path=council.get('item_path', []),
+                title_field=council.get('title_field'),
+                url_field=council.get('url_field'),
+                date_field=council.get('date_field')
+            )
+            return JsonListScraper(config)
+        
+        # Generic scrapers - try to auto-detect
+        else:
+            return self._generic_scraper(council)
     
-    def _generic_scrape(self, council: Dict) -> List:
-        """Generic scraping for councils without specific scrapers"""
+    def _generic_scraper(self, council: Dict):
+        """Generic scraper for councils without specific scrapers"""
         council_id = council.get('id')
         council_name = council.get('name')
         meeting_url = council.get('meeting_url')
@@ -146,17 +162,16 @@ class VictorianCouncilScraper:
         
         if not meeting_url:
             logger.warning(f"No meeting URL for {council_name}")
-            return []
+            return None
         
         # Use SmartCouncilScraper for better detection
-        scraper = SmartCouncilScraper(
+        SmartCouncilScraper, _ = get_type_classes('generic')
+        return SmartCouncilScraper(
             council_id=council_id,
             council_name=council_name,
             meeting_url=meeting_url,
             hashtag=hashtag
         )
-        
-        return scraper.scrape()
     
     def scrape_all(self, limit: Optional[int] = None) -> Dict:
         """Scrape all councils (or up to limit)"""
@@ -164,31 +179,41 @@ class VictorianCouncilScraper:
         
         logger.info(f"Starting scrape of {len(councils_to_scrape)} councils...")
         
-        all_documents = []
+        # Probe results are valid for one run only
+        reset_probe_memo()
+        # One copy of each document across councils and URL spellings
+        index = DocumentIndex()
         
+        instruments = get_instruments()
+        instruments.reset()
+        profiler = get_profiler()
         for council in councils_to_scrape:
             council_name = council.get('name')
+            # Registry rows can share a name, so metrics and circuits are kept per id
+            key = _council_id(council)
             
             try:
-                docs = self.scrape_council(council)
-                
-                # Count by type
-                agendas = [d for d in docs if hasattr(d, 'document_type') and d.document_type == 'agenda']
-                minutes = [d for d in docs if hasattr(d, 'document_type') and d.document_type == 'minutes']
+                with instruments.council(key):
+                    with profiler.unit('scrape', council_name, council.get('id')):
+                        docs = self.scrape_council(council)
+                    with instruments.phase('serialize'):
+                        docs = self._serialize_documents(docs)
                 
-                logger.info(f"{council_name}: {len(docs)} documents ({len(agendas)} agendas, {len(minutes)} minutes)")
+                # Count what survives dedup so the stats add up to total_documents
+                counts = council_counts(index.keep(docs), len(docs))
                 
-                all_documents.extend(docs)
+                logger.info(f"{council_name}: {len(docs)} documents ({counts['agendas']} agendas, "
+                            f"{counts['minutes']} minutes, {counts.get('collapsed', 0)} duplicates)")
                 
                 self.stats.append({
                     'id': council.get('id'),
                     'name': council_name,
                     'region': council.get('region'),
-                    'total': len(docs),
-                    'agendas': len(agendas),
-                    'minutes': len(minutes),
+                    **counts,
                     'working': len(docs) > 0,
-                    'hashtag': council.get('hashtag')
+                    'hashtag': council.get('hashtag'),
+                    **instruments.summary(key, len(docs)),
+                    **get_breaker().summary(self.circuit_key(council))
                 })
                 
             except Exception as e:
@@ -203,45 +228,36 @@ class VictorianCouncilScraper:
                     'minutes': 0,
                     'working': False,
                     'error': str(e),
-                    'hashtag': council.get('hashtag')
+                    'hashtag': council.get('hashtag'),
+                    **instruments.summary(key, 0),
+                    **get_breaker().summary(self.circuit_key(council))
                 })
         
+        logger.info(f"Probe memo: {get_probe_memo().stats()}")
+        save_probe_memo()
+        logger.info(f"Circuits: {get_breaker().stats()}")
+        save_breaker()
+        
+        if index.stats()['collapsed'] or index.no_url:
+            logger.info(f"Dedup: {index.stats()}")
+        
         # Prepare results
         self.results = {
             'scrape_date': datetime.now().isoformat(),
             'total_councils': len(councils_to_scrape),
             'working_councils': sum(1 for s in self.stats if s['working']),
-            'total_documents': len(all_documents),
+            'total_documents': len(index),
             'council_stats': self.stats,
-            'documents': self._serialize_documents(all_documents)
+            'host_metrics': get_scheduler().metrics(),
+            'dedup': index.stats(),
+            'documents': index.documents
         }
         
         return self.results
     
     def _serialize_documents(self, documents: List) -> List[Dict]:
         """Convert document objects to JSON-serializable format"""
-        serialized = []
-        
-        for doc in documents:
-            if hasattr(doc, '__dict__'):
-                # Object with attributes
-                doc_dict = {
-                    'council_id': getattr(doc, 'council_id', ''),
-                    'council_name': getattr(doc, 'council_name', ''),
-                    'document_type': getattr(doc, 'document_type', ''),
-                    'meeting_type': getattr(doc, 'meeting_type', ''),
-                    'title': getattr(doc, 'title', getattr(doc, 'name', '')),
-                    'date': getattr(doc, 'date', ''),
-                    'url': getattr(doc, 'url', getattr(doc, 'download_url', '')),
-                    'webpage_url': getattr(doc, 'webpage_url', '')
-                }
-            else:
-                # Already a dict
-                doc_dict = doc
-            
-            serialized.append(doc_dict)
-        
-        return serialized
+        return serialize_documents(documents)
     
     def save_results(self, output_path='all_councils_results.json'):
         """Save scraping results to JSON file"""
@@ -294,7 +310,21 @@ class VictorianCouncilScraper:
                 print(f"  {stat['name']:30} - {error}")
 
 
-def main():
+def _council_id(council: Dict) -> str:
+    return council.get('id') or council.get('name', '')
+
+
+def scrape_shard(index: int, count: int, limit: Optional[int] = None,
+                 registry_path: str = 'src/registry/all_councils.json') -> Dict:
+    """Scrape one shard of the registry and return its results (used by --jobs workers)"""
+    start_cassette_from_env()
+    scraper = VictorianCouncilScraper(registry_path)
+    councils = scraper.councils[:limit] if limit else scraper.councils
+    scraper.councils = select_shard(councils, index, count, key=_council_id)
+    return scraper.scrape_all()
+
+
+def main(argv=None):
     """Main entry point"""
     import argparse
     
@@ -303,8 +333,33 @@ def main():
     parser.add_argument('--council', help='Scrape specific council by ID')
     parser.add_argument('--output', default='all_councils_results.json', help='Output file path')
     parser.add_argument('--m9-only', action='store_true', help='Only scrape M9 councils')
+    parser.add_argument('--shard', help='Scrape only shard i/N of the registry (writes a partial results file)')
+    parser.add_argument('--jobs', type=int, default=1, help='Scrape in N processes and merge the results')
+    parser.add_argument('--metrics', metavar='PATH', help='Also write per-council metrics in Prometheus text format')
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument('--record', metavar='PATH', help='Record all HTTP traffic to a cassette file')
+    cassette.add_argument('--replay', metavar='PATH', help='Replay HTTP traffic from a cassette file (no network)')
+    add_profile_args(parser)
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.record and args.jobs > 1:
+        parser.error('--record cannot be combined with --jobs')
+    profiler = start_profiler_from_args(args)
+    if profiler and args.jobs > 1:
+        parser.error('--profile cannot be combined with --jobs')
+    if args.record or args.replay:
+        # Through the environment, so --jobs workers replay too
+        os.environ['HTTP_CASSETTE'] = args.record or args.replay
+        os.environ['HTTP_CASSETTE_MODE'] = 'record' if args.record else 'replay'
+    start_cassette_from_env()
+    
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
     
     scraper = VictorianCouncilScraper()
     
@@ -312,7 +367,8 @@ def main():
         # Scrape single council
         council = next((c for c in scraper.councils if c['id'] == args.council), None)
         if council:
-            docs = scraper.scrape_council(council)
+            with get_profiler().unit('scrape', council['name'], council['id']):
+                docs = scraper.scrape_council(council)
             print(f"Scraped {len(docs)} documents from {council['name']}")
         else:
             print(f"Council not found: {args.council}")
@@ -324,13 +380,39 @@ def main():
         scraper.scrape_all()
         scraper.save_results('m9_results.json')
     
+    elif shard:
+        # One slice of the registry; combine slices with scripts/merge_results.py
+        index, count = shard
+        councils = scraper.councils[:args.limit] if args.limit else scraper.councils
+        scraper.councils = select_shard(councils, index, count, key=_council_id)
+        logger.info(f"Shard {index}/{count}: {len(scraper.councils)} councils")
+        scraper.scrape_all()
+        scraper.save_results(shard_path(args.output, index, count))
+    
+    elif args.jobs > 1:
+        # Every shard in its own process, merged in memory
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(scrape_shard, i, args.jobs, args.limit, str(scraper.registry_path))
+                       for i in range(1, args.jobs + 1)]
+            parts = [f.result() for f in futures]
+        scraper.results = merge_results(parts)
+        scraper.stats = scraper.results['council_stats']
+        scraper.save_results(args.output)
+    
     else:
         # Scrape all or limited councils
         scraper.scrape_all(limit=args.limit)
         scraper.save_results(args.output)
     
+    if args.metrics and scraper.stats:
+        write_prometheus(args.metrics, scraper.stats)
+    if profiler and profiler.write_summary():
+        print(f"Profiles written to {profiler.out_dir}/ (summary.txt)")
+    
     scraper.print_summary()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())